@@ -3,10 +3,15 @@ import os
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from models.user import db, User
+from models.article import Article, DeliveredArticle
+from models.digest_job import DigestJob
+from models.on_demand_job import OnDemandJob
 from routes.user import user_bp
 from routes.news import news_bp
 from routes.scheduler import scheduler_bp
+from routes.metrics import metrics_bp
 from scheduler import scheduler
+from migrations import upgrade
 
 def create_app():
     app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
@@ -18,6 +23,7 @@ def create_app():
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(news_bp, url_prefix='/api')
     app.register_blueprint(scheduler_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp, url_prefix='/api')
     
     # Configuração do banco de dados
     database_url = os.environ.get('DATABASE_URL')
@@ -33,7 +39,8 @@ def create_app():
     scheduler.init_app(app)
     
     with app.app_context():
-        db.create_all()
+        # Cria/atualiza o esquema pelas migrações versionadas
+        upgrade()
         # Cria o usuário admin se ele não existir
         if not User.query.filter_by(username="admin").first():
             admin_user = User(username="admin", is_admin=True)
@@ -48,7 +55,7 @@ def create_app():
         static_folder_path = app.static_folder
         if static_folder_path is None:
                 return "Static folder not configured", 404
-    
+        
         if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
             return send_from_directory(static_folder_path, path)
         else:
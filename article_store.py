@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func
+
+from src.db_utils import chunked, chunked_rows, insert_on_conflict
+from src.models.user import db
+from src.models.article import Article, DeliveredArticle
+from src.news_service import article_url_hash
+
+class ArticleStore:
+    """
+    Armazena os artigos buscados e registra quais já foram entregues a cada
+    usuário, indexados pelo hash da URL normalizada
+    """
+    def upsert_articles(self, articles: Iterable[Dict]) -> Dict[str, int]:
+        """
+        Insere (ou atualiza last_seen_at de) vários artigos de uma vez.
+        Retorna o mapa hash da URL -> id do artigo
+        """
+        now = datetime.utcnow()
+        rows = {}
+        for article in articles:
+            if not article.get('url'):
+                continue
+            url_hash = article_url_hash(article)
+            if url_hash not in rows:
+                rows[url_hash] = {
+                    'url_hash': url_hash,
+                    'url': article['url'],
+                    'title': (article.get('title') or '')[:500],
+                    'source_name': ((article.get('source') or {}).get('name') or '')[:200],
+                    'published_at': article.get('publishedAt'),
+                    'first_seen_at': now,
+                    'last_seen_at': now
+                }
+        
+        if not rows:
+            return {}
+        
+        insert = insert_on_conflict(Article)
+        for chunk in chunked_rows(list(rows.values())):
+            statement = insert.values(chunk)
+            statement = statement.on_conflict_do_update(
+                index_elements=['url_hash'],
+                set_={'last_seen_at': statement.excluded.last_seen_at}
+            )
+            db.session.execute(statement)
+        
+        ids = self._ids_by_hash(list(rows))
+        db.session.commit()
+        return ids
+    
+    def _ids_by_hash(self, url_hashes: List[str]) -> Dict[str, int]:
+        ids = {}
+        for chunk in chunked(url_hashes):
+            query = db.session.query(Article.url_hash, Article.id).filter(Article.url_hash.in_(chunk))
+            ids.update({url_hash: article_id for url_hash, article_id in query})
+        return ids
+    
+    def delivered_hashes(self, user_id: int, articles: Iterable[Dict]) -> Set[str]:
+        """
+        Retorna os hashes dos artigos informados que já foram entregues ao usuário
+        """
+        url_hashes = list({article_url_hash(article) for article in articles if article.get('url')})
+        delivered = set()
+        for chunk in chunked(url_hashes):
+            query = db.session.query(Article.url_hash).join(
+                DeliveredArticle, DeliveredArticle.article_id == Article.id
+            ).filter(
+                DeliveredArticle.user_id == user_id,
+                Article.url_hash.in_(chunk)
+            )
+            delivered.update(url_hash for (url_hash,) in query)
+        return delivered
+    
+    def last_delivery(self, user_id: int) -> Optional[datetime]:
+        """
+        Momento da entrega mais recente ao usuário (None se nunca houve)
+        """
+        return db.session.query(func.max(DeliveredArticle.delivered_at)).filter(
+            DeliveredArticle.user_id == user_id
+        ).scalar()
+    
+    def mark_delivered(self, user_id: int, articles: Iterable[Dict]):
+        """
+        Registra os artigos como entregues ao usuário
+        """
+        ids = self.upsert_articles(articles)
+        if not ids:
+            return
+        
+        now = datetime.utcnow()
+        rows = [{'user_id': user_id, 'article_id': article_id, 'delivered_at': now}
+                for article_id in ids.values()]
+        insert = insert_on_conflict(DeliveredArticle)
+        for chunk in chunked_rows(rows):
+            db.session.execute(insert.values(chunk).on_conflict_do_nothing())
+        db.session.commit()
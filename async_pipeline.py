@@ -0,0 +1,551 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import requests
+
+from src.models.user import db
+from src.news_service import NewsSearcher, topic_fetch_cache, TopicFetchCache
+from src.messaging_service import WhatsAppSender, EmailSender, split_recipients
+from src.article_store import ArticleStore
+from src.user_config import UserDigestConfig, load_user_configs
+from src.job_queue import default_worker_id
+from src.metrics import (DIGESTS, EMAIL_SEND_DURATION, MESSAGES, NEWSAPI_ERRORS,
+                         NEWSAPI_REQUEST_DURATION, NEWSAPI_REQUESTS, STAGE_DURATION,
+                         WHATSAPP_SEND_DURATION, quota_user_label)
+
+try:
+    import httpx
+except ImportError:  # dependência opcional: sem ela os resumos usam o pipeline com threads
+    httpx = None
+
+try:
+    import aiosmtplib
+except ImportError:  # sem ela os emails saem pelo smtplib em uma thread
+    aiosmtplib = None
+
+def async_pipeline_available() -> bool:
+    return httpx is not None
+
+def httpx_error_class(error) -> str:
+    """
+    Classe de um erro do httpx para as métricas (equivalente a
+    ``newsapi_error_class`` para o requests)
+    """
+    response = getattr(error, 'response', None) if isinstance(error, httpx.HTTPStatusError) else None
+    if response is not None:
+        try:
+            code = response.json().get('code')
+        except ValueError:
+            code = None
+        return code or f"http_{response.status_code}"
+    if isinstance(error, httpx.TimeoutException):
+        return 'timeout'
+    if isinstance(error, httpx.NetworkError):
+        return 'connection'
+    return 'request'
+
+class ServiceLimits:
+    """
+    Limites de concorrência por serviço externo, compartilhados por todos os
+    resumos que rodam no mesmo event loop
+    """
+    def __init__(self, digests: int = None, newsapi: int = None, whatsapp: int = None, smtp: int = None):
+        self.digests = asyncio.Semaphore(digests or int(os.getenv('ASYNC_DIGEST_CONCURRENCY', '1000')))
+        self.newsapi = asyncio.Semaphore(newsapi or int(os.getenv('NEWS_API_MAX_CONCURRENCY_PER_HOST', '4')))
+        self.whatsapp = asyncio.Semaphore(whatsapp or int(os.getenv('ASYNC_WHATSAPP_CONCURRENCY', '50')))
+        self.smtp = asyncio.Semaphore(smtp or int(os.getenv('ASYNC_SMTP_CONNECTIONS', '10')))
+
+class AsyncNewsSearcher:
+    """
+    Versão assíncrona do NewsSearcher (httpx): usa um NewsSearcher para
+    montar as consultas, ler as páginas e consultar o cache, então a
+    paginação, o cache e as métricas são os mesmos. Buscas simultâneas do
+    mesmo tópico (ex.: vários usuários no mesmo event loop) compartilham uma
+    única requisição
+    """
+    def __init__(self, api_key: str, client, limits: ServiceLimits,
+                 cache: Optional[TopicFetchCache] = topic_fetch_cache, inflight: Dict = None,
+                 user_id: int = None):
+        self.searcher = NewsSearcher(api_key, cache=cache, max_workers=1, user_id=user_id)
+        self.client = client
+        self.limits = limits
+        self.inflight = {} if inflight is None else inflight
+    
+    async def _get(self, endpoint: str, params: Dict) -> Dict:
+        searcher = self.searcher
+        url = f"{searcher.base_url}/{endpoint}"
+        user = quota_user_label(searcher.user_id)
+        try:
+            async with self.limits.newsapi:
+                with NEWSAPI_REQUEST_DURATION.time(endpoint=endpoint):
+                    response = await self.client.get(url, params=params, timeout=searcher.timeout)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            NEWSAPI_REQUESTS.inc(endpoint=endpoint, user=user, outcome='error')
+            NEWSAPI_ERRORS.inc(error=httpx_error_class(e))
+            # O restante do fluxo (e quem chama) trata os erros do requests
+            raise requests.RequestException(str(e)) from e
+        NEWSAPI_REQUESTS.inc(endpoint=endpoint, user=user, outcome='ok')
+        return response.json()
+    
+    async def _fetch_pages(self, endpoint: str, params: Dict, budget: int = None) -> List[Dict]:
+        """
+        Equivalente assíncrono de ``NewsSearcher._iter_pages`` (retorna a
+        lista completa)
+        """
+        searcher = self.searcher
+        budget = searcher.topic_budget if budget is None else budget
+        page_size = min(searcher.page_size, budget)
+        page = 1
+        collected = []
+        
+        while len(collected) < budget:
+            try:
+                data = await self._get(endpoint, dict(params, pageSize=page_size, page=page))
+            except requests.RequestException as e:
+                if page == 1:
+                    raise
+                print(f"Erro ao buscar a página {page} de '{endpoint}': {e}")
+                break
+            articles = searcher._page_articles(data, page)
+            if articles is None:
+                break
+            collected.extend(articles[:budget - len(collected)])
+            
+            if searcher._last_page(data, articles, page, page_size):
+                break
+            page += 1
+        
+        return collected
+    
+    async def _fetch_uncached(self, cache_key, params: Dict, from_date: str) -> List[Dict]:
+        articles = await self._fetch_pages('everything', params)
+        return self.searcher.cache.merge(cache_key, from_date, articles,
+                                         incremental=params['from'] != from_date)
+    
+    async def _fetch_topic(self, topic: str, from_date: str, language: str,
+                           sources: List[str] = None) -> List[Dict]:
+        searcher = self.searcher
+        params = searcher._topic_params(topic, from_date, language, sources)
+        
+        try:
+            if searcher.cache is None:
+                return await self._fetch_pages('everything', params)
+            
+            cache_key, articles, params = searcher._cache_lookup(params, from_date)
+            if articles is not None:
+                return articles
+            
+            task = self.inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(self._fetch_uncached(cache_key, params, from_date))
+                self.inflight[cache_key] = task
+                task.add_done_callback(lambda _: self.inflight.pop(cache_key, None))
+            # Cada usuário recebe as suas cópias dos artigos
+            return [dict(article) for article in await asyncio.shield(task)]
+        
+        except requests.RequestException as e:
+            print(f"Erro ao buscar notícias para o tópico '{topic}': {e}")
+            return []
+    
+    async def fetch_topics(self, topics: List[str], language: str = 'pt', days_back: int = 1,
+                           sources: List[str] = None) -> List[List[Dict]]:
+        if not self.searcher.api_key:
+            raise ValueError("API key is required for news search")
+        
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        return await asyncio.gather(*(self._fetch_topic(topic, from_date, language, sources)
+                                      for topic in topics))
+    
+    async def search_news(self, topics: List[str], sources: List[str] = None,
+                          avoid_sources: List[str] = None, language: str = 'pt',
+                          days_back: int = 1) -> List[Dict]:
+        results = await self.fetch_topics(topics, language=language, days_back=days_back, sources=sources)
+        return list(self.searcher.merge_topic_results(topics, results, avoid_sources))
+
+class AsyncWhatsAppSender:
+    """
+    Envio assíncrono pela Graph API (httpx), com a configuração, os payloads,
+    o limitador de taxa do número remetente e a política de novas tentativas
+    do WhatsAppSender
+    """
+    def __init__(self, client, limits: ServiceLimits, sender: WhatsAppSender = None):
+        self.client = client
+        self.limits = limits
+        self.sender = sender or WhatsAppSender(session=client)
+    
+    async def _post(self, payload: Dict, headers: Dict):
+        sender = self.sender
+        for attempt in range(sender.max_retries + 1):
+            while True:
+                wait = sender.rate_limiter.reserve()
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+            try:
+                async with self.limits.whatsapp:
+                    response = await self.client.post(sender.base_url, json=payload, headers=headers,
+                                                      timeout=sender.timeout)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # A requisição não chegou a ser enviada; 5xx não é repetido
+                if attempt >= sender.max_retries:
+                    raise
+                await asyncio.sleep(sender._connect_retry_delay(attempt))
+                continue
+            if not sender._should_retry(response, attempt):
+                break
+            await asyncio.sleep(sender._prepare_retry(response, attempt))
+        
+        response.raise_for_status()
+        return response
+    
+    async def send_message(self, to_number: str, message: str) -> bool:
+        headers = self.sender._headers()
+        payload = self.sender._text_payload(to_number, message)
+        
+        with WHATSAPP_SEND_DURATION.time():
+            try:
+                response = await self._post(payload, headers)
+                return self.sender._record_result(response.json(), to_number)
+            except httpx.HTTPError as e:
+                print(f"Erro na requisição para {to_number}: {e}")
+                MESSAGES.inc(channel='whatsapp', outcome='error')
+                return False
+
+class AsyncEmailSender:
+    """
+    Envio assíncrono de emails (aiosmtplib): os emails de um resumo saem por
+    uma única conexão autenticada. Sem o aiosmtplib, a sessão SMTP síncrona
+    roda em uma thread
+    """
+    def __init__(self, limits: ServiceLimits, sender: EmailSender = None):
+        self.limits = limits
+        self.sender = sender or EmailSender()
+    
+    async def _connect(self):
+        sender = self.sender
+        smtp = aiosmtplib.SMTP(hostname=sender.smtp_server, port=sender.smtp_port,
+                               start_tls=sender.use_tls)
+        await smtp.connect()
+        try:
+            await smtp.login(sender.email, sender.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+    
+    async def send_all(self, addresses: List[str], subject: str, body: str,
+                       html_body: str = None) -> List[bool]:
+        if not addresses:
+            return []
+        if aiosmtplib is None:
+            return await asyncio.to_thread(self._send_all_sync, addresses, subject, body, html_body)
+        
+        sender = self.sender
+        if not sender.email or not sender.password:
+            print("Credenciais de email não configuradas")
+            for _ in addresses:
+                MESSAGES.inc(channel='email', outcome='error')
+            return [False] * len(addresses)
+        
+        results = []
+        async with self.limits.smtp:
+            smtp = None
+            sent_on_connection = 0
+            try:
+                for address in addresses:
+                    text = sender.build_message(address, subject, body, html_body)
+                    sent = False
+                    with EMAIL_SEND_DURATION.time():
+                        # Uma nova tentativa em conexão nova se a atual tiver caído
+                        for attempt in range(2):
+                            try:
+                                if smtp is not None and sent_on_connection >= sender.max_messages_per_connection:
+                                    await smtp.quit()
+                                    smtp = None
+                                if smtp is None:
+                                    smtp = await self._connect()
+                                    sent_on_connection = 0
+                                await smtp.sendmail(sender.email, [address], text)
+                                sent_on_connection += 1
+                                sent = True
+                                print(f"Email enviado com sucesso para {address}")
+                                break
+                            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused,
+                                    aiosmtplib.SMTPDataError) as e:
+                                # Falha da mensagem, a conexão continua válida
+                                print(f"Erro ao enviar email para {address}: {e}")
+                                break
+                            except (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, OSError) as e:
+                                if smtp is not None:
+                                    smtp.close()
+                                smtp = None
+                                if attempt == 1:
+                                    print(f"Erro ao enviar email para {address}: {e}")
+                            except Exception as e:
+                                if smtp is not None:
+                                    smtp.close()
+                                smtp = None
+                                print(f"Erro ao enviar email para {address}: {e}")
+                                break
+                    MESSAGES.inc(channel='email', outcome='sent' if sent else 'error')
+                    results.append(sent)
+            finally:
+                if smtp is not None:
+                    try:
+                        await smtp.quit()
+                    except Exception:
+                        smtp.close()
+        return results
+    
+    def _send_all_sync(self, addresses: List[str], subject: str, body: str, html_body: str = None) -> List[bool]:
+        with self.sender.session() as smtp_session:
+            return [smtp_session.send(address, subject, body, html_body) for address in addresses]
+
+class AsyncMessageDispatcher:
+    """
+    Equivalente assíncrono do MessageDispatcher: WhatsApp e email do mesmo
+    resumo são enviados ao mesmo tempo
+    """
+    def __init__(self, whatsapp_sender: AsyncWhatsAppSender, email_sender: AsyncEmailSender):
+        self.whatsapp_sender = whatsapp_sender
+        self.email_sender = email_sender
+    
+    async def send_rendered_digest(self, recipients: List[Dict], digest: Dict) -> Dict:
+        if not digest or not digest['total_news']:
+            print("Nenhuma notícia para enviar")
+            return {'success': 0, 'failed': 0}
+        
+        whatsapp_numbers, email_addresses = split_recipients(recipients)
+        whatsapp_results, email_results = await asyncio.gather(
+            asyncio.gather(*(self.whatsapp_sender.send_message(number, digest['whatsapp'])
+                             for number in whatsapp_numbers)),
+            self.email_sender.send_all(email_addresses, digest['subject'], digest['plain'], digest['html'])
+        )
+        results = list(whatsapp_results) + list(email_results)
+        
+        return {
+            'success': sum(1 for sent in results if sent),
+            'failed': sum(1 for sent in results if not sent),
+            'total_news': digest['total_news']
+        }
+
+class AsyncDigestPipeline:
+    """
+    Processa os jobs de uma execução de resumos em um único event loop:
+    busca (httpx), curadoria e envio (httpx/aiosmtplib) de milhares de
+    usuários simultâneos, com limites de concorrência por serviço externo
+    (ServiceLimits). O acesso ao banco (fila de jobs, registro de artigos)
+    continua síncrono, em um pool de threads com contexto próprio do app
+    """
+    def __init__(self, scheduler, db_workers: int = None):
+        if not async_pipeline_available():
+            raise RuntimeError("httpx é necessário para o pipeline assíncrono")
+        self.scheduler = scheduler
+        self.app = scheduler.app
+        self.job_queue = scheduler.job_queue
+        self.db_workers = db_workers or scheduler.max_workers
+    
+    def _with_app(self, function, *args):
+        with self.app.app_context():
+            try:
+                return function(*args)
+            finally:
+                db.session.remove()
+    
+    async def _db(self, function, *args):
+        """
+        Executa uma operação de banco no pool de threads
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._with_app, function, *args)
+    
+    @staticmethod
+    def _store_articles(user_id: int, articles: List[Dict]):
+        store = ArticleStore()
+        store.upsert_articles(articles)
+        return store.delivered_hashes(user_id, articles)
+    
+    async def process_user_digest(self, config: UserDigestConfig, articles: List[Dict] = None,
+                                  topic_scores=None) -> Dict:
+        """
+        Mesmas etapas e resultado de ``NewsAgentScheduler.process_user_digest``
+        """
+        from src.scheduler import curate_user_digest
+        
+        try:
+            if not config.topics:
+                return {'success': False, 'error': 'Nenhum tópico de interesse configurado'}
+            
+            if not config.recipients:
+                return {'success': False, 'error': 'Nenhum destinatário configurado'}
+            
+            if articles is None:
+                with STAGE_DURATION.time(stage='fetch'):
+                    searcher = AsyncNewsSearcher(config.api_key_news, self.client, self.limits,
+                                                 inflight=self.inflight, user_id=config.user_id)
+                    articles = await searcher.search_news(
+                        topics=list(config.topics),
+                        sources=list(config.preferred_sources) if config.preferred_sources else None,
+                        avoid_sources=list(config.avoid_sources)
+                    )
+            
+            with STAGE_DURATION.time(stage='article_store'):
+                delivered = await self._db(self._store_articles, config.user_id, articles)
+            
+            # Curadoria e renderização usam só CPU: rodam em uma thread para
+            # não travar o event loop dos outros resumos
+            top_articles, total_filtered, digest = await asyncio.to_thread(
+                curate_user_digest, config, articles, delivered, topic_scores)
+            if not top_articles:
+                return {'success': True, 'messages_sent': 0, 'message': 'Nenhuma notícia relevante encontrada'}
+            
+            with STAGE_DURATION.time(stage='delivery'):
+                result = await self.dispatcher.send_rendered_digest(list(config.recipients), digest)
+            
+            if result['success']:
+                await self._db(lambda: ArticleStore().mark_delivered(config.user_id, top_articles))
+            
+            return {
+                'success': True,
+                'total_articles_found': len(articles),
+                'total_articles_filtered': total_filtered,
+                'total_articles_sent': digest['total_news'],
+                'messages_sent': result['success'],
+                'messages_failed': result['failed']
+            }
+        
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+    
+    async def _run_user_digest(self, user_id: int, config: UserDigestConfig = None, engine=None):
+        """
+        Equivalente a ``NewsAgentScheduler._run_user_digest``: retorna o
+        status ('success', 'failed', 'skipped' ou 'error') e o resultado
+        """
+        username = user_id
+        try:
+            if config is None:
+                config = (await self._db(load_user_configs, [user_id])).get(user_id)
+            if config is None:
+                return 'skipped', {'success': False, 'error': 'Usuário não encontrado'}
+            username = config.username
+            
+            if not config.is_complete:
+                print(f"Usuário {username} não tem configuração completa, pulando...")
+                return 'skipped', {'success': False, 'error': 'Configuração incompleta'}
+            
+            print(f"Processando usuário: {username}")
+            articles = None
+            topic_scores = None
+            if engine is not None and engine.covers(config.user_id):
+                articles = engine.articles_for(config)
+                topic_scores = engine.topic_scores_for(config)
+            with STAGE_DURATION.time(stage='user_digest'):
+                result = await self.process_user_digest(config, articles, topic_scores)
+            
+            if result['success']:
+                print(f"✓ Sucesso para {username}: {result['messages_sent']} mensagens enviadas")
+                return 'success', result
+            
+            print(f"✗ Falha para {username}: {result['error']}")
+            return 'failed', result
+        
+        except Exception as e:
+            print(f"✗ Erro ao processar usuário {username}: {str(e)}")
+            return 'error', {'success': False, 'error': str(e)}
+    
+    async def _run_job(self, job_id: int, user_id: int, config: UserDigestConfig, engine) -> str:
+        self.running_jobs.add(job_id)
+        try:
+            status, result = await self._run_user_digest(user_id, config, engine)
+        finally:
+            self.running_jobs.discard(job_id)
+        DIGESTS.inc(status=status)
+        
+        if status == 'error':
+            # Exceção inesperada: o job volta para a fila enquanto houver tentativas
+            if await self._db(self.job_queue.fail, job_id, self.worker_id, result['error']):
+                return 'retried'
+            return 'failed'
+        await self._db(self.job_queue.complete, job_id, self.worker_id, result,
+                       'failed' if status == 'failed' else 'done')
+        return status
+    
+    async def _heartbeat(self):
+        """
+        Renova periodicamente o lease de todos os jobs em andamento
+        """
+        interval = max(1, self.job_queue.lease_seconds / 3)
+        
+        def renew(job_ids):
+            for job_id in job_ids:
+                self.job_queue.heartbeat(job_id, self.worker_id)
+        
+        while True:
+            await asyncio.sleep(interval)
+            if self.running_jobs:
+                await self._db(renew, list(self.running_jobs))
+    
+    async def drain(self, run_key: str = None, configs: Dict[int, UserDigestConfig] = None,
+                    engine=None) -> Dict:
+        """
+        Reivindica e processa jobs até a fila ficar vazia; retorna os mesmos
+        contadores de ``NewsAgentScheduler.drain_jobs``
+        """
+        configs = configs or {}
+        counts = {'success': 0, 'failed': 0, 'skipped': 0, 'retried': 0}
+        self.worker_id = default_worker_id()
+        self.running_jobs = set()
+        self.inflight = {}
+        self.limits = ServiceLimits()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, self.db_workers))
+        
+        async def run(job_id, user_id):
+            try:
+                counts[await self._run_job(job_id, user_id, configs.get(user_id), engine)] += 1
+            finally:
+                self.limits.digests.release()
+        
+        def claim():
+            job = self.job_queue.claim(self.worker_id, run_key)
+            return (job.id, job.user_id) if job is not None else None
+        
+        async with httpx.AsyncClient(limits=httpx.Limits(max_connections=None)) as client:
+            self.client = client
+            self.dispatcher = AsyncMessageDispatcher(AsyncWhatsAppSender(client, self.limits),
+                                                     AsyncEmailSender(self.limits))
+            heartbeat = asyncio.ensure_future(self._heartbeat())
+            tasks = set()
+            try:
+                while True:
+                    # Só reivindica um job quando há vaga para executá-lo,
+                    # para que o lease não vença na espera
+                    await self.limits.digests.acquire()
+                    job = await self._db(claim)
+                    if job is None:
+                        self.limits.digests.release()
+                        break
+                    task = asyncio.ensure_future(run(*job))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                heartbeat.cancel()
+                self.executor.shutdown(wait=False)
+        
+        return {
+            'total_processed': counts['success'] + counts['failed'],
+            'total_success': counts['success'],
+            'total_failed': counts['failed'],
+            'total_skipped': counts['skipped'],
+            'total_retried': counts['retried']
+        }
+    
+    def run(self, run_key: str = None, configs: Dict[int, UserDigestConfig] = None, engine=None) -> Dict:
+        return asyncio.run(self.drain(run_key, configs, engine))
@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from src.models.user import db
+from src.models.on_demand_job import ACTIVE_STATUSES, OnDemandJob
+
+class BackgroundJob:
+    """
+    Execução em segundo plano disparada por uma requisição (ex.: resumo sob
+    demanda), do ponto de vista do processo que a executa: etapa atual e
+    contadores de progresso. O estado fica na tabela on_demand_job para que
+    qualquer processo possa consultá-lo; o progresso é gravado pelo
+    registro periodicamente, fora da thread do job
+    """
+    def __init__(self, job_id: str, kind: str, user_id: int):
+        self.id = job_id
+        self.kind = kind
+        self.user_id = user_id
+        self.status = 'queued'  # queued, running, done, failed
+        self.stage = None
+        self.progress = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+    
+    def update(self, stage: str = None, **progress):
+        """
+        Muda a etapa atual e/ou atualiza contadores de progresso
+        """
+        with self._lock:
+            if stage is not None:
+                self.stage = stage
+            self.progress.update(progress)
+            self._dirty = True
+    
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.progress[counter] = self.progress.get(counter, 0) + amount
+            self._dirty = True
+    
+    def _values(self, **values) -> Dict:
+        # Chamado com o lock adquirido
+        self._dirty = False
+        values.update(stage=self.stage, progress=json.dumps(self.progress), heartbeat_at=datetime.utcnow())
+        return values
+    
+    def _write(self, values: Dict):
+        table = OnDemandJob.__table__
+        with db.engine.begin() as connection:
+            connection.execute(update(table).where(table.c.id == self.id).values(values))
+    
+    def start(self):
+        with self._lock:
+            self.status = 'running'
+            values = self._values(status='running', started_at=datetime.utcnow())
+        self._write(values)
+    
+    def finish(self, status: str, result: Dict = None, error: str = None):
+        """
+        Grava o status final ('done' ou 'failed') com o resultado ou o erro
+        """
+        with self._lock:
+            self.status = status
+            values = self._values(status=status, finished_at=datetime.utcnow(), error=error,
+                                  result=json.dumps(result, default=str) if result is not None else None)
+        self._write(values)
+    
+    def save_progress(self, heartbeat: bool = False):
+        """
+        Grava etapa e progresso se mudaram; com ``heartbeat`` grava sempre,
+        renovando o heartbeat
+        """
+        with self._lock:
+            if self.status not in ACTIVE_STATUSES or not (self._dirty or heartbeat):
+                return
+            values = self._values()
+        self._write(values)
+    
+    def wait(self, timeout: float) -> bool:
+        """
+        Espera o job terminar por até ``timeout`` segundos; indica se terminou
+        """
+        return self._done.wait(timeout)
+
+class BackgroundJobRegistry:
+    """
+    Executa jobs em um pool de threads do próprio processo; o estado deles
+    fica na tabela on_demand_job, então qualquer processo (ex.: outro worker
+    do gunicorn) responde à consulta. Jobs cujo processo deixou de renovar o
+    heartbeat por ``stale_seconds`` são dados como falhos e os terminados são
+    apagados depois de ``retention_seconds``
+    """
+    def __init__(self, max_workers: int = None, stale_seconds: int = None, retention_seconds: int = None,
+                 flush_seconds: float = 1.0, poll_seconds: float = 0.5):
+        self.max_workers = max_workers or int(os.getenv('BACKGROUND_JOB_WORKERS', '2'))
+        self.stale_seconds = stale_seconds or int(os.getenv('BACKGROUND_JOB_STALE_SECONDS', '120'))
+        self.retention_seconds = retention_seconds or int(os.getenv('BACKGROUND_JOB_RETENTION_SECONDS', '3600'))
+        self.flush_seconds = flush_seconds
+        self.poll_seconds = poll_seconds
+        self._running = {}  # id -> BackgroundJob deste processo ainda não terminado
+        self._executor = None
+        self._flush_thread = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self, app) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers),
+                                                    thread_name_prefix='background-job')
+                self._flush_thread = threading.Thread(target=self._flush_loop, args=(app,), daemon=True)
+                self._flush_thread.start()
+            return self._executor
+    
+    def _flush_loop(self, app):
+        """
+        Grava o progresso dos jobs deste processo e renova o heartbeat deles
+        (na fila ou em execução). Roda fora das threads dos jobs: no SQLite uma
+        escrita pendente na sessão do job bloquearia a gravação feita por ela
+        """
+        heartbeat_interval = max(1, self.stale_seconds / 3)
+        last_heartbeat = time.monotonic()
+        while True:
+            time.sleep(self.flush_seconds)
+            heartbeat = time.monotonic() - last_heartbeat >= heartbeat_interval
+            if heartbeat:
+                last_heartbeat = time.monotonic()
+            with self._lock:
+                jobs = list(self._running.values())
+            for job in jobs:
+                try:
+                    with app.app_context():
+                        job.save_progress(heartbeat)
+                except Exception as e:
+                    print(f"Erro ao gravar o progresso do job {job.id}: {str(e)}")
+    
+    def _expire_stale(self) -> int:
+        """
+        Marca como falhos os jobs ativos cujo processo parou de renovar o
+        heartbeat (ex.: worker reiniciado no meio da execução)
+        """
+        now = datetime.utcnow()
+        expired = OnDemandJob.query.filter(
+            OnDemandJob.status.in_(ACTIVE_STATUSES),
+            OnDemandJob.heartbeat_at < now - timedelta(seconds=self.stale_seconds)
+        ).update({
+            'status': 'failed',
+            'error': 'Job interrompido: o processo que o executava parou',
+            'finished_at': now
+        }, synchronize_session=False)
+        # Sempre encerra a transação: no SQLite o UPDATE já reserva a escrita
+        # mesmo sem linhas alteradas
+        db.session.commit()
+        return expired
+    
+    def _prune(self) -> int:
+        removed = OnDemandJob.query.filter(
+            OnDemandJob.finished_at < datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return removed
+    
+    def submit(self, app, kind: str, user_id: int, function: Callable[[BackgroundJob], Dict]) -> OnDemandJob:
+        """
+        Enfileira ``function(job)``, executada dentro de um contexto do app;
+        o retorno vira o resultado do job e uma exceção o marca como falho.
+        Se outro processo acabou de enfileirar o mesmo tipo de job para o
+        usuário, retorna esse job
+        """
+        self._expire_stale()
+        self._prune()
+        job = BackgroundJob(uuid.uuid4().hex, kind, user_id)
+        record = OnDemandJob(id=job.id, kind=kind, user_id=user_id, status='queued')
+        db.session.add(record)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            existing = self.find_active(user_id, kind)
+            if existing is None:
+                raise
+            return existing
+        
+        with self._lock:
+            self._running[job.id] = job
+        
+        def run():
+            with app.app_context():
+                try:
+                    job.start()
+                    outcome = {'status': 'done', 'result': function(job)}
+                except Exception as e:
+                    print(f"Erro no job {job.kind} {job.id}: {str(e)}")
+                    outcome = {'status': 'failed', 'error': str(e)}
+                # Libera a sessão usada pelo job antes de gravar o resultado
+                db.session.remove()
+                try:
+                    job.finish(**outcome)
+                except Exception as e:
+                    print(f"Erro ao gravar o resultado do job {job.id}: {str(e)}")
+                finally:
+                    with self._lock:
+                        self._running.pop(job.id, None)
+                    job._done.set()
+        
+        self._get_executor(app).submit(run)
+        return record
+    
+    def find_active(self, user_id: int, kind: str) -> Optional[OnDemandJob]:
+        """
+        Job do mesmo tipo ainda não terminado do usuário, em qualquer processo
+        (evita enfileirar o mesmo trabalho várias vezes com cliques repetidos)
+        """
+        self._expire_stale()
+        return OnDemandJob.query.filter(
+            OnDemandJob.user_id == user_id,
+            OnDemandJob.kind == kind,
+            OnDemandJob.status.in_(ACTIVE_STATUSES)
+        ).first()
+    
+    def get(self, job_id: str) -> Optional[OnDemandJob]:
+        self._expire_stale()
+        return db.session.get(OnDemandJob, job_id, populate_existing=True)
+    
+    def wait(self, job_id: str, timeout: float) -> Optional[OnDemandJob]:
+        """
+        Espera o job terminar por até ``timeout`` segundos e retorna o estado
+        mais recente dele (terminado ou não)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            record = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if record is None or record.finished or remaining <= 0:
+                return record
+            with self._lock:
+                job = self._running.get(job_id)
+            if job is not None:
+                job.wait(remaining)
+            else:
+                # Job executado por outro processo
+                time.sleep(min(self.poll_seconds, remaining))
+
+# Registro global usado pelas rotas
+background_jobs = BackgroundJobRegistry()
@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.news_service import TopicMatcher, article_search_text
+from src.user_config import UserDigestConfig
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # dependências opcionais: sem elas a pontuação é feita por usuário
+    np = None
+    sparse = None
+
+def batch_scoring_available() -> bool:
+    return sparse is not None
+
+class BatchTopicScorer:
+    """
+    Pontua de uma vez um conjunto compartilhado de artigos para todos os
+    usuários de uma execução.
+    
+    Os tópicos (e tópicos evitados) de todos os usuários formam um
+    vocabulário único de termos; cada artigo é comparado ao vocabulário uma
+    única vez (matriz esparsa artigo × termo) e as pontuações de todos os
+    usuários saem de um único produto com a matriz termo × usuário dos pesos
+    de prioridade. Os tópicos evitados viram uma máscara pelo mesmo produto.
+    O resultado é o mesmo da pontuação por usuário do NewsCurator
+    """
+    def __init__(self, articles: Iterable[Dict], configs: Iterable[UserDigestConfig]):
+        if not batch_scoring_available():
+            raise RuntimeError("numpy e scipy são necessários para a pontuação em lote")
+        
+        configs = list(configs)
+        self.user_columns = {config.user_id: column for column, config in enumerate(configs)}
+        
+        # Vocabulário de termos (em minúsculas, como no TopicMatcher)
+        terms = {}
+        for config in configs:
+            for topic in list(config.topic_priorities) + list(config.avoid_topics):
+                terms.setdefault(topic.lower(), len(terms))
+        self.terms = terms
+        
+        # Matriz artigo × termo (uma linha por URL)
+        self.rows_by_url = {}
+        matcher = TopicMatcher([term for term in terms if term])
+        indptr, indices = [0], []
+        for article in articles:
+            url = article.get('url')
+            if not url or url in self.rows_by_url:
+                continue
+            self.rows_by_url[url] = len(self.rows_by_url)
+            found = matcher.find_patterns(article_search_text(article))
+            if '' in terms:
+                # A string vazia está contida em qualquer texto
+                found.add('')
+            indices.extend(sorted(terms[term] for term in found))
+            indptr.append(len(indices))
+        self.matches = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(self.rows_by_url), len(terms))
+        )
+        
+        # Matrizes termo × usuário de pesos e de tópicos evitados
+        weight_rows, weight_columns, weight_values = [], [], []
+        avoid_rows, avoid_columns = [], []
+        self._user_topic_terms = {}
+        for column, config in enumerate(configs):
+            topic_terms = []
+            for index, (topic, priority) in enumerate(config.topic_priorities.items()):
+                term = terms[topic.lower()]
+                topic_terms.append((index, term))
+                weight_rows.append(term)
+                weight_columns.append(column)
+                # Prioridade 1 = mais importante (pontuação maior)
+                weight_values.append((6 - priority) * 10)
+            self._user_topic_terms[config.user_id] = topic_terms
+            for topic in config.avoid_topics:
+                avoid_rows.append(terms[topic.lower()])
+                avoid_columns.append(column)
+        
+        shape = (len(terms), len(configs))
+        # Entradas repetidas (tópicos iguais sem diferenciar maiúsculas) são somadas
+        weights = sparse.csc_matrix((np.array(weight_values, dtype=np.int64),
+                                     (np.array(weight_rows, dtype=np.int64),
+                                      np.array(weight_columns, dtype=np.int64))), shape=shape)
+        avoid = sparse.csc_matrix((np.ones(len(avoid_rows), dtype=np.int64),
+                                   (np.array(avoid_rows, dtype=np.int64),
+                                    np.array(avoid_columns, dtype=np.int64))), shape=shape)
+        
+        # Um produto para todas as pontuações e outro para a máscara de evitados
+        self.scores = (self.matches @ weights).tocsc()
+        self.avoided = (self.matches @ avoid).tocsc()
+    
+    def covers(self, user_id: int) -> bool:
+        return user_id in self.user_columns
+    
+    def _column(self, matrix, user_id: int) -> Dict[int, int]:
+        column = self.user_columns[user_id]
+        start, end = matrix.indptr[column], matrix.indptr[column + 1]
+        return dict(zip(matrix.indices[start:end].tolist(), matrix.data[start:end].tolist()))
+    
+    def topic_scores_for(self, config: UserDigestConfig):
+        """
+        Retorna a função de pontuação por tópicos do usuário no formato
+        esperado por ``NewsCurator.select_top_articles(topic_scores=...)``
+        """
+        scores = self._column(self.scores, config.user_id)
+        avoided = {row for row, count in self._column(self.avoided, config.user_id).items() if count}
+        topic_terms = self._user_topic_terms[config.user_id]
+        matches = self.matches
+        rows_by_url = self.rows_by_url
+        fallback = []
+        
+        def topic_scores(article: Dict) -> Optional[Tuple[int, List[int]]]:
+            row = rows_by_url.get(article.get('url'))
+            if row is None:
+                # Artigo fora do conjunto compartilhado: busca no texto
+                if not fallback:
+                    fallback.extend([TopicMatcher(list(config.topic_priorities)),
+                                     TopicMatcher(config.avoid_topics)])
+                topic_matcher, avoid_matcher = fallback
+                text = article_search_text(article)
+                if avoid_matcher and avoid_matcher.search(text):
+                    return None
+                matched = topic_matcher.match_indices(text)
+                return sum((6 - config.topic_priorities[topic_matcher.topics[index]]) * 10
+                           for index in matched), matched
+            if row in avoided:
+                return None
+            total = scores.get(row, 0)
+            if total <= 0:
+                return total, []
+            # Índices (na ordem dos tópicos do usuário) dos tópicos encontrados
+            row_terms = set(matches.indices[matches.indptr[row]:matches.indptr[row + 1]].tolist())
+            return total, [index for index, term in topic_terms if term in row_terms]
+        
+        return topic_scores
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Os benchmarks rodam a partir do diretório do projeto (python -m benchmarks.*);
+# adiciona o diretório pai ao path para importar os módulos como ``src.*``
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
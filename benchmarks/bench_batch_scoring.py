@@ -0,0 +1,81 @@
+"""
+Benchmark da pontuação em lote (BatchTopicScorer, numpy/scipy) contra a
+pontuação por usuário do NewsCurator, sobre um conjunto compartilhado de
+artigos, conferindo que a seleção de cada usuário é idêntica.
+
+Uso:
+    python -m benchmarks.bench_batch_scoring --users 2000 --articles 3000
+"""
+import argparse
+import random
+import time
+
+from src.batch_scoring import BatchTopicScorer, batch_scoring_available
+from src.news_service import NewsCurator
+from src.user_config import UserDigestConfig
+from benchmarks.bench_curator import generate_articles, random_word
+
+def generate_configs(rng: random.Random, vocabulary, count: int, topics_per_user: int, avoid_per_user: int):
+    # Usuários escolhem tópicos de um conjunto comum, como na prática
+    popular = rng.sample(vocabulary, 500)
+    configs = []
+    for user_id in range(1, count + 1):
+        topics = rng.sample(popular, topics_per_user)
+        configs.append(UserDigestConfig(
+            user_id=user_id,
+            username=f'usuario{user_id}',
+            api_key_news='chave',
+            topics=tuple(topics),
+            topic_priorities={topic.capitalize(): rng.randint(1, 5) for topic in topics},
+            avoid_topics=tuple(rng.sample(popular, avoid_per_user)),
+            preferred_sources=(),
+            source_priorities={},
+            avoid_sources=(),
+            recipients=({'type': 'email', 'address': f'usuario{user_id}@example.com'},)
+        ))
+    return configs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--articles', type=int, default=3000)
+    parser.add_argument('--topics', type=int, default=8, help='tópicos por usuário')
+    parser.add_argument('--avoid', type=int, default=2, help='tópicos evitados por usuário')
+    parser.add_argument('--k', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    if not batch_scoring_available():
+        print("numpy/scipy não instalados: pontuação em lote indisponível")
+        return
+    
+    rng = random.Random(args.seed)
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    articles = generate_articles(rng, vocabulary, args.articles)
+    configs = generate_configs(rng, vocabulary, args.users, args.topics, args.avoid)
+    curator = NewsCurator()
+    
+    def select(config, topic_scores=None):
+        top, matched = curator.select_top_articles([dict(a) for a in articles], config.topic_priorities,
+                                                   list(config.avoid_topics), k=args.k,
+                                                   topic_scores=topic_scores)
+        return [(a['url'], a['relevance_score'], a['matched_topics']) for a in top], matched
+    
+    started = time.perf_counter()
+    expected = [select(config) for config in configs]
+    per_user_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    scorer = BatchTopicScorer(articles, configs)
+    build_seconds = time.perf_counter() - started
+    result = [select(config, scorer.topic_scores_for(config)) for config in configs]
+    batch_seconds = time.perf_counter() - started
+    
+    print(f"Usuários: {args.users} | Artigos: {args.articles} | Termos: {len(scorer.terms)}")
+    print(f"Por usuário: {per_user_seconds:.2f}s")
+    print(f"Em lote:     {batch_seconds:.2f}s (matrizes e produto: {build_seconds:.2f}s) "
+          f"({per_user_seconds / batch_seconds:.1f}x)")
+    print(f"Resultados idênticos: {'sim' if result == expected else 'NÃO'}")
+
+if __name__ == '__main__':
+    main()
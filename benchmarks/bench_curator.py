@@ -0,0 +1,112 @@
+"""
+Benchmark do NewsCurator.filter_and_rank_articles contra a implementação
+anterior (três buscas por substring para cada artigo × tópico) e da seleção
+top-k com heap (NewsCurator.select_top_articles).
+
+Uso:
+    python -m benchmarks.bench_curator --articles 10000 --topics 100
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from src.news_service import NewsCurator, ahocorasick
+
+def legacy_filter_and_rank_articles(articles: List[Dict], topic_priorities: Dict[str, int],
+                                    avoid_topics: List[str] = None) -> List[Dict]:
+    """
+    Implementação original, mantida como referência de resultado e tempo
+    """
+    avoid_topics = avoid_topics or []
+    filtered_articles = []
+    
+    for article in articles:
+        title = article.get('title', '').lower()
+        description = article.get('description', '').lower()
+        content = article.get('content', '').lower()
+        
+        if any(avoid_topic.lower() in title or 
+               avoid_topic.lower() in description or 
+               avoid_topic.lower() in content 
+               for avoid_topic in avoid_topics):
+            continue
+        
+        score = 0
+        matched_topics = []
+        
+        for topic, priority in topic_priorities.items():
+            if (topic.lower() in title or 
+                topic.lower() in description or 
+                topic.lower() in content):
+                score += (6 - priority) * 10
+                matched_topics.append(topic)
+        
+        if score > 0:
+            article['relevance_score'] = score
+            article['matched_topics'] = matched_topics
+            filtered_articles.append(article)
+    
+    filtered_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
+    
+    return filtered_articles
+
+def random_word(rng: random.Random) -> str:
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzáãçéõ') for _ in range(rng.randint(3, 10)))
+
+def generate_articles(rng: random.Random, vocabulary: List[str], count: int) -> List[Dict]:
+    articles = []
+    for index in range(count):
+        articles.append({
+            'title': ' '.join(rng.choices(vocabulary, k=12)).title(),
+            'description': ' '.join(rng.choices(vocabulary, k=30)),
+            'content': ' '.join(rng.choices(vocabulary, k=60)),
+            'url': f'https://example.com/{index}',
+            'source': {'name': 'Fonte'}
+        })
+    return articles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=10000)
+    parser.add_argument('--topics', type=int, default=100)
+    parser.add_argument('--avoid', type=int, default=10)
+    parser.add_argument('--k', type=int, default=15)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    articles = generate_articles(rng, vocabulary, args.articles)
+    topics = rng.sample(vocabulary, args.topics)
+    topic_priorities = {topic.capitalize(): rng.randint(1, 5) for topic in topics}
+    avoid_topics = rng.sample(vocabulary, args.avoid)
+    
+    started = time.perf_counter()
+    expected = legacy_filter_and_rank_articles([dict(a) for a in articles], topic_priorities, avoid_topics)
+    legacy_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    result = NewsCurator().filter_and_rank_articles([dict(a) for a in articles], topic_priorities, avoid_topics)
+    current_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    top, matched = NewsCurator().select_top_articles([dict(a) for a in articles], topic_priorities,
+                                                     avoid_topics, k=args.k)
+    top_k_seconds = time.perf_counter() - started
+    
+    same = ([(a['url'], a['relevance_score'], a['matched_topics']) for a in expected] ==
+            [(a['url'], a['relevance_score'], a['matched_topics']) for a in result])
+    # Empates são desfeitos por data no heap, então só as pontuações se comparam
+    same_top = ([a['relevance_score'] for a in top] == [a['relevance_score'] for a in result[:args.k]]
+                and matched == len(result))
+    
+    print(f"Artigos: {args.articles} | Tópicos: {args.topics} | Evitados: {args.avoid}")
+    print(f"Backend do TopicMatcher: {'aho-corasick' if ahocorasick is not None else 'regex/substring'}")
+    print(f"Implementação anterior: {legacy_seconds:.3f}s")
+    print(f"Implementação atual:    {current_seconds:.3f}s ({legacy_seconds / current_seconds:.1f}x)")
+    print(f"Resultados idênticos:   {'sim' if same else 'NÃO'}")
+    print(f"Top-{args.k} com heap:      {top_k_seconds:.3f}s (pontuações iguais: {'sim' if same_top else 'NÃO'})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do agrupamento de quase duplicatas (MinHash + LSH): mede o tempo
+para tamanhos crescentes de lote, para conferir o crescimento linear, e
+quantas cópias sindicalizadas (mesma matéria com pequenas edições no título)
+foram agrupadas com a original.
+
+Uso:
+    python -m benchmarks.bench_near_duplicates --sizes 5000,10000,20000,40000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from src.near_duplicates import cluster_near_duplicates
+from benchmarks.bench_curator import random_word
+
+def generate_syndicated_articles(rng: random.Random, vocabulary: List[str], count: int,
+                                 copy_ratio: float) -> List[Dict]:
+    """
+    Gera artigos em que ``copy_ratio`` deles são republicações de uma
+    matéria anterior: o mesmo texto com o nome do veículo no título ou com
+    uma palavra do título trocada
+    """
+    articles = []
+    for index in range(count):
+        if articles and rng.random() < copy_ratio:
+            original = rng.choice(articles[-500:])
+            words = original['title'].split()
+            if rng.random() < 0.5:
+                words.append(f'- Fonte {index % 50}')
+            else:
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            article = dict(original, title=' '.join(words))
+        else:
+            article = {
+                'title': ' '.join(rng.choices(vocabulary, k=12)),
+                'description': ' '.join(rng.choices(vocabulary, k=30)),
+                'story': index
+            }
+        article['url'] = f'https://example.com/{index}'
+        article['source'] = {'name': f'Fonte {index % 50}'}
+        articles.append(article)
+    return articles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='5000,10000,20000,40000')
+    parser.add_argument('--copy-ratio', type=float, default=0.3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    
+    for size in (int(value) for value in args.sizes.split(',')):
+        articles = generate_syndicated_articles(rng, vocabulary, size, args.copy_ratio)
+        
+        started = time.perf_counter()
+        clusters = cluster_near_duplicates(articles)
+        seconds = time.perf_counter() - started
+        
+        cluster_of = {index: position for position, cluster in enumerate(clusters) for index in cluster}
+        first_of_story = {}
+        copies = grouped = 0
+        for index, article in enumerate(articles):
+            if article['story'] in first_of_story:
+                copies += 1
+                grouped += cluster_of[index] == cluster_of[first_of_story[article['story']]]
+            else:
+                first_of_story[article['story']] = index
+        mixed = sum(1 for cluster in clusters if len({articles[index]['story'] for index in cluster}) > 1)
+        print(f"Artigos: {size:>6} | {seconds:.2f}s ({seconds / size * 1e6:.0f} µs/artigo) | "
+              f"cópias agrupadas: {grouped}/{copies} | grupos com matérias diferentes: {mixed}")
+
+if __name__ == '__main__':
+    main()
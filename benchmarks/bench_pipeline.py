@@ -0,0 +1,165 @@
+"""
+Benchmark de ponta a ponta da execução diária
+(NewsAgentScheduler.run_daily_digest_for_all_users) sem credenciais reais:
+a NewsAPI, a Graph API do WhatsApp e o servidor SMTP são substituídos por
+serviços locais (benchmarks.fake_services) e os usuários vêm de um banco
+gerado (benchmarks.generate_data, por padrão database/benchmark.db).
+
+Mede a vazão (usuários por segundo), a latência por usuário (p50/p99), o
+tempo de cada etapa do pipeline e o pico de memória.
+
+Uso:
+    python -m benchmarks.bench_pipeline --users 500 --topics 8 --recipients 2
+    python -m benchmarks.bench_pipeline --reuse-data --news-latency 0.2 --pages 3
+"""
+import argparse
+import contextlib
+import io
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.fake_services import FakeGraphAPI, FakeNewsAPI, SMTPSink
+from benchmarks.generate_data import DEFAULT_DATABASE, create_benchmark_app, generate
+
+def percentile(values, fraction: float) -> float:
+    """
+    Percentil pelo posto mais próximo (0 para lista vazia)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    # ru_maxrss é em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--reuse-data', action='store_true', help='usa o banco já gerado sem recriá-lo')
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--topics', type=int, default=8, help='tópicos por usuário')
+    parser.add_argument('--recipients', type=int, default=2, help='destinatários por usuário')
+    parser.add_argument('--pool', type=int, default=200, help='tópicos distintos disponíveis')
+    parser.add_argument('--news-latency', type=float, default=0.05, help='latência da NewsAPI (s)')
+    parser.add_argument('--pages', type=int, default=1, help='páginas por consulta à NewsAPI')
+    parser.add_argument('--whatsapp-latency', type=float, default=0.02, help='latência da Graph API (s)')
+    parser.add_argument('--whatsapp-rate', type=float, default=20, help='mensagens por segundo no WhatsApp')
+    parser.add_argument('--smtp-latency', type=float, default=0.0, help='latência do SMTP por mensagem (s)')
+    parser.add_argument('--workers', type=int, default=None, help='DIGEST_WORKERS (padrão: o da aplicação)')
+    parser.add_argument('--pipeline', choices=('threads', 'async'), default='threads', help='DIGEST_PIPELINE')
+    parser.add_argument('--fetch-mode', choices=('fanout', 'per_user'), default='fanout', help='DIGEST_FETCH_MODE')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='mede o pico de alocações Python com tracemalloc (mais lento)')
+    parser.add_argument('--verbose', action='store_true', help='mostra a saída da execução')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    if os.path.basename(args.database) == 'app.db':
+        parser.error("use um banco próprio para o benchmark, não o da aplicação")
+    
+    news_api = FakeNewsAPI(latency=args.news_latency, pages=args.pages, seed=args.seed).start()
+    graph_api = FakeGraphAPI(latency=args.whatsapp_latency).start()
+    smtp_sink = SMTPSink(latency=args.smtp_latency).start()
+    
+    try:
+        for service in (news_api, graph_api, smtp_sink):
+            os.environ.update(service.env())
+        os.environ['WHATSAPP_MESSAGES_PER_SECOND'] = str(args.whatsapp_rate)
+        if args.workers:
+            os.environ['DIGEST_WORKERS'] = str(args.workers)
+        os.environ['DIGEST_PIPELINE'] = args.pipeline
+        os.environ['DIGEST_FETCH_MODE'] = args.fetch_mode
+        
+        # Importados depois das variáveis de ambiente (lidas na criação das instâncias)
+        from src.metrics import STAGE_DURATION
+        from src.scheduler import NewsAgentScheduler
+        
+        latencies = []
+        latencies_lock = threading.Lock()
+        
+        class TimedScheduler(NewsAgentScheduler):
+            """
+            Registra a duração de cada usuário processado
+            """
+            def _run_user_digest(self, user_id, config=None, engine=None):
+                started = time.perf_counter()
+                try:
+                    return super()._run_user_digest(user_id, config, engine)
+                finally:
+                    with latencies_lock:
+                        latencies.append(time.perf_counter() - started)
+        
+        if args.pipeline == 'async':
+            from src.async_pipeline import AsyncDigestPipeline
+            run_user_digest = AsyncDigestPipeline._run_user_digest
+            
+            async def timed_run_user_digest(self, user_id, config=None, engine=None):
+                started = time.perf_counter()
+                try:
+                    return await run_user_digest(self, user_id, config, engine)
+                finally:
+                    latencies.append(time.perf_counter() - started)
+            AsyncDigestPipeline._run_user_digest = timed_run_user_digest
+        
+        app = create_benchmark_app(args.database)
+        with app.app_context():
+            if not args.reuse_data or not os.path.exists(args.database):
+                started = time.perf_counter()
+                generate(args.users, args.topics, args.recipients, pool_size=args.pool, seed=args.seed)
+                print(f"Dados gerados em {time.perf_counter() - started:.1f}s: {args.users} usuários × "
+                      f"{args.topics} tópicos × {args.recipients} destinatários ({args.database})")
+        
+        scheduler = TimedScheduler(app)
+        stages_before = STAGE_DURATION.totals()
+        run_key = f"benchmark-{datetime.now():%Y%m%d%H%M%S}"
+        
+        if args.trace_memory:
+            tracemalloc.start()
+        output = io.StringIO()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(output) if not args.verbose else contextlib.nullcontext():
+            summary = scheduler.run_daily_digest_for_all_users(run_key)
+        elapsed = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        if args.trace_memory:
+            tracemalloc.stop()
+        
+        if not summary:
+            print(output.getvalue())
+            print("A execução não retornou um resumo (veja a saída acima)")
+            return
+        
+        print(f"Execução {run_key}: {summary['total_processed']} processados, {summary['total_success']} sucessos, "
+              f"{summary['total_failed']} falhas, {summary['total_skipped']} ignorados")
+        print(f"Tempo total: {elapsed:.2f}s | Vazão: {len(latencies) / elapsed:.1f} usuários/s")
+        print(f"Latência por usuário: p50 {percentile(latencies, 0.5) * 1000:.0f} ms | "
+              f"p99 {percentile(latencies, 0.99) * 1000:.0f} ms | máx {max(latencies or [0]) * 1000:.0f} ms")
+        print(f"NewsAPI: {news_api.requests} requisições | WhatsApp: {graph_api.requests} requisições | "
+              f"SMTP: {smtp_sink.messages} emails")
+        
+        print("Etapas (tempo somado entre os workers):")
+        for (stage,), (count, total) in sorted(STAGE_DURATION.totals().items()):
+            before_count, before_total = stages_before.get((stage,), (0, 0.0))
+            if count > before_count:
+                print(f"  - {stage:<16} {total - before_total:8.2f}s em {count - before_count} execuções")
+        
+        memory = f"Pico de memória (RSS do processo): {peak_rss_mb():.0f} MB"
+        if traced_peak is not None:
+            memory += f" | alocações Python: {traced_peak / 1024 / 1024:.1f} MB"
+        print(memory)
+    finally:
+        for service in (news_api, graph_api, smtp_sink):
+            service.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark do filtro de fontes evitadas: implementação anterior (busca por
+substring para cada artigo × fonte evitada) contra SourcePreferences
+(TopicMatcher compilado + decisão memorizada por nome de fonte) e custo da
+consulta de prioridade por fonte.
+
+Uso:
+    python -m benchmarks.bench_sources --articles 20000 --sources 300 --avoid 10,100,1000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from src.news_service import SourcePreferences, ahocorasick
+from benchmarks.bench_curator import random_word
+
+def legacy_filter_avoided_sources(articles: List[Dict], avoid_sources: List[str]) -> List[Dict]:
+    """
+    Implementação original, mantida como referência de resultado e tempo
+    """
+    return [
+        article for article in articles
+        if not any(avoid_source.lower() in article.get('source', {}).get('name', '').lower()
+                 for avoid_source in avoid_sources)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--sources', type=int, default=300, help='fontes distintas nos artigos')
+    parser.add_argument('--avoid', default='10,100,1000', help='tamanhos da lista de fontes evitadas')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    names = [f'{random_word(rng).title()} {random_word(rng).title()}' for _ in range(args.sources)]
+    articles = [{'url': f'https://example.com/{index}', 'source': {'id': None, 'name': rng.choice(names)}}
+                for index in range(args.articles)]
+    
+    print(f"Artigos: {args.articles} | Fontes distintas: {args.sources}")
+    print(f"Backend do TopicMatcher: {'aho-corasick' if ahocorasick is not None else 'regex/substring'}")
+    
+    for avoid_count in (int(value) for value in args.avoid.split(',')):
+        # Metade das fontes evitadas aparece nos artigos (nomes parciais, em outra caixa)
+        avoid = [rng.choice(names).split()[0].upper() if index % 2 else random_word(rng)
+                 for index in range(avoid_count)]
+        
+        started = time.perf_counter()
+        expected = legacy_filter_avoided_sources(articles, avoid)
+        legacy_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        preferences = SourcePreferences(avoid=avoid)
+        result = preferences.filter(articles)
+        current_seconds = time.perf_counter() - started
+        
+        print(f"Evitadas: {avoid_count:>5} | anterior: {legacy_seconds:.3f}s | "
+              f"atual: {current_seconds:.3f}s ({legacy_seconds / max(current_seconds, 1e-9):.1f}x) | "
+              f"resultados idênticos: {'sim' if result == expected else 'NÃO'}")
+    
+    preferences = SourcePreferences({name: rng.randint(1, 5) for name in rng.sample(names, args.sources // 2)})
+    started = time.perf_counter()
+    bonus = sum(preferences.bonus(article) for article in articles)
+    print(f"Bônus de prioridade para {args.articles} artigos: {time.perf_counter() - started:.3f}s (total {bonus})")
+
+if __name__ == '__main__':
+    main()
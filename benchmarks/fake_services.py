@@ -0,0 +1,300 @@
+"""
+Substitutos locais dos serviços externos usados nos benchmarks de ponta a
+ponta: NewsAPI (artigos sintéticos paginados), Graph API do WhatsApp e um
+servidor SMTP que apenas conta as mensagens recebidas.
+
+Cada serviço roda em uma thread própria em 127.0.0.1 (porta livre escolhida
+pelo sistema) e expõe ``env()`` com as variáveis de ambiente que apontam a
+aplicação para ele.
+"""
+import base64
+import hashlib
+import json
+import random
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+SOURCE_NAMES = ['Folha', 'G1', 'Estadão', 'UOL', 'CNN Brasil', 'Valor', 'Exame', 'BBC Brasil',
+                'O Globo', 'Agência Brasil', 'InfoMoney', 'Poder360']
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+class _HTTPService:
+    """
+    Servidor HTTP em thread própria (use como gerenciador de contexto)
+    """
+    handler_class = None
+    
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.server = None
+        self.thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+    
+    def start(self):
+        service = self
+        
+        class Handler(self.handler_class):
+            pass
+        Handler.service = service
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+class _NewsAPIHandler(_QuietHandler):
+    def do_GET(self):
+        service = self.service
+        service.count_request()
+        if service.latency:
+            time.sleep(service.latency)
+        
+        parsed = urlparse(self.path)
+        endpoint = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+        if endpoint not in ('everything', 'top-headlines'):
+            return self._send_json(404, {'status': 'error', 'code': 'notFound', 'message': parsed.path})
+        
+        params = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+        query = params.get('q') or params.get('category') or params.get('country') or 'geral'
+        page = int(params.get('page', '1'))
+        page_size = min(int(params.get('pageSize', '100')), 100)
+        self._send_json(200, service.page(query, page, page_size))
+
+class FakeNewsAPI(_HTTPService):
+    """
+    NewsAPI sintética: cada consulta tem ``pages`` páginas de artigos
+    determinísticos que citam o termo buscado, publicados nas últimas horas.
+    ``syndication`` é a fração de artigos republicados por outro veículo
+    com o título levemente alterado (para exercitar o agrupamento de
+    quase duplicatas)
+    """
+    handler_class = _NewsAPIHandler
+    
+    def __init__(self, latency: float = 0.05, pages: int = 1, syndication: float = 0.2,
+                 vocabulary: List[str] = None, seed: int = 42):
+        super().__init__(latency)
+        self.pages = pages
+        self.syndication = syndication
+        self.seed = seed
+        self.vocabulary = vocabulary or [f'palavra{index}' for index in range(2000)]
+    
+    def env(self) -> Dict[str, str]:
+        return {'NEWS_API_BASE_URL': f"{self.url}/v2"}
+    
+    def page(self, query: str, page: int, page_size: int) -> Dict:
+        total = self.pages * page_size
+        start = (page - 1) * page_size
+        count = max(0, min(page_size, total - start))
+        digest = hashlib.sha256(f"{self.seed}:{query}".encode('utf-8')).digest()
+        rng = random.Random(int.from_bytes(digest[:8], 'little') + page)
+        now = datetime.utcnow()
+        
+        articles = []
+        for position in range(start, start + count):
+            if articles and rng.random() < self.syndication:
+                original = rng.choice(articles)
+                article = dict(original, title=f"{original['title']} - {rng.choice(SOURCE_NAMES)}")
+            else:
+                words = rng.choices(self.vocabulary, k=10)
+                words.insert(rng.randrange(len(words)), query)
+                article = {
+                    'title': ' '.join(words).capitalize(),
+                    'description': ' '.join(rng.choices(self.vocabulary, k=25)),
+                    'content': ' '.join(rng.choices(self.vocabulary, k=60))
+                }
+            source = rng.choice(SOURCE_NAMES)
+            # Mais recentes primeiro, como a NewsAPI com sortBy=publishedAt
+            published = now - timedelta(minutes=position * 3 + 1)
+            article.update({
+                'source': {'id': None, 'name': source},
+                'author': None,
+                'url': f"https://noticias.example.com/{hashlib.md5(query.encode('utf-8')).hexdigest()[:8]}/{position}",
+                'urlToImage': None,
+                'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ')
+            })
+            articles.append(article)
+        
+        return {'status': 'ok', 'totalResults': total, 'articles': articles}
+
+class _GraphAPIHandler(_QuietHandler):
+    def do_POST(self):
+        service = self.service
+        service.count_request()
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if service.latency:
+            time.sleep(service.latency)
+        
+        if service.throttle_every and service.requests % service.throttle_every == 0:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self._send_json(200, {
+            'messaging_product': 'whatsapp',
+            'contacts': [{'input': payload.get('to'), 'wa_id': payload.get('to')}],
+            'messages': [{'id': f"wamid.bench{service.requests}"}]
+        })
+
+class FakeGraphAPI(_HTTPService):
+    """
+    Graph API do WhatsApp que aceita qualquer mensagem. Com
+    ``throttle_every`` = N, uma a cada N requisições recebe 429
+    """
+    handler_class = _GraphAPIHandler
+    
+    def __init__(self, latency: float = 0.02, throttle_every: int = 0):
+        super().__init__(latency)
+        self.throttle_every = throttle_every
+    
+    def env(self) -> Dict[str, str]:
+        return {
+            'WHATSAPP_API_BASE_URL': f"{self.url}/v18.0",
+            'WHATSAPP_ACCESS_TOKEN': 'token-benchmark',
+            'WHATSAPP_PHONE_NUMBER_ID': '000000000000'
+        }
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Diálogo SMTP mínimo (EHLO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT),
+    suficiente para o smtplib sem TLS
+    """
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode('utf-8'))
+    
+    def handle(self):
+        sink = self.server.sink
+        self.reply('220 localhost SMTP sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            
+            if verb == 'EHLO':
+                self.reply('250-localhost')
+                self.reply('250-AUTH PLAIN LOGIN')
+                self.reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self.reply('250 localhost')
+            elif verb == 'AUTH':
+                parts = command.split()
+                if len(parts) == 2 and parts[1].upper() == 'LOGIN':
+                    # Usuário e senha em duas etapas
+                    self.reply('334 ' + base64.b64encode(b'Username:').decode('ascii'))
+                    self.rfile.readline()
+                    self.reply('334 ' + base64.b64encode(b'Password:').decode('ascii'))
+                    self.rfile.readline()
+                elif len(parts) == 2:
+                    self.reply('334 ')
+                    self.rfile.readline()
+                self.reply('235 Authentication successful')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b'.\r\n', b'.\n'):
+                        break
+                    size += len(data)
+                if sink.latency:
+                    time.sleep(sink.latency)
+                sink.count_message(size)
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP...
+                self.reply('250 OK')
+
+class SMTPSink:
+    """
+    Servidor SMTP local que descarta as mensagens, contando quantas chegaram
+    """
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self.server = None
+        self.thread = None
+    
+    def count_message(self, size: int):
+        with self._lock:
+            self.messages += 1
+            self.bytes += size
+    
+    def env(self) -> Dict[str, str]:
+        host, port = self.server.server_address[:2]
+        return {
+            'SMTP_SERVER': host,
+            'SMTP_PORT': str(port),
+            'SMTP_STARTTLS': '0',
+            'EMAIL_ADDRESS': 'resumo@example.com',
+            'EMAIL_PASSWORD': 'benchmark'
+        }
+    
+    def start(self):
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
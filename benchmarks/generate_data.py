@@ -0,0 +1,134 @@
+"""
+Gerador de dados para os benchmarks de ponta a ponta: cria N usuários, cada
+um com M tópicos (de um conjunto comum, como na prática), alguns tópicos e
+fontes evitados e R destinatários (WhatsApp e email).
+
+Por padrão grava em database/benchmark.db, nunca no banco da aplicação.
+
+Uso:
+    python -m benchmarks.generate_data --users 1000 --topics 8 --recipients 2
+"""
+import argparse
+import os
+import random
+
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from src.models.user import db, User, Topic, Source, Recipient, refresh_user_counters
+from src.migrations import upgrade
+from benchmarks.fake_services import SOURCE_NAMES
+
+DEFAULT_DATABASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'database', 'benchmark.db')
+
+TOPIC_WORDS = ['economia', 'política', 'futebol', 'tecnologia', 'saúde', 'educação', 'clima',
+               'inflação', 'eleições', 'startups', 'energia', 'agronegócio', 'cinema', 'música',
+               'ciência', 'segurança', 'transporte', 'turismo', 'mercado', 'juros', 'petróleo',
+               'vacinas', 'inteligência artificial', 'criptomoedas', 'previdência', 'impostos',
+               'exportações', 'indústria', 'varejo', 'habitação']
+
+def create_benchmark_app(database_path: str = DEFAULT_DATABASE) -> Flask:
+    """
+    Aplicação Flask mínima apontando para o banco do benchmark
+    """
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.abspath(database_path)}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+def topic_pool(size: int):
+    """
+    Conjunto de tópicos de onde os usuários escolhem (palavras reais, depois
+    variações numeradas)
+    """
+    pool = list(TOPIC_WORDS)
+    index = 1
+    while len(pool) < size:
+        pool.append(f"{TOPIC_WORDS[index % len(TOPIC_WORDS)]} {index}")
+        index += 1
+    return pool[:size]
+
+def generate(users: int, topics: int, recipients: int, avoid_topics: int = 1, sources: int = 2,
+             whatsapp_ratio: float = 0.5, pool_size: int = 200, seed: int = 42, batch: int = 1000):
+    """
+    Recria as tabelas e insere os dados (deve rodar dentro de um app context)
+    """
+    rng = random.Random(seed)
+    pool = topic_pool(max(pool_size, topics + avoid_topics))
+    # Popularidade desigual: poucos tópicos concentram a maioria das inscrições
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    # Um único hash de senha para todos os usuários (o hash é caro de propósito)
+    password_hash = generate_password_hash('benchmark')
+    
+    db.drop_all()
+    upgrade()
+    
+    def flush(table, rows):
+        if rows:
+            db.session.execute(table.__table__.insert(), rows)
+            rows.clear()
+    
+    user_rows, topic_rows, source_rows, recipient_rows = [], [], [], []
+    for user_id in range(1, users + 1):
+        user_rows.append({'id': user_id, 'username': f'usuario{user_id}', 'password_hash': password_hash,
+                          'api_key_news': f'chave-benchmark-{user_id % 10:04d}', 'is_admin': False})
+        
+        chosen = set()
+        while len(chosen) < topics + avoid_topics:
+            chosen.add(rng.choices(pool, weights=weights)[0])
+        chosen = list(chosen)
+        rng.shuffle(chosen)
+        for position, topic_name in enumerate(chosen):
+            avoid = position >= topics
+            topic_rows.append({'user_id': user_id, 'topic_name': topic_name,
+                               'priority': 3 if avoid else rng.randint(1, 5), 'avoid': avoid})
+        
+        for position, source_name in enumerate(rng.sample(SOURCE_NAMES, min(sources, len(SOURCE_NAMES)))):
+            # A última fonte sorteada é evitada, as demais preferidas
+            avoid = position == sources - 1 and sources > 1
+            source_rows.append({'user_id': user_id, 'source_name': source_name,
+                                'priority': 3 if avoid else rng.randint(1, 5), 'avoid': avoid})
+        
+        for position in range(recipients):
+            if rng.random() < whatsapp_ratio:
+                recipient_rows.append({'user_id': user_id, 'type': 'whatsapp',
+                                       'address': f'119{rng.randrange(10 ** 8):08d}'})
+            else:
+                recipient_rows.append({'user_id': user_id, 'type': 'email',
+                                       'address': f'usuario{user_id}.{position}@example.com'})
+        
+        if len(user_rows) >= batch:
+            for table, rows in ((User, user_rows), (Topic, topic_rows),
+                                (Source, source_rows), (Recipient, recipient_rows)):
+                flush(table, rows)
+    
+    for table, rows in ((User, user_rows), (Topic, topic_rows), (Source, source_rows), (Recipient, recipient_rows)):
+        flush(table, rows)
+    # Inserções em massa não passam pelos eventos do ORM
+    refresh_user_counters(db.session.connection())
+    db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--topics', type=int, default=8, help='tópicos por usuário')
+    parser.add_argument('--avoid-topics', type=int, default=1, help='tópicos evitados por usuário')
+    parser.add_argument('--sources', type=int, default=2, help='fontes por usuário (a última é evitada)')
+    parser.add_argument('--recipients', type=int, default=2, help='destinatários por usuário')
+    parser.add_argument('--whatsapp-ratio', type=float, default=0.5)
+    parser.add_argument('--pool', type=int, default=200, help='tópicos distintos disponíveis')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    app = create_benchmark_app(args.database)
+    with app.app_context():
+        generate(args.users, args.topics, args.recipients, args.avoid_topics, args.sources,
+                 args.whatsapp_ratio, args.pool, args.seed)
+    print(f"{args.users} usuários × {args.topics} tópicos × {args.recipients} destinatários "
+          f"gravados em {args.database}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Confere os planos de execução (SQLite, EXPLAIN QUERY PLAN) das consultas
+mais frequentes: carga das configurações dos usuários prontos, relacionamentos
+de tópicos, fontes e destinatários e as buscas por (id, user_id) das rotas.
+
+As consultas são capturadas executando o próprio código da aplicação sobre
+um banco gerado (por padrão database/benchmark.db); termina com erro se
+alguma delas varrer uma tabela inteira (SCAN sem índice).
+
+Uso:
+    python -m benchmarks.query_plans --users 200
+"""
+import argparse
+import os
+import re
+import sys
+
+from sqlalchemy import event
+
+from benchmarks.generate_data import DEFAULT_DATABASE, create_benchmark_app, generate
+from src.models.user import db, User, Topic, Source, Recipient
+from src.user_config import count_incomplete_users, load_user_config, load_user_configs
+
+# Tabelas que crescem com o número de usuários
+WATCHED_TABLES = ('user', 'topic', 'source', 'recipient')
+FULL_SCAN = re.compile(r'^SCAN (\w+)(?! USING)')
+
+def hot_queries(user_id: int):
+    """
+    Operações da aplicação cujas consultas são verificadas
+    """
+    yield 'usuários prontos (execução diária)', lambda: load_user_configs()
+    yield 'usuários prontos (is_ready)', lambda: load_user_configs(ready_only=True)
+    yield 'usuários sem configuração completa', count_incomplete_users
+    yield 'status da configuração', lambda: db.session.get(User, user_id).is_ready
+    yield 'configuração de um usuário', lambda: load_user_config(user_id)
+    for model in (Topic, Source, Recipient):
+        name = model.__tablename__
+        yield f'{name} por (id, user_id)', lambda model=model: model.query.filter_by(id=1, user_id=user_id).first()
+        yield f'{name} do usuário (relacionamento)', \
+            lambda name=name: getattr(db.session.get(User, user_id), f'{name}s')
+        yield f'{name} por ids do usuário (lote)', \
+            lambda model=model: model.query.filter(model.user_id == user_id, model.id.in_([1, 2, 3])).all()
+
+def explain(statement: str, parameters) -> list:
+    connection = db.session.connection()
+    return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--users', type=int, default=200)
+    args = parser.parse_args()
+    
+    if os.path.basename(args.database) == 'app.db':
+        parser.error("use um banco próprio para a verificação, não o da aplicação")
+    
+    app = create_benchmark_app(args.database)
+    failures = 0
+    with app.app_context():
+        generate(args.users, 8, 2)
+        
+        captured = []
+        
+        def capture(connection, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        
+        for name, operation in hot_queries(user_id=max(1, args.users // 2)):
+            captured.clear()
+            db.session.expunge_all()
+            operation()
+            print(f"{name}:")
+            for statement, parameters in list(captured):
+                for step in explain(statement, parameters):
+                    scan = FULL_SCAN.match(step)
+                    bad = scan is not None and scan.group(1) in WATCHED_TABLES
+                    failures += bad
+                    print(f"  {'VARREDURA ' if bad else ''}{step}")
+        
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    
+    if failures:
+        print(f"{failures} consulta(s) varrem tabelas inteiras")
+        sys.exit(1)
+    print("Todas as consultas usam índices")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+from typing import Dict, List
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.models.user import db
+
+# Parâmetros aceitos por instrução no SQLite anterior à 3.32
+MAX_PARAMETERS = 999
+
+# Itens por lista IN (...): um parâmetro por item, com folga para os demais
+# filtros da consulta
+CHUNK_SIZE = 500
+
+def chunked(items, size: int = CHUNK_SIZE):
+    """
+    Divide uma lista em blocos de até ``size`` itens
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def chunked_rows(rows: List[Dict]):
+    """
+    Divide as linhas de um INSERT de várias linhas (todas com as mesmas
+    colunas) em blocos que cabem em MAX_PARAMETERS: um parâmetro por coluna
+    de cada linha
+    """
+    if not rows:
+        return iter(())
+    return chunked(rows, max(1, MAX_PARAMETERS // len(rows[0])))
+
+def insert_on_conflict(model):
+    """
+    Retorna um INSERT com suporte a ON CONFLICT para o banco em uso
+    (SQLite em desenvolvimento, PostgreSQL em produção)
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
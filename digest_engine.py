@@ -0,0 +1,152 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+from src.news_service import NewsSearcher, SourcePreferences, merge_by_recency
+from src.near_duplicates import article_signature
+from src.batch_scoring import BatchTopicScorer, batch_scoring_available
+from src.metrics import STAGE_DURATION
+from src.user_config import UserDigestConfig
+
+def normalize_topic(topic_name: str) -> str:
+    """
+    Normaliza o nome de um tópico (minúsculas, espaços colapsados)
+    """
+    return ' '.join((topic_name or '').lower().split())
+
+def fetch_key(topic_name: str, config: UserDigestConfig) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Chave da busca compartilhada: tópico normalizado e fontes preferidas do
+    usuário, enviadas à NewsAPI (``sources``) como na busca por usuário
+    """
+    return normalize_topic(topic_name), tuple(sorted(config.preferred_sources))
+
+class TopicFanoutEngine:
+    """
+    Motor de resumos centrado em tópicos: monta um índice invertido
+    (tópico, fontes preferidas) -> usuários inscritos, busca cada combinação
+    distinta uma única vez e distribui os artigos para o buffer de curadoria
+    de cada inscrito, removendo ali as fontes evitadas de cada usuário
+    """
+    def __init__(self, language: str = 'pt', days_back: int = 1, max_workers: int = None):
+        self.language = language
+        self.days_back = days_back
+        self.max_workers = max_workers or int(os.getenv('NEWS_FETCH_WORKERS', '4'))
+        self.subscribers = OrderedDict()
+        self.topic_articles = {}
+        self.batch_scorer = None
+        self._api_keys = {}
+    
+    def covers(self, user_id: int) -> bool:
+        """
+        Indica se o usuário fez parte do índice montado em ``prepare``
+        """
+        return user_id in self._api_keys
+    
+    def build_index(self, configs: Iterable[UserDigestConfig]) -> Dict[Tuple, List[int]]:
+        """
+        Monta o índice invertido (tópico normalizado, fontes preferidas) ->
+        ids dos usuários inscritos
+        """
+        self.subscribers = OrderedDict()
+        self._api_keys = {}
+        for config in configs:
+            self._api_keys[config.user_id] = config.api_key_news
+            for topic in config.topics:
+                subscribers = self.subscribers.setdefault(fetch_key(topic, config), [])
+                if config.user_id not in subscribers:
+                    subscribers.append(config.user_id)
+        return self.subscribers
+    
+    def _assign_api_keys(self) -> List[tuple]:
+        """
+        Escolhe a API key usada em cada busca, distribuindo-as entre
+        as chaves dos inscritos para não esgotar a cota de um único usuário.
+        Retorna (busca, API key, id do usuário dono da chave)
+        """
+        usage = {}
+        assignments = []
+        for key, subscribers in self.subscribers.items():
+            owners = [user_id for user_id in subscribers if self._api_keys.get(user_id)]
+            if not owners:
+                continue
+            owner = min(owners, key=lambda user_id: usage.get(self._api_keys[user_id], 0))
+            api_key = self._api_keys[owner]
+            usage[api_key] = usage.get(api_key, 0) + 1
+            assignments.append((key, api_key, owner))
+        return assignments
+    
+    def prepare(self, configs: Iterable[UserDigestConfig]) -> Dict[Tuple, List[Dict]]:
+        """
+        Indexa os usuários e busca cada combinação distinta de tópico e
+        fontes preferidas uma vez
+        """
+        configs = list(configs)
+        self.build_index(configs)
+        assignments = self._assign_api_keys()
+        
+        def fetch(assignment):
+            (topic, sources), api_key, owner = assignment
+            searcher = NewsSearcher(api_key, max_workers=1, user_id=owner)
+            return searcher.fetch_topics([topic], language=self.language, days_back=self.days_back,
+                                         sources=list(sources) or None)[0]
+        
+        workers = max(1, min(self.max_workers, len(assignments) or 1))
+        with STAGE_DURATION.time(stage='fanout_fetch'), ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, assignments))
+        
+        # As cópias distribuídas aos usuários herdam a assinatura já calculada
+        for articles in results:
+            for article in articles:
+                article_signature(article)
+        
+        self.topic_articles = {key: articles for (key, _, _), articles in zip(assignments, results)}
+        
+        # Pontuação em lote de todos os inscritos (opcional: numpy/scipy)
+        self.batch_scorer = None
+        if os.getenv('DIGEST_BATCH_SCORING', '1') == '1' and batch_scoring_available():
+            with STAGE_DURATION.time(stage='batch_scoring'):
+                self.batch_scorer = BatchTopicScorer(
+                    (article for articles in results for article in articles), configs)
+        
+        return self.topic_articles
+    
+    def articles_for(self, config: UserDigestConfig) -> List[Dict]:
+        """
+        Monta o buffer de artigos de um usuário a partir das buscas já feitas
+        (com as fontes preferidas dele): filtra fontes evitadas, marca o tópico de busca,
+        ordena do mais novo para o mais antigo e remove URLs duplicadas (como
+        NewsSearcher.iter_news)
+        """
+        sources = SourcePreferences.from_config(config)
+        
+        def routed(topic):
+            for article in sources.filter(self.topic_articles.get(fetch_key(topic, config), [])):
+                yield dict(article, search_topic=topic)
+        
+        seen_urls = set()
+        buffer = []
+        for article in merge_by_recency(routed(topic) for topic in config.topics):
+            url = article.get('url', '')
+            if url and url not in seen_urls:
+                seen_urls.add(url)
+                buffer.append(article)
+        
+        return buffer
+    
+    def topic_scores_for(self, config: UserDigestConfig):
+        """
+        Pontuação por tópicos já calculada em lote para o usuário, ou None
+        se a pontuação em lote não está disponível
+        """
+        if self.batch_scorer is None or not self.batch_scorer.covers(config.user_id):
+            return None
+        return self.batch_scorer.topic_scores_for(config)
+    
+    def stats(self) -> Dict:
+        return {
+            'distinct_topics': len({topic for topic, _ in self.subscribers}),
+            'subscriptions': sum(len(subscribers) for subscribers in self.subscribers.values()),
+            'fetched_topics': len(self.topic_articles)
+        }
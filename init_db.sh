@@ -8,8 +8,8 @@ rm -f database/app.db
 # Cria o diretório do banco de dados se não existir
 mkdir -p database
 
-# Executa o script principal para criar as tabelas
-python -c "from main import app, db; with app.app_context(): db.create_all()"
+# Cria as tabelas aplicando as migrações
+python migrations.py upgrade
 
 echo "Banco de dados inicializado com sucesso."
 
@@ -0,0 +1,149 @@
+import json
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, func, or_
+
+from src.db_utils import chunked_rows, insert_on_conflict
+from src.models.user import db
+from src.models.digest_job import DigestJob
+
+def default_worker_id() -> str:
+    """
+    Identificador do worker (host, processo e thread) usado nos leases
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+class DigestJobQueue:
+    """
+    Fila durável de resumos (tabela digest_job). Cada usuário de uma execução
+    é um job que qualquer processo pode reivindicar com um lease; leases
+    vencidos (worker que caiu) voltam a ficar disponíveis
+    """
+    def __init__(self, lease_seconds: int = None, max_attempts: int = None):
+        self.lease_seconds = lease_seconds or int(os.getenv('DIGEST_JOB_LEASE_SECONDS', '600'))
+        self.max_attempts = max_attempts or int(os.getenv('DIGEST_JOB_MAX_ATTEMPTS', '3'))
+    
+    def enqueue_run(self, run_key: str, user_ids: Iterable[int]) -> int:
+        """
+        Cria os jobs de uma execução; jobs já existentes são mantidos, o que
+        torna a chamada idempotente entre processos
+        """
+        now = datetime.utcnow()
+        rows = [{'run_key': run_key, 'user_id': user_id, 'status': 'pending', 'attempts': 0,
+                 'created_at': now, 'updated_at': now} for user_id in user_ids]
+        insert = insert_on_conflict(DigestJob)
+        for chunk in chunked_rows(rows):
+            db.session.execute(insert.values(chunk).on_conflict_do_nothing(
+                index_elements=['run_key', 'user_id']))
+        db.session.commit()
+        return len(rows)
+    
+    def _claimable(self, now: datetime):
+        return and_(
+            DigestJob.attempts < self.max_attempts,
+            or_(
+                DigestJob.status == 'pending',
+                and_(DigestJob.status == 'running', DigestJob.lease_expires_at < now)
+            )
+        )
+    
+    def claim(self, worker_id: str, run_key: str = None) -> Optional[DigestJob]:
+        """
+        Reivindica o próximo job disponível. O UPDATE condicional garante que
+        apenas um worker vence a disputa pelo mesmo job
+        """
+        now = datetime.utcnow()
+        self._expire_exhausted(now)
+        
+        query = db.session.query(DigestJob.id).filter(self._claimable(now))
+        if run_key:
+            query = query.filter(DigestJob.run_key == run_key)
+        candidate_ids = [job_id for (job_id,) in query.order_by(DigestJob.id).limit(10)]
+        
+        for job_id in candidate_ids:
+            claimed = DigestJob.query.filter(
+                DigestJob.id == job_id, self._claimable(now)
+            ).update({
+                'status': 'running',
+                'lease_owner': worker_id,
+                'lease_expires_at': now + timedelta(seconds=self.lease_seconds),
+                'heartbeat_at': now,
+                'attempts': DigestJob.attempts + 1,
+                'updated_at': now
+            }, synchronize_session=False)
+            db.session.commit()
+            if claimed == 1:
+                return db.session.get(DigestJob, job_id)
+        
+        return None
+    
+    def _expire_exhausted(self, now: datetime):
+        """
+        Marca como falhos os jobs cujo lease venceu sem tentativas restantes
+        """
+        expired = DigestJob.query.filter(
+            DigestJob.status == 'running',
+            DigestJob.lease_expires_at < now,
+            DigestJob.attempts >= self.max_attempts
+        ).update({
+            'status': 'failed',
+            'error': 'Lease expirado sem tentativas restantes',
+            'updated_at': now
+        }, synchronize_session=False)
+        if expired:
+            db.session.commit()
+    
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Renova o lease de um job em execução; retorna False se o lease foi perdido
+        """
+        now = datetime.utcnow()
+        renewed = DigestJob.query.filter_by(id=job_id, lease_owner=worker_id, status='running').update({
+            'heartbeat_at': now,
+            'lease_expires_at': now + timedelta(seconds=self.lease_seconds),
+            'updated_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        return renewed == 1
+    
+    def complete(self, job_id: int, worker_id: str, result: Dict, status: str = 'done'):
+        """
+        Conclui o job com o resultado do processamento (status 'done' ou 'failed')
+        """
+        DigestJob.query.filter_by(id=job_id, lease_owner=worker_id).update({
+            'status': status,
+            'result': json.dumps(result, default=str),
+            'error': None,
+            'lease_expires_at': None,
+            'updated_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+    
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """
+        Registra uma falha; o job volta para a fila enquanto houver tentativas.
+        Retorna True se o job será tentado novamente
+        """
+        job = db.session.get(DigestJob, job_id)
+        if job is None or job.lease_owner != worker_id:
+            return False
+        will_retry = job.attempts < self.max_attempts
+        job.status = 'pending' if will_retry else 'failed'
+        job.error = error
+        job.lease_owner = None
+        job.lease_expires_at = None
+        db.session.commit()
+        return will_retry
+    
+    def run_summary(self, run_key: str) -> Dict[str, int]:
+        """
+        Contagem de jobs por status de uma execução
+        """
+        rows = db.session.query(DigestJob.status, func.count(DigestJob.id)).filter(
+            DigestJob.run_key == run_key
+        ).group_by(DigestJob.status)
+        return {status: count for status, count in rows}
@@ -1,56 +1,227 @@
 import requests
 import os
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from typing import List, Dict
 
+from urllib3.exceptions import NewConnectionError
+
+from src.metrics import EMAIL_SEND_DURATION, MESSAGES, WHATSAPP_RETRIES, WHATSAPP_SEND_DURATION
+
+class TokenBucket:
+    """
+    Limitador de taxa (token bucket) compartilhado entre threads
+    """
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Tenta pegar um token sem bloquear: retorna 0 se conseguiu, senão
+        quantos segundos esperar antes de tentar de novo
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self):
+        """
+        Bloqueia até haver um token disponível
+        """
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+    
+    def pause(self, seconds: float):
+        """
+        Suspende a emissão de tokens (ex.: após um 429 da API)
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+            self._updated = self._paused_until
+
+_graph_session = None
+_rate_limiters = {}
+_graph_lock = threading.Lock()
+
+def get_graph_session() -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada (keep-alive) para a Graph API
+    """
+    global _graph_session
+    with _graph_lock:
+        if _graph_session is None:
+            pool_size = int(os.getenv('WHATSAPP_POOL_SIZE', '20'))
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                    pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _graph_session = session
+        return _graph_session
+
+def get_rate_limiter(phone_number_id: str) -> TokenBucket:
+    """
+    Retorna o limitador de mensagens por segundo do número remetente
+    (o limite da Meta é por número, então é compartilhado no processo)
+    """
+    with _graph_lock:
+        limiter = _rate_limiters.get(phone_number_id)
+        if limiter is None:
+            limiter = TokenBucket(float(os.getenv('WHATSAPP_MESSAGES_PER_SECOND', '20')))
+            _rate_limiters[phone_number_id] = limiter
+        return limiter
+
 class WhatsAppSender:
-    def __init__(self, access_token: str = None, phone_number_id: str = None):
+    def __init__(self, access_token: str = None, phone_number_id: str = None,
+                 session: requests.Session = None, rate_limiter: TokenBucket = None):
         self.access_token = access_token or os.getenv('WHATSAPP_ACCESS_TOKEN')
         self.phone_number_id = phone_number_id or os.getenv('WHATSAPP_PHONE_NUMBER_ID')
-        self.base_url = f"https://graph.facebook.com/v18.0/{self.phone_number_id}/messages"
-        
-    def send_message(self, to_number: str, message: str) -> bool:
+        graph_url = os.getenv('WHATSAPP_API_BASE_URL', 'https://graph.facebook.com/v18.0').rstrip('/')
+        self.base_url = f"{graph_url}/{self.phone_number_id}/messages"
+        self.session = session or get_graph_session()
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.phone_number_id)
+        self.max_retries = int(os.getenv('WHATSAPP_MAX_RETRIES', '3'))
+        self.timeout = int(os.getenv('WHATSAPP_TIMEOUT', '30'))
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
         """
-        Envia uma mensagem de texto via WhatsApp Business API
+        Tempo de espera antes de uma nova tentativa (Retry-After ou backoff exponencial)
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(60.0, 2 ** attempt)
+    
+    def _should_retry(self, response, attempt: int) -> bool:
+        # Erros 5xx não são repetidos: a Graph API não tem chave de
+        # idempotência e a mensagem pode já ter sido aceita pela Meta (o
+        # destinatário receberia o resumo duas vezes)
+        return response.status_code == 429 and attempt < self.max_retries
+    
+    def _prepare_retry(self, response, attempt: int) -> float:
+        """
+        Registra a nova tentativa após um 429 e retorna quanto o envio deve
+        esperar antes dela (a espera fica a cargo do limitador, pausado)
         """
+        WHATSAPP_RETRIES.inc(reason='429')
+        # Throttling afeta o número remetente: pausa todos os envios
+        self.rate_limiter.pause(self._retry_delay(response, attempt))
+        return 0.0
+    
+    def _connect_retry_delay(self, attempt: int) -> float:
+        """
+        Registra a nova tentativa após uma falha ao abrir a conexão (a
+        requisição não chegou a ser enviada) e retorna o backoff
+        """
+        WHATSAPP_RETRIES.inc(reason='connect')
+        return min(60.0, 2 ** attempt)
+    
+    @staticmethod
+    def _not_sent(error: requests.RequestException) -> bool:
+        """
+        Indica se a falha ocorreu antes de a requisição ser enviada (só
+        então é seguro repeti-la)
+        """
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(error, requests.ConnectionError) and isinstance(reason, NewConnectionError)
+    
+    def _post(self, payload: Dict, headers: Dict) -> requests.Response:
+        """
+        Envia a requisição respeitando o limite de taxa e repetindo em caso
+        de 429 ou de falha ao conectar
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.post(self.base_url, json=payload, headers=headers,
+                                             timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt >= self.max_retries or not self._not_sent(e):
+                    raise
+                time.sleep(self._connect_retry_delay(attempt))
+                continue
+            if not self._should_retry(response, attempt):
+                break
+            time.sleep(self._prepare_retry(response, attempt))
+        
+        response.raise_for_status()
+        return response
+    
+    def _headers(self) -> Dict:
         if not self.access_token or not self.phone_number_id:
             raise ValueError("WhatsApp access token and phone number ID are required")
         
-        headers = {
+        return {
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json'
         }
-        
-        # Remove caracteres especiais do número
-        clean_number = ''.join(filter(str.isdigit, to_number))
-        
-        # Adiciona código do país se não estiver presente
-        if not clean_number.startswith('55'):
-            clean_number = '55' + clean_number
-            
-        payload = {
+    
+    @staticmethod
+    def _clean_number(to_number: str) -> str:
+        return clean_whatsapp_number(to_number)
+    
+    def _text_payload(self, to_number: str, message: str) -> Dict:
+        return {
             "messaging_product": "whatsapp",
-            "to": clean_number,
+            "to": self._clean_number(to_number),
             "type": "text",
             "text": {
                 "body": message
             }
         }
+    
+    def _record_result(self, result: Dict, to_number: str) -> bool:
+        """
+        Interpreta a resposta da Graph API a uma mensagem de texto
+        """
+        if 'messages' in result:
+            print(f"Mensagem enviada com sucesso para {to_number}")
+            MESSAGES.inc(channel='whatsapp', outcome='sent')
+            return True
+        print(f"Erro ao enviar mensagem para {to_number}: {result}")
+        MESSAGES.inc(channel='whatsapp', outcome='rejected')
+        return False
+    
+    def send_message(self, to_number: str, message: str) -> bool:
+        """
+        Envia uma mensagem de texto via WhatsApp Business API
+        """
+        headers = self._headers()
+        payload = self._text_payload(to_number, message)
         
-        try:
-            response = requests.post(self.base_url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
-            if 'messages' in result:
-                print(f"Mensagem enviada com sucesso para {to_number}")
-                return True
-            else:
-                print(f"Erro ao enviar mensagem para {to_number}: {result}")
+        with WHATSAPP_SEND_DURATION.time():
+            try:
+                return self._record_result(self._post(payload, headers).json(), to_number)
+            except requests.RequestException as e:
+                print(f"Erro na requisição para {to_number}: {e}")
+                MESSAGES.inc(channel='whatsapp', outcome='error')
                 return False
-                
-        except requests.RequestException as e:
-            print(f"Erro na requisição para {to_number}: {e}")
-            return False
     
     def send_template_message(self, to_number: str, template_name: str, 
                             language_code: str = 'pt_BR', 
@@ -58,18 +229,8 @@ class WhatsAppSender:
         """
         Envia uma mensagem usando template aprovado
         """
-        if not self.access_token or not self.phone_number_id:
-            raise ValueError("WhatsApp access token and phone number ID are required")
+        headers = self._headers()
         
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
-        
-        clean_number = ''.join(filter(str.isdigit, to_number))
-        if not clean_number.startswith('55'):
-            clean_number = '55' + clean_number
-            
         template_data = {
             "name": template_name,
             "language": {
@@ -87,69 +248,262 @@ class WhatsAppSender:
         
         payload = {
             "messaging_product": "whatsapp",
-            "to": clean_number,
+            "to": self._clean_number(to_number),
             "type": "template",
             "template": template_data
         }
         
         try:
-            response = requests.post(self.base_url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._post(payload, headers).json()
             if 'messages' in result:
                 print(f"Template enviado com sucesso para {to_number}")
+                MESSAGES.inc(channel='whatsapp_template', outcome='sent')
                 return True
             else:
                 print(f"Erro ao enviar template para {to_number}: {result}")
+                MESSAGES.inc(channel='whatsapp_template', outcome='rejected')
                 return False
-                
+        
         except requests.RequestException as e:
             print(f"Erro na requisição de template para {to_number}: {e}")
+            MESSAGES.inc(channel='whatsapp_template', outcome='error')
             return False
 
+class WhatsAppDeliveryQueue:
+    """
+    Fila de entrega que envia a mesma mensagem para vários números em
+    paralelo, limitada pelo token bucket do remetente
+    """
+    def __init__(self, sender: WhatsAppSender, max_workers: int = None):
+        self.sender = sender
+        self.max_workers = max_workers or int(os.getenv('WHATSAPP_DELIVERY_WORKERS', '8'))
+    
+    def send_all(self, numbers: List[str], message: str) -> List[bool]:
+        """
+        Envia a mensagem para todos os números; retorna o resultado de cada
+        envio na ordem recebida
+        """
+        if not numbers:
+            return []
+        if self.max_workers <= 1 or len(numbers) == 1:
+            return [self.sender.send_message(number, message) for number in numbers]
+        
+        workers = min(self.max_workers, len(numbers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda number: self.sender.send_message(number, message), numbers))
+
 class EmailSender:
-    def __init__(self, smtp_server: str = None, smtp_port: int = 587,
-                 email: str = None, password: str = None):
+    def __init__(self, smtp_server: str = None, smtp_port: int = None,
+                 email: str = None, password: str = None,
+                 max_messages_per_connection: int = None):
         self.smtp_server = smtp_server or os.getenv('SMTP_SERVER', 'smtp.gmail.com')
         self.smtp_port = smtp_port or int(os.getenv('SMTP_PORT', '587'))
         self.email = email or os.getenv('EMAIL_ADDRESS')
         self.password = password or os.getenv('EMAIL_PASSWORD')
+        self.max_messages_per_connection = max_messages_per_connection or int(
+            os.getenv('SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+        self.use_tls = os.getenv('SMTP_STARTTLS', '1') != '0'
+    
+    def connect(self) -> smtplib.SMTP:
+        """
+        Abre uma conexão SMTP autenticada
+        """
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.email, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def build_message(self, to_email: str, subject: str, body: str,
+                      html_body: str = None) -> str:
+        """
+        Monta a mensagem MIME de um email (texto simples e, se houver, HTML)
+        """
+        msg = MIMEMultipart('alternative') if html_body else MIMEMultipart()
+        msg['From'] = self.email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+        if html_body:
+            msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg.as_string()
+    
+    def session(self) -> 'SMTPSession':
+        """
+        Retorna uma sessão que reutiliza a conexão autenticada entre envios
+        """
+        return SMTPSession(self)
     
     def send_email(self, to_email: str, subject: str, body: str) -> bool:
         """
         Envia um email
         """
-        import smtplib
-        from email.mime.text import MIMEText
-        from email.mime.multipart import MIMEMultipart
-        
-        if not self.email or not self.password:
+        with self.session() as smtp_session:
+            return smtp_session.send(to_email, subject, body)
+
+class SMTPSession:
+    """
+    Conexão SMTP de longa duração: autentica uma vez, envia várias mensagens,
+    reconecta após falhas de conexão e renova a conexão a cada
+    ``max_messages_per_connection`` mensagens
+    """
+    def __init__(self, sender: EmailSender):
+        self.sender = sender
+        self.server = None
+        self.sent_on_connection = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                self.server.close()
+            self.server = None
+            self.sent_on_connection = 0
+    
+    def _discard_connection(self):
+        if self.server is not None:
+            self.server.close()
+        self.server = None
+        self.sent_on_connection = 0
+    
+    def send(self, to_email: str, subject: str, body: str, html_body: str = None) -> bool:
+        """
+        Envia um email pela conexão atual (conectando se necessário)
+        """
+        with EMAIL_SEND_DURATION.time():
+            sent = self._send(to_email, subject, body, html_body)
+        MESSAGES.inc(channel='email', outcome='sent' if sent else 'error')
+        return sent
+    
+    def _send(self, to_email: str, subject: str, body: str, html_body: str = None) -> bool:
+        if not self.sender.email or not self.sender.password:
             print("Credenciais de email não configuradas")
             return False
         
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email, to_email, text)
-            server.quit()
-            
-            print(f"Email enviado com sucesso para {to_email}")
-            return True
+        text = self.sender.build_message(to_email, subject, body, html_body)
+        
+        # Uma nova tentativa em conexão nova se a atual tiver caído
+        for attempt in range(2):
+            try:
+                if self.sent_on_connection >= self.sender.max_messages_per_connection:
+                    self.close()
+                if self.server is None:
+                    self.server = self.sender.connect()
+                
+                self.server.sendmail(self.sender.email, to_email, text)
+                self.sent_on_connection += 1
+                
+                print(f"Email enviado com sucesso para {to_email}")
+                return True
             
-        except Exception as e:
-            print(f"Erro ao enviar email para {to_email}: {e}")
-            return False
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                    smtplib.SMTPDataError) as e:
+                # Falha da mensagem, a conexão continua válida
+                print(f"Erro ao enviar email para {to_email}: {e}")
+                return False
+            except (smtplib.SMTPServerDisconnected, OSError) as e:
+                self._discard_connection()
+                if attempt == 1:
+                    print(f"Erro ao enviar email para {to_email}: {e}")
+            except Exception as e:
+                self._discard_connection()
+                print(f"Erro ao enviar email para {to_email}: {e}")
+                return False
+        
+        return False
+
+class DigestRenderer:
+    """
+    Monta uma única vez, a partir dos trechos de cada artigo, as variantes do
+    resumo para cada canal: WhatsApp (markdown), texto simples e HTML
+    """
+    TITLE = "Resumo Diário de Notícias"
+    
+    def render(self, fragments: List[Dict[str, str]]) -> Dict:
+        """
+        Recebe os trechos formatados (NewsCurator.render_fragments) de cada artigo
+        """
+        total = len(fragments)
+        whatsapp = self._join(f"🗞️ *{self.TITLE}*", [f['whatsapp'] for f in fragments], total)
+        plain = self._join(f"🗞️ {self.TITLE}", [f['plain'] for f in fragments], total)
+        html = (
+            f"<html><body>\n<h2>🗞️ {self.TITLE}</h2>\n"
+            + "\n<hr>\n".join(f['html'] for f in fragments)
+            + f"\n<p>📊 Total de notícias: {total}</p>\n</body></html>"
+        )
+        return {
+            'whatsapp': whatsapp,
+            'plain': plain,
+            'html': html,
+            'subject': self.subject(total),
+            'total_news': total
+        }
+    
+    def render_summaries(self, news_summaries: List[str]) -> Dict:
+        """
+        Monta o resumo a partir de resumos já formatados para o WhatsApp
+        """
+        total = len(news_summaries)
+        whatsapp = self._join(f"🗞️ *{self.TITLE}*", news_summaries, total)
+        return {
+            'whatsapp': whatsapp,
+            # Converte markdown para texto simples para email
+            'plain': whatsapp.replace('*', '').replace('_', ''),
+            'html': None,
+            'subject': self.subject(total),
+            'total_news': total
+        }
+    
+    def subject(self, total: int) -> str:
+        return f"{self.TITLE} - {total} artigos"
+    
+    def _join(self, header: str, parts: List[str], total: int) -> str:
+        message = f"{header}\n\n"
+        message += "\n\n" + "="*50 + "\n\n".join(parts)
+        message += f"\n\n📊 Total de notícias: {total}"
+        return message
+
+def clean_whatsapp_number(number: str) -> str:
+    """
+    Número de WhatsApp só com dígitos e com o código do país (55), como a
+    Graph API espera e como os destinatários são gravados
+    """
+    # Remove caracteres especiais do número
+    clean_number = ''.join(filter(str.isdigit, number))
+    
+    # Adiciona código do país se não estiver presente
+    if not clean_number.startswith('55'):
+        clean_number = '55' + clean_number
+    return clean_number
+
+def split_recipients(recipients: List[Dict]):
+    """
+    Separa os endereços dos destinatários por canal: (números de WhatsApp, emails)
+    """
+    whatsapp_numbers = []
+    email_addresses = []
+    
+    for recipient in recipients:
+        recipient_type = recipient.get('type')
+        address = recipient.get('address')
+        
+        if recipient_type == 'whatsapp':
+            whatsapp_numbers.append(address)
+        elif recipient_type == 'email':
+            email_addresses.append(address)
+    return whatsapp_numbers, email_addresses
 
 class MessageDispatcher:
     def __init__(self, whatsapp_sender: WhatsAppSender = None, 
@@ -165,37 +519,36 @@ class MessageDispatcher:
             print("Nenhuma notícia para enviar")
             return {'success': 0, 'failed': 0}
         
-        # Combina todas as notícias em uma mensagem
-        digest_message = "🗞️ *Resumo Diário de Notícias*\n\n"
-        digest_message += "\n\n" + "="*50 + "\n\n".join(news_summaries)
-        digest_message += f"\n\n📊 Total de notícias: {len(news_summaries)}"
+        return self.send_rendered_digest(recipients, DigestRenderer().render_summaries(news_summaries))
+    
+    def send_rendered_digest(self, recipients: List[Dict], digest: Dict) -> Dict:
+        """
+        Envia um resumo já renderizado (DigestRenderer) para todos os destinatários
+        """
+        if not digest or not digest['total_news']:
+            print("Nenhuma notícia para enviar")
+            return {'success': 0, 'failed': 0}
         
         success_count = 0
         failed_count = 0
+        whatsapp_numbers, email_addresses = split_recipients(recipients)
         
-        for recipient in recipients:
-            recipient_type = recipient.get('type')
-            address = recipient.get('address')
-            
-            if recipient_type == 'whatsapp':
-                if self.whatsapp_sender.send_message(address, digest_message):
-                    success_count += 1
-                else:
-                    failed_count += 1
-                    
-            elif recipient_type == 'email':
-                subject = f"Resumo Diário de Notícias - {len(news_summaries)} artigos"
-                # Converte markdown para texto simples para email
-                email_body = digest_message.replace('*', '').replace('_', '')
-                
-                if self.email_sender.send_email(address, subject, email_body):
-                    success_count += 1
-                else:
-                    failed_count += 1
+        if whatsapp_numbers:
+            results = WhatsAppDeliveryQueue(self.whatsapp_sender).send_all(whatsapp_numbers, digest['whatsapp'])
+            success_count += sum(1 for sent in results if sent)
+            failed_count += sum(1 for sent in results if not sent)
+        
+        if email_addresses:
+            # Todos os emails do resumo saem pela mesma conexão SMTP
+            with self.email_sender.session() as smtp_session:
+                for address in email_addresses:
+                    if smtp_session.send(address, digest['subject'], digest['plain'], digest['html']):
+                        success_count += 1
+                    else:
+                        failed_count += 1
         
         return {
             'success': success_count,
             'failed': failed_count,
-            'total_news': len(news_summaries)
+            'total_news': digest['total_news']
         }
-
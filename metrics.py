@@ -0,0 +1,187 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+# Limites (em segundos) padrão dos histogramas de latência
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    kind = None
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera os rótulos {self.labelnames}, recebeu {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+class Counter(_Metric):
+    """
+    Contador monotônico com rótulos
+    """
+    kind = 'counter'
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    def _render_samples(self, items):
+        for key, value in items:
+            yield f"{self.name}{_format_labels(zip(self.labelnames, key))} {_format_value(value)}"
+
+class Histogram(_Metric):
+    """
+    Histograma de latências com rótulos (contagem por faixa, soma e total)
+    """
+    kind = 'histogram'
+    
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Contagens por faixa (a última é +Inf), soma e total
+                state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = state
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """
+        Mede a duração do bloco (também quando ele termina com exceção)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+    
+    def totals(self) -> Dict[Tuple, Tuple[int, float]]:
+        """
+        Total de observações e soma das durações por combinação de rótulos
+        """
+        with self._lock:
+            return {key: (state[2], state[1]) for key, state in self._values.items()}
+    
+    def _render_samples(self, items):
+        for key, (bucket_counts, total, count) in items:
+            label_pairs = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(label_pairs + [('le', _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(label_pairs)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(label_pairs)} {count}"
+
+class MetricsRegistry:
+    """
+    Conjunto de métricas do processo, exportado no formato texto do Prometheus
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+    
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+    
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+# Etapas do pipeline: carga de configuração, busca, registro de artigos,
+# agrupamento de duplicatas, curadoria, renderização, envio e o resumo completo
+STAGE_DURATION = registry.histogram(
+    'news_agent_stage_duration_seconds', 'Duração de cada etapa do pipeline de resumos', ['stage'])
+DIGESTS = registry.counter(
+    'news_agent_digests_total', 'Resumos processados por resultado', ['status'])
+
+NEWSAPI_REQUEST_DURATION = registry.histogram(
+    'news_agent_newsapi_request_duration_seconds', 'Duração das requisições à NewsAPI', ['endpoint'])
+NEWSAPI_REQUESTS = registry.counter(
+    'news_agent_newsapi_requests_total',
+    'Requisições à NewsAPI (consumo de cota) por endpoint, usuário dono da chave e resultado',
+    ['endpoint', 'user', 'outcome'])
+NEWSAPI_ERRORS = registry.counter(
+    'news_agent_newsapi_errors_total', 'Erros da NewsAPI por classe', ['error'])
+
+WHATSAPP_SEND_DURATION = registry.histogram(
+    'news_agent_whatsapp_send_duration_seconds', 'Duração de cada envio pelo WhatsApp (com novas tentativas)')
+EMAIL_SEND_DURATION = registry.histogram(
+    'news_agent_email_send_duration_seconds', 'Duração de cada envio de email')
+MESSAGES = registry.counter(
+    'news_agent_messages_total', 'Mensagens enviadas por canal e resultado', ['channel', 'outcome'])
+WHATSAPP_RETRIES = registry.counter(
+    'news_agent_whatsapp_retries_total', 'Novas tentativas de envio pelo WhatsApp por motivo', ['reason'])
+
+def quota_user_label(user_id: int = None) -> str:
+    """
+    Identifica nas métricas de quem é a chave da NewsAPI usada: o id do
+    usuário ou 'global' para a NEWS_API_KEY do servidor. Nada da chave
+    aparece nas métricas
+    """
+    return str(user_id) if user_id is not None else 'global'
@@ -0,0 +1,295 @@
+"""
+Migrações versionadas do banco (substituem o ``db.create_all()`` na
+inicialização). A versão aplicada fica na tabela schema_version e
+``upgrade()`` aplica, em ordem e em uma transação, as migrações mais novas.
+
+Em um banco vazio a versão 1 já cria o esquema atual dos modelos, então as
+migrações seguintes devem ser idempotentes (``checkfirst``, IF NOT EXISTS,
+conferir colunas existentes antes de adicioná-las). Fora a versão 1, elas
+descrevem as colunas e índices como eram naquela versão, sem ler os modelos
+atuais: um banco antigo passa por todas elas em sequência.
+
+Uso (a partir do diretório do projeto):
+    python migrations.py status
+    python migrations.py upgrade
+    python migrations.py upgrade --dedupe
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+                        false, func, select, text)
+
+# Adiciona o diretório pai ao path para importar módulos
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.user import db, refresh_user_counters
+# Importados para que os metadados incluam todas as tabelas
+from src.models.article import Article, DeliveredArticle
+from src.models.digest_job import DigestJob
+from src.models.on_demand_job import OnDemandJob
+
+schema_version = Table(
+    'schema_version', db.metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+# Chave do advisory lock do PostgreSQL que serializa workers subindo juntos
+MIGRATION_LOCK_KEY = 7240311
+
+# No SQLite o lock é o de escrita do próprio banco (BEGIN IMMEDIATE); quem
+# chega depois espera até este tempo pelas migrações de quem chegou antes
+SQLITE_LOCK_TIMEOUT_MS = int(os.getenv('MIGRATION_SQLITE_LOCK_TIMEOUT_SECONDS', '600')) * 1000
+
+MIGRATIONS = []
+
+def migration(version: int, description: str):
+    """
+    Registra uma migração; as versões devem ser crescentes
+    """
+    def register(function: Callable):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, 'versões de migração fora de ordem'
+        MIGRATIONS.append((version, description, function))
+        return function
+    return register
+
+@migration(1, 'esquema inicial')
+def create_tables(connection):
+    # Em bancos criados antes das migrações só cria as tabelas que faltam
+    db.metadata.create_all(bind=connection)
+
+def create_index(connection, table: str, name: str, columns: List[str], unique: bool = False,
+                 where: Dict[str, str] = None):
+    """
+    Cria (se ainda não existir) o índice como definido pela migração;
+    ``where`` é a condição de índice parcial de cada dialeto
+    """
+    snapshot = Table(table, MetaData(), *(Column(column) for column in columns))
+    options = {f'{dialect}_where': text(condition) for dialect, condition in (where or {}).items()}
+    Index(name, *(snapshot.c[column] for column in columns), unique=unique, **options) \
+        .create(bind=connection, checkfirst=True)
+
+# Índices únicos por usuário criados pela migração 2: tabela, nome e colunas
+UNIQUE_INDEXES = (
+    ('topic', 'uq_topic_user_name', ['user_id', 'topic_name']),
+    ('source', 'uq_source_user_name', ['user_id', 'source_name']),
+    ('recipient', 'uq_recipient_user_address', ['user_id', 'address'])
+)
+
+# Máximo de grupos duplicados listados no relatório
+MAX_REPORTED_DUPLICATES = 20
+
+class DuplicateRowsError(RuntimeError):
+    """
+    Há linhas repetidas que impedem a criação de um índice único
+    """
+
+def find_duplicates(connection, table, columns: List[str]) -> List:
+    """
+    Grupos repetidos de ``columns``: valores, menor id e número de linhas
+    """
+    group = ', '.join(columns)
+    return connection.execute(text(
+        f"SELECT {group}, MIN(id), COUNT(*) FROM {table} GROUP BY {group} HAVING COUNT(*) > 1 ORDER BY {group}"
+    )).all()
+
+def duplicates_report(duplicates) -> str:
+    lines = []
+    for table, columns, rows in duplicates:
+        total = sum(row[-1] - 1 for row in rows)
+        lines.append(f"{table} ({', '.join(columns)}): {len(rows)} grupo(s), {total} linha(s) a mais")
+        for row in rows[:MAX_REPORTED_DUPLICATES]:
+            values = ', '.join(f'{column}={value!r}' for column, value in zip(columns, row))
+            lines.append(f"  {values}: {row[-1]} linhas (a mais antiga é o id {row[-2]})")
+        if len(rows) > MAX_REPORTED_DUPLICATES:
+            lines.append(f"  ... e mais {len(rows) - MAX_REPORTED_DUPLICATES} grupo(s)")
+    return '\n'.join(lines)
+
+def remove_duplicates(connection, table, columns: List[str]) -> int:
+    """
+    Mantém apenas a linha mais antiga (menor id) de cada combinação de
+    ``columns``, para que o índice único possa ser criado
+    """
+    group = ', '.join(columns)
+    result = connection.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {group})"
+    ))
+    if result.rowcount:
+        print(f"Migração: {result.rowcount} linha(s) duplicada(s) removida(s) de {table} ({group})")
+    return result.rowcount
+
+@migration(2, 'índices de user_id, unicidade de tópicos, fontes e destinatários e índice de usuários prontos')
+def add_indexes(connection):
+    # Linhas repetidas só são apagadas com ``upgrade --dedupe``; sem ele a
+    # migração falha listando-as, para que sejam conferidas antes
+    duplicates = []
+    for table, _, columns in UNIQUE_INDEXES:
+        rows = find_duplicates(connection, table, columns)
+        if rows:
+            duplicates.append((table, columns, rows))
+    if duplicates and not connection.info.get('dedupe'):
+        raise DuplicateRowsError(
+            "Há linhas duplicadas que impedem os índices únicos:\n" + duplicates_report(duplicates) +
+            "\nCorrija-as ou rode 'python migrations.py upgrade --dedupe' para manter só a mais antiga de cada grupo")
+    for table, columns, _ in duplicates:
+        remove_duplicates(connection, table, columns)
+    
+    for table, name, columns in UNIQUE_INDEXES:
+        create_index(connection, table, name, columns, unique=True)
+    ready = "api_key_news IS NOT NULL AND api_key_news != ''"
+    create_index(connection, 'user', 'ix_user_ready', ['id'], where={'sqlite': ready, 'postgresql': ready})
+
+def add_missing_columns(connection, table) -> List[str]:
+    """
+    Adiciona (ALTER TABLE ... ADD COLUMN) as colunas de ``table`` que ainda
+    não existem no banco; colunas NOT NULL precisam de server_default
+    """
+    existing = {column['name'] for column in db.inspect(connection).get_columns(table.name)}
+    preparer = connection.dialect.identifier_preparer
+    compiler = connection.dialect.ddl_compiler(connection.dialect, None)
+    added = []
+    for column in table.columns:
+        if column.name not in existing:
+            connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} "
+                                    f"ADD COLUMN {compiler.get_column_specification(column)}"))
+            added.append(column.name)
+    return added
+
+@migration(3, 'contadores de configuração e indicador is_ready dos usuários')
+def add_user_counters(connection):
+    counters = ['topics_count', 'avoid_topics_count', 'sources_count', 'avoid_sources_count',
+                'whatsapp_count', 'email_count']
+    add_missing_columns(connection, Table(
+        'user', MetaData(),
+        *(Column(name, Integer, nullable=False, server_default='0') for name in counters),
+        Column('is_ready', Boolean, nullable=False, server_default=false())
+    ))
+    refresh_user_counters(connection)
+    create_index(connection, 'user', 'ix_user_is_ready', ['id'],
+                 where={'sqlite': 'is_ready = 1', 'postgresql': 'is_ready'})
+
+@migration(4, 'estado dos jobs sob demanda compartilhado entre processos')
+def add_on_demand_jobs(connection):
+    metadata = MetaData()
+    # Só a chave referenciada pela foreign key
+    Table('user', metadata, Column('id', Integer, primary_key=True))
+    active = "status IN ('queued', 'running')"
+    on_demand_job = Table(
+        'on_demand_job', metadata,
+        Column('id', String(32), primary_key=True),
+        Column('kind', String(40), nullable=False),
+        Column('user_id', Integer, ForeignKey('user.id', ondelete='CASCADE'), nullable=False),
+        Column('status', String(20), nullable=False),
+        Column('stage', String(40)),
+        Column('progress', Text),
+        Column('result', Text),
+        Column('error', Text),
+        Column('created_at', DateTime, nullable=False),
+        Column('started_at', DateTime),
+        Column('finished_at', DateTime),
+        Column('heartbeat_at', DateTime, nullable=False),
+        Index('uq_on_demand_job_active', 'user_id', 'kind', unique=True,
+              sqlite_where=text(active), postgresql_where=text(active))
+    )
+    on_demand_job.create(bind=connection, checkfirst=True)
+
+def current_version(connection) -> int:
+    if not db.inspect(connection).has_table('schema_version'):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+def upgrade(target: int = None, dedupe: bool = False) -> List[int]:
+    """
+    Aplica as migrações pendentes (até ``target``, se informado); deve rodar
+    dentro de um app context. Com ``dedupe`` as migrações podem apagar linhas
+    duplicadas que impedem índices únicos (sem ele falham com
+    DuplicateRowsError e nada é alterado). Retorna as versões aplicadas
+    """
+    if db.engine.dialect.name == 'sqlite':
+        return _upgrade_sqlite(target, dedupe)
+    
+    with db.engine.begin() as connection:
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+        return _apply(connection, target, dedupe)
+
+def _upgrade_sqlite(target: int = None, dedupe: bool = False) -> List[int]:
+    """
+    ``upgrade`` no SQLite: o pysqlite só abre a transação na primeira
+    escrita, então dois processos leriam a mesma versão e aplicariam as
+    mesmas migrações. BEGIN IMMEDIATE reserva a escrita antes da leitura da
+    versão; quem chega depois espera e encontra o banco já atualizado
+    """
+    with db.engine.connect() as connection:
+        cursor = connection.connection.dbapi_connection.cursor()
+        busy_timeout = cursor.execute('PRAGMA busy_timeout').fetchone()[0]
+        cursor.execute(f'PRAGMA busy_timeout = {SQLITE_LOCK_TIMEOUT_MS}')
+        try:
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+            applied = _apply(connection, target, dedupe)
+            connection.commit()
+            return applied
+        finally:
+            # A conexão volta ao pool com o tempo de espera original
+            cursor.execute(f'PRAGMA busy_timeout = {busy_timeout}')
+            cursor.close()
+
+def _apply(connection, target: int = None, dedupe: bool = False) -> List[int]:
+    """
+    Aplica as migrações pendentes na transação de ``connection``, com o lock
+    de migração já adquirido
+    """
+    applied = []
+    connection.info['dedupe'] = dedupe
+    schema_version.create(bind=connection, checkfirst=True)
+    current = current_version(connection)
+    
+    for version, description, function in MIGRATIONS:
+        if version <= current or (target is not None and version > target):
+            continue
+        print(f"Aplicando migração {version}: {description}")
+        function(connection)
+        connection.execute(schema_version.insert().values(
+            version=version, description=description, applied_at=datetime.utcnow()))
+        applied.append(version)
+    return applied
+
+def main():
+    from flask import Flask
+    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=('status', 'upgrade'))
+    parser.add_argument('--target', type=int, default=None, help='versão final (padrão: a mais nova)')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='apaga linhas duplicadas que impedem índices únicos (mantém a mais antiga)')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL') or
+                        f"sqlite:///{os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'app.db')}")
+    args = parser.parse_args()
+    
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.database_url
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    
+    with app.app_context():
+        if args.command == 'upgrade':
+            try:
+                applied = upgrade(args.target, dedupe=args.dedupe)
+            except DuplicateRowsError as e:
+                print(e)
+                sys.exit(1)
+            print(f"Migrações aplicadas: {', '.join(map(str, applied))}" if applied else "Banco já atualizado")
+        
+        with db.engine.connect() as connection:
+            version = current_version(connection)
+        for number, description, _ in MIGRATIONS:
+            state = 'aplicada' if number <= version else 'pendente'
+            print(f"  {number:>3} [{state}] {description}")
+
+if __name__ == '__main__':
+    main()
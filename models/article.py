@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from .user import db
+
+class Article(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    url_hash = db.Column(db.String(64), unique=True, nullable=False)  # SHA-256 da URL normalizada
+    url = db.Column(db.Text, nullable=False)
+    title = db.Column(db.String(500), nullable=True)
+    source_name = db.Column(db.String(200), nullable=True)
+    published_at = db.Column(db.String(40), nullable=True)  # ISO 8601, como retornado pela NewsAPI
+    first_seen_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'source_name': self.source_name,
+            'published_at': self.published_at
+        }
+
+class DeliveredArticle(db.Model):
+    # A chave primária (user_id, article_id) serve de índice para "já entregue?"
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id', ondelete='CASCADE'), primary_key=True)
+    delivered_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+
+from .user import db
+
+class DigestJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    run_key = db.Column(db.String(64), nullable=False)  # ex.: '2024-05-01@daily' ou 'manual-...'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    lease_owner = db.Column(db.String(120), nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    result = db.Column(db.Text, nullable=True)  # JSON do resultado de process_user_digest
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        # Garante que cada usuário entra uma única vez em cada execução
+        db.UniqueConstraint('run_key', 'user_id', name='uq_digest_job_run_user'),
+        db.Index('ix_digest_job_claim', 'status', 'lease_expires_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'run_key': self.run_key,
+            'user_id': self.user_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'lease_owner': self.lease_owner,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error
+        }
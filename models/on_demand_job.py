@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+from .user import db
+
+# Status de jobs ainda não terminados
+ACTIVE_STATUSES = ('queued', 'running')
+
+class OnDemandJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 em hexadecimal
+    kind = db.Column(db.String(40), nullable=False)  # ex.: 'run_daily_digest', 'test_news_search'
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    stage = db.Column(db.String(40), nullable=True)
+    progress = db.Column(db.Text, nullable=True)  # JSON dos contadores de progresso
+    result = db.Column(db.Text, nullable=True)  # JSON do resultado
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    # Renovado pelo processo que executa o job; parado há muito tempo indica
+    # que o processo caiu
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        # No máximo um job ativo de cada tipo por usuário, entre todos os processos
+        db.Index('uq_on_demand_job_active', 'user_id', 'kind', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')"),
+                 postgresql_where=db.text("status IN ('queued', 'running')")),
+    )
+    
+    @property
+    def finished(self) -> bool:
+        return self.status not in ACTIVE_STATUSES
+    
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': json.loads(self.progress) if self.progress else {},
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
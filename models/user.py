@@ -1,4 +1,8 @@
+from itertools import chain
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, case, event, func, select, update
+from sqlalchemy.orm import Session
 from werkzeug.security import generate_password_hash, check_password_hash
 
 db = SQLAlchemy()
@@ -10,20 +14,44 @@ class User(db.Model):
     api_key_news = db.Column(db.String(255), nullable=True)
     is_admin = db.Column(db.Boolean, default=False)
     
+    # Contadores desnormalizados da configuração, recalculados na mesma
+    # transação que altera tópicos, fontes, destinatários ou a API key
+    # (ver refresh_user_counters)
+    topics_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    avoid_topics_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    sources_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    avoid_sources_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    whatsapp_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    email_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # API key, ao menos um tópico de interesse e um destinatário
+    is_ready = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    
+    __table_args__ = (
+        # Índice parcial só com os usuários que têm API key (os que entram na
+        # execução diária)
+        db.Index('ix_user_ready', 'id',
+                 sqlite_where=db.text("api_key_news IS NOT NULL AND api_key_news != ''"),
+                 postgresql_where=db.text("api_key_news IS NOT NULL AND api_key_news != ''")),
+        # Usuários prontos para a execução diária
+        db.Index('ix_user_is_ready', 'id',
+                 sqlite_where=db.text('is_ready = 1'),
+                 postgresql_where=db.text('is_ready')),
+    )
+    
     # Relacionamentos
     topics = db.relationship('Topic', backref='user', lazy=True, cascade='all, delete-orphan')
     sources = db.relationship('Source', backref='user', lazy=True, cascade='all, delete-orphan')
     recipients = db.relationship('Recipient', backref='user', lazy=True, cascade='all, delete-orphan')
-
+    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
-
+    
     def __repr__(self):
         return f'<User {self.username}>'
-
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -39,6 +67,12 @@ class Topic(db.Model):
     priority = db.Column(db.Integer, default=3)  # 1-5, 1=mais importante
     avoid = db.Column(db.Boolean, default=False)
     
+    __table_args__ = (
+        # Único por usuário; também serve de índice para user_id (coluna da
+        # esquerda), usado pelos relacionamentos e pelas rotas
+        db.Index('uq_topic_user_name', 'user_id', 'topic_name', unique=True),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -54,6 +88,10 @@ class Source(db.Model):
     priority = db.Column(db.Integer, default=3)  # 1-5, 1=mais importante
     avoid = db.Column(db.Boolean, default=False)
     
+    __table_args__ = (
+        db.Index('uq_source_user_name', 'user_id', 'source_name', unique=True),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -68,9 +106,62 @@ class Recipient(db.Model):
     type = db.Column(db.String(20), nullable=False)  # 'whatsapp' ou 'email'
     address = db.Column(db.String(200), nullable=False)  # número ou email
     
+    __table_args__ = (
+        db.Index('uq_recipient_user_address', 'user_id', 'address', unique=True),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
             'type': self.type,
             'address': self.address
         }
+
+def refresh_user_counters(connection, user_ids=None):
+    """
+    Recalcula os contadores e o indicador is_ready dos usuários informados
+    (todos, se None) a partir das tabelas de tópicos, fontes e destinatários,
+    em um único UPDATE por bloco de usuários
+    """
+    users, topics, sources, recipients = (User.__table__, Topic.__table__,
+                                          Source.__table__, Recipient.__table__)
+    
+    def count(table, *conditions):
+        return (select(func.count()).select_from(table)
+                .where(table.c.user_id == users.c.id, *conditions).scalar_subquery())
+    
+    topics_count = count(topics, func.coalesce(topics.c.avoid, False) == False)
+    whatsapp_count = count(recipients, recipients.c.type == 'whatsapp')
+    email_count = count(recipients, recipients.c.type == 'email')
+    values = {
+        'topics_count': topics_count,
+        'avoid_topics_count': count(topics, topics.c.avoid == True),
+        'sources_count': count(sources, func.coalesce(sources.c.avoid, False) == False),
+        'avoid_sources_count': count(sources, sources.c.avoid == True),
+        'whatsapp_count': whatsapp_count,
+        'email_count': email_count,
+        'is_ready': case((and_(users.c.api_key_news.isnot(None), users.c.api_key_news != '',
+                               topics_count > 0, whatsapp_count + email_count > 0), True), else_=False)
+    }
+    
+    if user_ids is None:
+        connection.execute(update(users).values(values))
+        return
+    user_ids = sorted(set(user_ids))
+    # Blocos de 500 ids: um parâmetro por id, abaixo dos 999 parâmetros
+    # aceitos pelo SQLite anterior à 3.32
+    for start in range(0, len(user_ids), 500):
+        connection.execute(update(users).where(users.c.id.in_(user_ids[start:start + 500])).values(values))
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_counters_after_flush(session, flush_context):
+    # new/dirty/deleted ainda refletem o que acabou de ser gravado
+    user_ids = set()
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, (Topic, Source, Recipient)):
+            user_ids.add(instance.user_id)
+        elif isinstance(instance, User) and instance not in session.deleted:
+            user_ids.add(instance.id)
+    user_ids.discard(None)
+    if user_ids:
+        refresh_user_counters(session.connection(), user_ids)
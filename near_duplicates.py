@@ -0,0 +1,149 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Assinatura MinHash de permutação única: o hash de cada característica
+# escolhe um dos 32 compartimentos e cada compartimento guarda o menor valor.
+# O índice LSH usa 8 faixas de 4 compartimentos, então pares com
+# similaridade de Jaccard acima de ~0,6 quase sempre caem em algum balde em
+# comum; a similaridade estimada pela assinatura confirma o par
+MINHASH_BINS = 32
+LSH_BANDS = 8
+LSH_ROWS = MINHASH_BINS // LSH_BANDS
+SIMILARITY_THRESHOLD = 0.7
+# Limita as comparações por balde (matérias repetidas dezenas de vezes caem
+# no mesmo balde); a união transitiva ainda junta o grupo inteiro
+MAX_BUCKET_COMPARISONS = 32
+
+_WORD_RE = re.compile(r'\w+')
+
+@lru_cache(maxsize=100000)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def text_features(text: str) -> set:
+    """
+    Palavras e pares de palavras consecutivas do texto normalizado
+    """
+    words = _WORD_RE.findall((text or '').lower())
+    features = set(words)
+    features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return features
+
+def minhash_signature(text: str) -> Tuple[int, ...]:
+    """
+    Calcula a assinatura MinHash do texto (tupla vazia para texto vazio)
+    """
+    features = text_features(text)
+    if not features:
+        return ()
+    
+    signature = [None] * MINHASH_BINS
+    for feature in features:
+        value = _feature_hash(feature)
+        position = value % MINHASH_BINS
+        value //= MINHASH_BINS
+        if signature[position] is None or value < signature[position]:
+            signature[position] = value
+    
+    # Compartimentos vazios copiam o próximo preenchido (em círculo), marcado
+    # com a distância, para que textos curtos continuem comparáveis
+    for position in range(MINHASH_BINS):
+        if signature[position] is None:
+            distance = 1
+            while signature[(position + distance) % MINHASH_BINS] is None:
+                distance += 1
+            signature[position] = signature[(position + distance) % MINHASH_BINS] + (distance << 64)
+    return tuple(signature)
+
+def article_signature(article: Dict) -> Tuple[int, ...]:
+    """
+    Assinatura do título + descrição do artigo (memorizada no próprio artigo)
+    """
+    signature = article.get('minhash')
+    if signature is None:
+        signature = minhash_signature(f"{article.get('title') or ''} {article.get('description') or ''}")
+        article['minhash'] = signature
+    return signature
+
+def estimated_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """
+    Similaridade de Jaccard estimada a partir de duas assinaturas
+    """
+    if not first or not second:
+        return 0.0
+    return sum(1 for a, b in zip(first, second) if a == b) / MINHASH_BINS
+
+def cluster_near_duplicates(articles: List[Dict],
+                            threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Agrupa artigos quase idênticos (similaridade estimada de pelo menos
+    ``threshold``) usando um índice LSH por faixas e união de conjuntos.
+    Retorna os grupos como listas de índices de ``articles``, na ordem da
+    primeira ocorrência
+    """
+    parent = list(range(len(articles)))
+    
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+    
+    buckets = {}
+    signatures = []
+    
+    for index, article in enumerate(articles):
+        signature = article_signature(article)
+        signatures.append(signature)
+        # Textos vazios não são comparados (não são a mesma matéria)
+        if not signature:
+            continue
+        
+        for band in range(LSH_BANDS):
+            key = (band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+            bucket = buckets.setdefault(key, [])
+            for other in bucket[-MAX_BUCKET_COMPARISONS:]:
+                root, other_root = find(index), find(other)
+                if root != other_root and estimated_similarity(signature, signatures[other]) >= threshold:
+                    # A raiz é sempre o índice menor (primeira ocorrência)
+                    parent[max(root, other_root)] = min(root, other_root)
+            bucket.append(index)
+    
+    clusters = {}
+    for index in range(len(articles)):
+        clusters.setdefault(find(index), []).append(index)
+    return list(clusters.values())
+
+def collapse_near_duplicates(articles: List[Dict], sources=None,
+                             threshold: float = SIMILARITY_THRESHOLD) -> List[Dict]:
+    """
+    Mantém um representante por grupo de matérias quase idênticas (fonte
+    preferida de maior prioridade segundo ``sources`` - SourcePreferences -,
+    depois o artigo com descrição, depois o primeiro da lista) e anexa os
+    demais em ``also_covered_by``. A ordem relativa dos representantes é
+    preservada
+    """
+    representatives = []
+    for cluster in cluster_near_duplicates(articles, threshold):
+        if len(cluster) == 1:
+            articles[cluster[0]].pop('also_covered_by', None)
+            representatives.append(cluster[0])
+            continue
+        
+        best = max(cluster, key=lambda index: (
+            sources.bonus(articles[index]) if sources is not None else 0,
+            bool(articles[index].get('description')),
+            -index
+        ))
+        articles[best]['also_covered_by'] = [
+            {
+                'source': (articles[index].get('source') or {}).get('name') or 'Fonte desconhecida',
+                'url': articles[index].get('url')
+            }
+            for index in cluster if index != best
+        ]
+        representatives.append(best)
+    
+    return [articles[index] for index in sorted(representatives)]
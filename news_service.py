@@ -1,187 +1,993 @@
+import hashlib
+import heapq
 import requests
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from html import escape
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
+
+from src.metrics import (NEWSAPI_ERRORS, NEWSAPI_REQUEST_DURATION, NEWSAPI_REQUESTS,
+                         quota_user_label)
+
+try:
+    import ahocorasick
+except ImportError:  # dependência opcional: sem ela o TopicMatcher usa regex
+    ahocorasick = None
+
+class TopicFetchCache:
+    """
+    Cache compartilhado entre usuários das respostas do endpoint /everything.
+    
+    As entradas são indexadas pelos parâmetros normalizados da busca (sem a
+    apiKey e sem a data inicial), são servidas sem nova requisição por
+    ``ttl_seconds`` e o total é limitado a ``max_entries`` (descarta a menos
+    usada recentemente).
+    
+    Cada entrada guarda a janela buscada e a marca d'água (``publishedAt``
+    mais recente já visto); depois de vencida, a entrada é atualizada de forma
+    incremental, pedindo à NewsAPI apenas artigos mais novos que a marca.
+    """
+    def __init__(self, ttl_seconds: int = None, max_entries: int = None):
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv('NEWS_CACHE_TTL_SECONDS', '3600'))
+        if max_entries is None:
+            max_entries = int(os.getenv('NEWS_CACHE_MAX_ENTRIES', '1000'))
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.incremental = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(params: Dict) -> Tuple:
+        """
+        Normaliza os parâmetros da requisição em uma chave de cache
+        """
+        normalized = []
+        for name, value in params.items():
+            if name in ('apiKey', 'from', 'page'):
+                continue
+            if name == 'sources':
+                value = ','.join(sorted(s.strip().lower() for s in value.split(',') if s.strip()))
+            elif isinstance(value, str):
+                value = ' '.join(value.lower().split())
+            normalized.append((name, value))
+        return tuple(sorted(normalized))
+    
+    @staticmethod
+    def _in_window(article: Dict, window_start: str) -> bool:
+        # Datas ISO 8601 podem ser comparadas como texto; artigos sem data
+        # ficam enquanto a entrada existir
+        published = article.get('publishedAt')
+        return not published or published >= window_start
+    
+    @classmethod
+    def _window(cls, articles: List[Dict], window_start: str) -> List[Dict]:
+        return [dict(article) for article in articles if cls._in_window(article, window_start)]
+    
+    def get(self, key: Tuple, window_start: str) -> Optional[List[Dict]]:
+        """
+        Retorna cópias dos artigos em cache publicados a partir de
+        ``window_start`` ou None se a entrada está ausente, vencida ou não
+        cobre a janela pedida
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None and entry['expires_at'] > time.monotonic()
+                    and entry['window_start'] <= window_start):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._window(entry['articles'], window_start)
+            self.misses += 1
+            return None
+    
+    def high_water_mark(self, key: Tuple, window_start: str) -> Optional[str]:
+        """
+        Retorna o ``publishedAt`` mais recente de uma entrada vencida que
+        cobre a janela pedida (para busca incremental) ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['window_start'] > window_start:
+                return None
+            return entry['high_water_mark']
+    
+    def merge(self, key: Tuple, window_start: str, articles: List[Dict],
+              incremental: bool = False) -> List[Dict]:
+        """
+        Armazena os artigos de uma busca; em uma busca incremental, eles são
+        somados (sem URLs repetidas) aos que já estavam em cache. Retorna
+        cópias dos artigos da janela pedida
+        """
+        with self._lock:
+            entry = self._entries.get(key) if incremental else None
+            if entry is not None:
+                self.incremental += 1
+                known_urls = {article.get('url') for article in entry['articles']}
+                new_articles = [article for article in articles if article.get('url') not in known_urls]
+                merged = [dict(article) for article in new_articles] + entry['articles']
+                # Descarta o que já saiu da janela
+                merged = [article for article in merged if self._in_window(article, window_start)]
+            else:
+                merged = [dict(article) for article in articles]
+            
+            published = [article.get('publishedAt') for article in merged if article.get('publishedAt')]
+            high_water_mark = max(published) if published else (entry or {}).get('high_water_mark')
+            
+            if self.max_entries > 0:
+                self._entries[key] = {
+                    'expires_at': time.monotonic() + self.ttl_seconds,
+                    'window_start': window_start,
+                    'high_water_mark': high_water_mark,
+                    'articles': merged
+                }
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            
+            return self._window(merged, window_start)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.incremental = 0
+    
+    def stats(self) -> Dict:
+        """
+        Retorna os contadores de acertos/falhas do cache
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'incremental': self.incremental,
+                'entries': len(self._entries),
+                'hit_rate': (self.hits / total) if total else 0.0
+            }
+
+# Cache global compartilhado por todas as instâncias de NewsSearcher
+topic_fetch_cache = TopicFetchCache()
+
+_http_session = None
+_http_session_lock = threading.Lock()
+_host_semaphores = {}
+
+def get_http_session() -> requests.Session:
+    """
+    Retorna a sessão HTTP compartilhada (pool de conexões keep-alive)
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            pool_size = int(os.getenv('NEWS_API_POOL_SIZE', '10'))
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                    pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _http_session = session
+        return _http_session
+
+def host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """
+    Retorna o semáforo que limita requisições simultâneas ao host da URL
+    """
+    host = urlparse(url).netloc
+    with _http_session_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            limit = int(os.getenv('NEWS_API_MAX_CONCURRENCY_PER_HOST', '4'))
+            semaphore = threading.BoundedSemaphore(max(1, limit))
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+def filter_avoided_sources(articles: List[Dict], avoid_sources=None) -> List[Dict]:
+    """
+    Remove artigos de fontes a serem evitadas (lista de nomes ou
+    SourcePreferences já compilado)
+    """
+    if not avoid_sources:
+        return articles
+    if not isinstance(avoid_sources, SourcePreferences):
+        avoid_sources = SourcePreferences(avoid=avoid_sources)
+    return avoid_sources.filter(articles)
+
+def published_at(article: Dict) -> str:
+    """
+    Data de publicação do artigo (ISO 8601, comparável como texto)
+    """
+    return article.get('publishedAt') or ''
+
+def merge_by_recency(streams: Iterable[Iterable[Dict]], presorted: bool = False) -> Iterable[Dict]:
+    """
+    Intercala várias listas de artigos em um único fluxo do mais novo para o
+    mais antigo. Em datas iguais, vem primeiro o artigo da lista anterior,
+    então a deduplicação por URL mantém o mesmo tópico de origem. Com
+    ``presorted`` as listas já estão em ordem e são lidas sob demanda
+    """
+    if not presorted:
+        streams = [sorted(stream, key=published_at, reverse=True) for stream in streams]
+    return heapq.merge(*streams, key=published_at, reverse=True)
+
+def dedupe_by_url(articles: Iterable[Dict]) -> List[Dict]:
+    """
+    Remove duplicatas baseado na URL (mantém a primeira ocorrência)
+    """
+    seen_urls = set()
+    unique_articles = []
+    for article in articles:
+        url = article.get('url', '')
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            unique_articles.append(article)
+    return unique_articles
+
+def newsapi_error_class(error: requests.RequestException) -> str:
+    """
+    Classe de um erro de requisição à NewsAPI para as métricas: o código de
+    erro da API quando a resposta traz um (ex.: rateLimited,
+    apiKeyExhausted), senão o tipo de falha
+    """
+    response = getattr(error, 'response', None)
+    if response is not None:
+        try:
+            code = response.json().get('code')
+        except ValueError:
+            code = None
+        return code or f"http_{response.status_code}"
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.ConnectionError):
+        return 'connection'
+    return 'request'
 
 class NewsSearcher:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: Optional[TopicFetchCache] = topic_fetch_cache,
+                 max_workers: int = None, session: requests.Session = None, user_id: int = None):
         self.api_key = api_key or os.getenv('NEWS_API_KEY')
-        self.base_url = "https://newsapi.org/v2"
+        # Dono da chave, para as métricas de consumo de cota
+        self.user_id = user_id if api_key else None
+        self.base_url = os.getenv('NEWS_API_BASE_URL', 'https://newsapi.org/v2').rstrip('/')
+        self.cache = cache
+        self.max_workers = max_workers or int(os.getenv('NEWS_FETCH_WORKERS', '4'))
+        self.session = session or get_http_session()
+        self.timeout = int(os.getenv('NEWS_API_TIMEOUT', '30'))
+        # A NewsAPI aceita no máximo 100 artigos por página
+        self.page_size = max(1, min(int(os.getenv('NEWS_API_PAGE_SIZE', '100')), 100))
+        self.topic_budget = int(os.getenv('NEWS_TOPIC_ARTICLE_BUDGET', '100'))
+    
+    def _get(self, endpoint: str, params: Dict) -> requests.Response:
+        """
+        Faz uma requisição GET respeitando o limite de concorrência por host
+        """
+        url = f"{self.base_url}/{endpoint}"
+        user = quota_user_label(self.user_id)
+        try:
+            with host_semaphore(url):
+                with NEWSAPI_REQUEST_DURATION.time(endpoint=endpoint):
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            NEWSAPI_REQUESTS.inc(endpoint=endpoint, user=user, outcome='error')
+            NEWSAPI_ERRORS.inc(error=newsapi_error_class(e))
+            raise
+        NEWSAPI_REQUESTS.inc(endpoint=endpoint, user=user, outcome='ok')
+        return response
+    
+    def _iter_pages(self, endpoint: str, params: Dict, budget: int = None) -> Iterable[Dict]:
+        """
+        Percorre as páginas de resultados do endpoint, gerando os artigos à
+        medida que cada página chega. Para ao atingir ``budget`` artigos, o
+        ``totalResults`` informado pela API ou uma página incompleta
+        """
+        budget = self.topic_budget if budget is None else budget
+        page_size = min(self.page_size, budget)
+        page = 1
+        yielded = 0
         
-    def search_news(self, topics: List[str], sources: List[str] = None, 
-                   avoid_sources: List[str] = None, language: str = 'pt',
-                   days_back: int = 1) -> List[Dict]:
+        while yielded < budget:
+            try:
+                data = self._get(endpoint, dict(params, pageSize=page_size, page=page)).json()
+            except requests.RequestException as e:
+                if page == 1:
+                    raise
+                # Mantém as páginas já recebidas (ex.: limite de resultados do plano)
+                print(f"Erro ao buscar a página {page} de '{endpoint}': {e}")
+                return
+            articles = self._page_articles(data, page)
+            if articles is None:
+                return
+            for article in articles[:budget - yielded]:
+                yield article
+            yielded += min(len(articles), budget - yielded)
+            
+            if self._last_page(data, articles, page, page_size):
+                return
+            page += 1
+    
+    def _page_articles(self, data: Dict, page: int) -> Optional[List[Dict]]:
         """
-        Busca notícias baseado nos tópicos e fontes especificados
+        Artigos de uma página de resultados; ``None`` encerra a paginação
+        (resposta de erro da API depois da primeira página)
+        """
+        if data['status'] != 'ok':
+            NEWSAPI_ERRORS.inc(error=data.get('code') or 'api_error')
+            if page == 1:
+                # Não deixa uma resposta de erro ser guardada como "sem artigos"
+                raise requests.RequestException(data.get('message', 'resposta inválida da NewsAPI'))
+            return None
+        return data.get('articles', [])
+    
+    @staticmethod
+    def _last_page(data: Dict, articles: List[Dict], page: int, page_size: int) -> bool:
+        total_results = data.get('totalResults', 0)
+        return len(articles) < page_size or page * page_size >= total_results
+    
+    def _topic_params(self, topic: str, from_date: str, language: str,
+                      sources: List[str] = None) -> Dict:
+        params = {
+            'q': topic,
+            'from': from_date,
+            'language': language,
+            'sortBy': 'publishedAt',
+            'apiKey': self.api_key
+        }
+        
+        # Adiciona fontes preferenciais se especificadas
+        if sources:
+            params['sources'] = ','.join(sources)
+        return params
+    
+    def _cache_lookup(self, params: Dict, from_date: str):
+        """
+        Consulta o cache do tópico. Retorna a chave, os artigos em cache (ou
+        ``None``) e os parâmetros da busca a fazer: na busca incremental,
+        apenas o que é mais novo que a marca d'água, então a paginação para
+        ao alcançá-la
+        """
+        cache_key = self.cache.make_key(dict(params, budget=self.topic_budget))
+        articles = self.cache.get(cache_key, from_date)
+        if articles is not None:
+            return cache_key, articles, params
+        
+        high_water_mark = self.cache.high_water_mark(cache_key, from_date)
+        if high_water_mark:
+            params = dict(params, **{'from': high_water_mark.rstrip('Z')})
+        return cache_key, None, params
+    
+    def _fetch_topic(self, topic: str, from_date: str, language: str,
+                     sources: List[str] = None) -> List[Dict]:
+        """
+        Busca os artigos de um único tópico (usando o cache compartilhado)
+        """
+        params = self._topic_params(topic, from_date, language, sources)
+        
+        try:
+            if self.cache is None:
+                return list(self._iter_pages('everything', params))
+            
+            cache_key, articles, params = self._cache_lookup(params, from_date)
+            if articles is not None:
+                return articles
+            
+            articles = list(self._iter_pages('everything', params))
+            return self.cache.merge(cache_key, from_date, articles,
+                                    incremental=params['from'] != from_date)
+        
+        except requests.RequestException as e:
+            print(f"Erro ao buscar notícias para o tópico '{topic}': {e}")
+            return []
+    
+    def fetch_topics(self, topics: List[str], language: str = 'pt', days_back: int = 1,
+                     sources: List[str] = None, on_topic_fetched: Callable[[str], None] = None) -> List[List[Dict]]:
+        """
+        Busca vários tópicos (em paralelo); retorna a lista de artigos de cada
+        tópico, na mesma ordem de ``topics``. ``on_topic_fetched`` é chamado
+        (de qualquer thread) a cada tópico concluído
         """
         if not self.api_key:
             raise ValueError("API key is required for news search")
-            
+        
         # Calcula data de início
         from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         
-        all_articles = []
-        
-        for topic in topics:
-            # Busca por tópico específico
-            params = {
-                'q': topic,
-                'from': from_date,
-                'language': language,
-                'sortBy': 'publishedAt',
-                'apiKey': self.api_key,
-                'pageSize': 20
-            }
-            
-            # Adiciona fontes preferenciais se especificadas
-            if sources:
-                params['sources'] = ','.join(sources)
-            
+        def fetch(topic):
+            articles = self._fetch_topic(topic, from_date, language, sources)
+            if on_topic_fetched is not None:
+                on_topic_fetched(topic)
+            return articles
+        
+        # Busca os tópicos em paralelo; map preserva a ordem dos tópicos
+        if self.max_workers > 1 and len(topics) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(topics))) as executor:
+                return list(executor.map(fetch, topics))
+        return [fetch(topic) for topic in topics]
+    
+    def iter_topic_articles(self, topic: str, language: str = 'pt', days_back: int = 1,
+                            sources: List[str] = None, budget: int = None) -> Iterable[Dict]:
+        """
+        Gera os artigos de um tópico página a página, direto da NewsAPI (sem
+        cache); o consumidor pode parar a qualquer momento sem que as
+        páginas seguintes sejam pedidas
+        """
+        if not self.api_key:
+            raise ValueError("API key is required for news search")
+        
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        params = self._topic_params(topic, from_date, language, sources)
+        return self._iter_pages('everything', params, budget)
+    
+    def _stream_topic(self, topic: str, language: str, days_back: int,
+                      sources: List[str] = None) -> Iterator[Dict]:
+        """
+        Artigos de um tópico para ``iter_news``: do cache (ou da busca
+        incremental, que só traz o que é mais novo que a marca d'água) ou,
+        sem nada em cache, página a página por ``iter_topic_articles``. Um
+        tópico lido até o fim vai para o cache
+        """
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        cache_key = None
+        if self.cache is not None:
+            params = self._topic_params(topic, from_date, language, sources)
+            cache_key, articles, fetch_params = self._cache_lookup(params, from_date)
+            if articles is not None:
+                return iter(articles)
+            if fetch_params is not params:
+                return iter(self._fetch_topic(topic, from_date, language, sources))
+        
+        def stream():
+            fetched = []
             try:
-                response = requests.get(f"{self.base_url}/everything", params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                if data['status'] == 'ok':
-                    articles = data.get('articles', [])
-                    
-                    # Filtra artigos de fontes a serem evitadas
-                    if avoid_sources:
-                        articles = [
-                            article for article in articles
-                            if not any(avoid_source.lower() in article.get('source', {}).get('name', '').lower() 
-                                     for avoid_source in avoid_sources)
-                        ]
-                    
-                    # Adiciona o tópico de busca aos artigos
-                    for article in articles:
-                        article['search_topic'] = topic
-                    
-                    all_articles.extend(articles)
-                    
+                for article in self.iter_topic_articles(topic, language, days_back, sources):
+                    # Cópia: o consumidor pode alterar o artigo antes de o tópico ir para o cache
+                    fetched.append(dict(article))
+                    yield article
             except requests.RequestException as e:
                 print(f"Erro ao buscar notícias para o tópico '{topic}': {e}")
-                continue
+                return
+            if cache_key is not None:
+                self.cache.merge(cache_key, from_date, fetched)
+        return stream()
+    
+    def iter_news(self, topics: List[str], sources: List[str] = None,
+                  avoid_sources: List[str] = None, language: str = 'pt',
+                  days_back: int = 1, on_topic_fetched: Callable[[str], None] = None) -> Iterable[Dict]:
+        """
+        Versão em fluxo de ``search_news``: os artigos saem do mais novo para
+        o mais antigo, filtrados, marcados e deduplicados à medida que são
+        consumidos. A primeira página de cada tópico é buscada em paralelo
+        (``on_topic_fetched`` é chamado quando ela chega) e as seguintes só
+        quando o consumo alcança o fim da anterior, então parar cedo
+        economiza chamadas à NewsAPI
+        """
+        if not self.api_key:
+            raise ValueError("API key is required for news search")
+        
+        def first_page(topic):
+            stream = self._stream_topic(topic, language, days_back, sources)
+            head = next(stream, None)
+            if on_topic_fetched is not None:
+                on_topic_fetched(topic)
+            return chain([head], stream) if head is not None else iter(())
+        
+        if self.max_workers > 1 and len(topics) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(topics))) as executor:
+                streams = list(executor.map(first_page, topics))
+        else:
+            streams = [first_page(topic) for topic in topics]
+        
+        # A NewsAPI (sortBy=publishedAt) e o cache já entregam do mais novo
+        # para o mais antigo
+        yield from self.merge_topic_results(topics, streams, avoid_sources, presorted=True)
+    
+    def merge_topic_results(self, topics: List[str], results: List[Iterable[Dict]],
+                             avoid_sources=None, presorted: bool = False) -> Iterable[Dict]:
+        """
+        Intercala os artigos de cada tópico por data, filtrando fontes
+        evitadas, marcando o tópico de busca e removendo URLs repetidas. Com
+        ``presorted`` os resultados já vêm do mais novo para o mais antigo e
+        são consumidos sob demanda
+        """
+        if avoid_sources and not isinstance(avoid_sources, SourcePreferences):
+            avoid_sources = SourcePreferences(avoid=avoid_sources)
+        
+        def tagged(topic, articles):
+            for article in articles:
+                # Filtra artigos de fontes a serem evitadas
+                if avoid_sources and avoid_sources.is_avoided(article):
+                    continue
+                # Adiciona o tópico de busca ao artigo
+                article['search_topic'] = topic
+                yield article
         
-        # Remove duplicatas baseado na URL
         seen_urls = set()
-        unique_articles = []
-        for article in all_articles:
+        streams = (tagged(topic, articles) for topic, articles in zip(topics, results))
+        for article in merge_by_recency(streams, presorted=presorted):
             url = article.get('url', '')
             if url and url not in seen_urls:
                 seen_urls.add(url)
-                unique_articles.append(article)
-        
-        return unique_articles
+                yield article
+    
+    def search_news(self, topics: List[str], sources: List[str] = None, 
+                   avoid_sources: List[str] = None, language: str = 'pt',
+                   days_back: int = 1, on_topic_fetched: Callable[[str], None] = None,
+                   max_articles: int = None) -> List[Dict]:
+        """
+        Busca notícias baseado nos tópicos e fontes especificados. Com
+        ``max_articles`` para nos mais recentes, sem pedir as páginas
+        seguintes à NewsAPI
+        """
+        articles = self.iter_news(topics, sources=sources, avoid_sources=avoid_sources,
+                                  language=language, days_back=days_back,
+                                  on_topic_fetched=on_topic_fetched)
+        return list(islice(articles, max_articles) if max_articles else articles)
     
-    def get_top_headlines(self, country: str = 'br', category: str = None) -> List[Dict]:
+    def get_top_headlines(self, country: str = 'br', category: str = None,
+                          budget: int = None) -> List[Dict]:
         """
         Busca manchetes principais do país
         """
         if not self.api_key:
             raise ValueError("API key is required for news search")
-            
+        
         params = {
             'country': country,
-            'apiKey': self.api_key,
-            'pageSize': 20
+            'apiKey': self.api_key
         }
         
         if category:
             params['category'] = category
-            
+        
         try:
-            response = requests.get(f"{self.base_url}/top-headlines", params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data['status'] == 'ok':
-                return data.get('articles', [])
-                
+            return list(self._iter_pages('top-headlines', params, budget))
+        
         except requests.RequestException as e:
             print(f"Erro ao buscar manchetes: {e}")
-            
+        
         return []
 
+def build_trie_regex(patterns: Iterable[str]) -> str:
+    """
+    Monta uma expressão regular em forma de trie (prefixos fatorados) que,
+    sendo gulosa, casa o padrão mais longo que começa em cada posição
+    """
+    trie = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_end else group
+    
+    return build(trie)
+
+TRACKING_QUERY_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+def normalize_url(url: str) -> str:
+    """
+    Normaliza a URL de um artigo (esquema/host em minúsculas, sem "www.",
+    fragmento, parâmetros de rastreamento ou barra final)
+    """
+    parts = urlsplit((url or '').strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith(TRACKING_QUERY_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), host, path, urlencode(query), ''))
+
+def article_url_hash(article: Dict) -> str:
+    """
+    Retorna o hash (SHA-256) da URL normalizada do artigo
+    """
+    url_hash = article.get('url_hash')
+    if not url_hash:
+        url_hash = hashlib.sha256(normalize_url(article.get('url', '')).encode('utf-8')).hexdigest()
+        article['url_hash'] = url_hash
+    return url_hash
+
+def article_search_text(article: Dict) -> str:
+    """
+    Concatena título, descrição e conteúdo (em minúsculas) para a busca de tópicos
+    """
+    return '\x00'.join((
+        article.get('title') or '',
+        article.get('description') or '',
+        article.get('content') or ''
+    )).lower()
+
+class TopicMatcher:
+    """
+    Casa um conjunto de tópicos contra um texto em uma única passada, com a
+    mesma semântica de ``topic.lower() in texto``.
+    
+    Usa um autômato Aho–Corasick (pyahocorasick) quando disponível; sem ele,
+    usa uma regex em trie para conjuntos grandes ou buscas simples por
+    substring para conjuntos pequenos.
+    """
+    REGEX_MIN_PATTERNS = 64
+    
+    def __init__(self, topics: Iterable[str]):
+        self.topics = list(topics)
+        self._indices_by_pattern = {}
+        for index, topic in enumerate(self.topics):
+            self._indices_by_pattern.setdefault(topic.lower(), []).append(index)
+        # A string vazia está contida em qualquer texto
+        self._always = self._indices_by_pattern.pop('', [])
+        self._patterns = list(self._indices_by_pattern)
+        self._automaton = None
+        self._regex = None
+        self._implied = {}
+        
+        if not self._patterns:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern in self._patterns:
+                self._automaton.add_word(pattern, pattern)
+            self._automaton.make_automaton()
+        elif len(self._patterns) >= self.REGEX_MIN_PATTERNS:
+            # O lookahead permite casamentos sobrepostos em cada posição
+            self._regex = re.compile('(?=(' + build_trie_regex(self._patterns) + '))')
+    
+    def __bool__(self):
+        return bool(self._patterns or self._always)
+    
+    def _implied_patterns(self, found: str) -> List[str]:
+        """
+        Padrões contidos em um padrão encontrado pela regex (que só captura o
+        mais longo em cada posição)
+        """
+        implied = self._implied.get(found)
+        if implied is None:
+            implied = [pattern for pattern in self._patterns if pattern in found]
+            self._implied[found] = implied
+        return implied
+    
+    def find_patterns(self, text: str) -> set:
+        """
+        Retorna os padrões (em minúsculas) presentes no texto
+        """
+        if self._automaton is not None:
+            return {pattern for _, pattern in self._automaton.iter(text)}
+        if self._regex is not None:
+            found = set()
+            for longest in set(self._regex.findall(text)):
+                found.update(self._implied_patterns(longest))
+            return found
+        return {pattern for pattern in self._patterns if pattern in text}
+    
+    def match_indices(self, text: str) -> List[int]:
+        """
+        Retorna os índices (na ordem original) dos tópicos presentes no texto
+        """
+        indices = list(self._always)
+        for pattern in self.find_patterns(text):
+            indices.extend(self._indices_by_pattern[pattern])
+        indices.sort()
+        return indices
+    
+    def search(self, text: str) -> bool:
+        """
+        Indica se algum tópico está presente no texto
+        """
+        if self._always:
+            return True
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        if self._regex is not None:
+            return self._regex.search(text) is not None
+        return any(pattern in text for pattern in self._patterns)
+
+def normalize_source(source_name: str) -> str:
+    """
+    Normaliza o nome ou id de uma fonte (minúsculas, espaços colapsados)
+    """
+    return ' '.join((source_name or '').lower().split())
+
+class SourcePreferences:
+    """
+    Preferências de fontes de um usuário pré-computadas: prioridade por nome
+    ou id normalizado (consulta em dicionário) e as fontes evitadas
+    compiladas em um único TopicMatcher, com a decisão memorizada por nome
+    de fonte (mesma semântica de ``evitada.lower() in nome.lower()``)
+    """
+    def __init__(self, priorities: Dict[str, int] = None, avoid: Iterable[str] = None):
+        self.priorities = {normalize_source(name): priority
+                           for name, priority in (priorities or {}).items()}
+        self.avoid_matcher = TopicMatcher(avoid or [])
+        self._avoided_by_name = {}
+    
+    @classmethod
+    def from_config(cls, config) -> 'SourcePreferences':
+        """
+        Monta as preferências a partir de um UserDigestConfig
+        """
+        return cls(config.source_priorities, config.avoid_sources)
+    
+    def __bool__(self):
+        return bool(self.priorities or self.avoid_matcher)
+    
+    def priority(self, article: Dict) -> Optional[int]:
+        """
+        Prioridade (1-5) da fonte do artigo, procurada pelo id e depois pelo
+        nome, ou None se a fonte não é uma das preferidas
+        """
+        if not self.priorities:
+            return None
+        source = article.get('source') or {}
+        priority = self.priorities.get(normalize_source(source.get('id')))
+        if priority is None:
+            priority = self.priorities.get(normalize_source(source.get('name')))
+        return priority
+    
+    def bonus(self, article: Dict) -> int:
+        """
+        Pontos somados à relevância pela prioridade da fonte (1 = maior bônus)
+        """
+        priority = self.priority(article)
+        return (6 - priority) * 2 if priority is not None else 0
+    
+    def is_avoided(self, article: Dict) -> bool:
+        if not self.avoid_matcher:
+            return False
+        name = (article.get('source') or {}).get('name') or ''
+        avoided = self._avoided_by_name.get(name)
+        if avoided is None:
+            avoided = self.avoid_matcher.search(name.lower())
+            self._avoided_by_name[name] = avoided
+        return avoided
+    
+    def filter(self, articles: Iterable[Dict]) -> List[Dict]:
+        """
+        Remove os artigos de fontes evitadas
+        """
+        return [article for article in articles if not self.is_avoided(article)]
+
+def format_published_at(published_at: str) -> str:
+    """
+    Formata a data de publicação (ISO 8601) para exibição
+    """
+    if not published_at:
+        return 'Data não disponível'
+    try:
+        date_obj = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        return date_obj.strftime('%d/%m/%Y às %H:%M')
+    except ValueError:
+        return published_at
+
+def covered_by_names(article: Dict) -> List[str]:
+    """
+    Nomes (sem repetição) das outras fontes que publicaram a mesma matéria
+    """
+    return list(OrderedDict.fromkeys(other['source'] for other in article.get('also_covered_by') or []))
+
+def render_article_fragments(article: Dict) -> Dict[str, str]:
+    """
+    Formata um artigo nas variantes usadas pelos canais de envio
+    """
+    title = article.get('title', 'Sem título')
+    description = article.get('description', '')
+    url = article.get('url', '')
+    source = article.get('source', {}).get('name', 'Fonte desconhecida')
+    formatted_date = format_published_at(article.get('publishedAt', ''))
+    
+    whatsapp = f"📰 *{title}*\n\n"
+    plain = f"📰 {title}\n\n"
+    html = f"<h3>{escape(str(title))}</h3>\n"
+    
+    if description:
+        whatsapp += f"📝 {description}\n\n"
+        plain += f"📝 {description}\n\n"
+        html += f"<p>{escape(description)}</p>\n"
+    
+    details = f"🔗 {url}\n📅 {formatted_date}\n📺 Fonte: {source}"
+    whatsapp += details
+    plain += details
+    html += (f'<p><a href="{escape(url or "")}">{escape(url or "")}</a><br>\n'
+             f"📅 {escape(formatted_date)}<br>\n"
+             f"📺 Fonte: {escape(str(source))}")
+    
+    # Mesma matéria publicada por outras fontes (agrupada como quase duplicata)
+    also_covered_by = covered_by_names(article)
+    if also_covered_by:
+        whatsapp += f"\n🔁 Também em: {', '.join(also_covered_by)}"
+        plain += f"\n🔁 Também em: {', '.join(also_covered_by)}"
+        html += "<br>\n🔁 Também em: " + ', '.join(
+            f'<a href="{escape(other.get("url") or "")}">{escape(str(other["source"]))}</a>'
+            for other in article['also_covered_by'])
+    html += "</p>"
+    
+    return {'whatsapp': whatsapp, 'plain': plain, 'html': html}
+
+class ArticleFragmentCache:
+    """
+    Cache (LRU) dos trechos formatados por URL do artigo, para que um artigo
+    presente no resumo de vários usuários seja formatado uma vez por execução
+    """
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or int(os.getenv('ARTICLE_FRAGMENT_CACHE_SIZE', '5000'))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_render(self, article: Dict) -> Dict[str, str]:
+        url = article.get('url')
+        if not url:
+            return render_article_fragments(article)
+        if article.get('also_covered_by'):
+            # O grupo de quase duplicatas varia por usuário
+            url = (url, tuple((other['source'], other.get('url')) for other in article['also_covered_by']))
+        
+        with self._lock:
+            fragments = self._entries.get(url)
+            if fragments is not None:
+                self._entries.move_to_end(url)
+                return fragments
+        
+        fragments = render_article_fragments(article)
+        with self._lock:
+            self._entries[url] = fragments
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fragments
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Cache global de trechos formatados (limpo a cada execução do agendador)
+article_fragment_cache = ArticleFragmentCache()
+
 class NewsCurator:
-    def __init__(self):
-        pass
+    def __init__(self, fragment_cache: ArticleFragmentCache = article_fragment_cache):
+        self.fragment_cache = fragment_cache
+    
+    def _scorer(self, topic_priorities: Dict[str, int], avoid_topics: List[str] = None,
+                skip_url_hashes: set = None, sources: SourcePreferences = None,
+                topic_scores=None):
+        """
+        Compila os tópicos uma única vez e retorna a função que pontua um
+        artigo (None se ele deve ser descartado).
+        ``topic_scores`` substitui a busca dos tópicos no texto por pontuações
+        já calculadas (ver batch_scoring.BatchTopicScorer)
+        """
+        if sources is not None and not sources.priorities:
+            sources = None  # sem fontes preferidas não há bônus
+        topics = list(topic_priorities)
+        # Prioridade 1 = mais importante (pontuação maior)
+        weights = [(6 - topic_priorities[topic]) * 10 for topic in topics]
+        
+        if topic_scores is None:
+            topic_matcher = TopicMatcher(topics)
+            avoid_matcher = TopicMatcher(avoid_topics or [])
+            
+            def topic_scores(article: Dict) -> Optional[Tuple[int, List[int]]]:
+                text = article_search_text(article)
+                
+                # Pula artigos que contenham tópicos a serem evitados
+                if avoid_matcher and avoid_matcher.search(text):
+                    return None
+                
+                # Calcula pontuação baseada na prioridade dos tópicos
+                matched = topic_matcher.match_indices(text)
+                return sum(weights[index] for index in matched), matched
+        
+        def score(article: Dict) -> Optional[int]:
+            if skip_url_hashes and article_url_hash(article) in skip_url_hashes:
+                return None
+            
+            scored = topic_scores(article)
+            if scored is None:
+                return None
+            total, matched = scored
+            
+            if total <= 0:  # Só inclui artigos que correspondem aos tópicos de interesse
+                return None
+            # Fontes preferidas somam um bônus pela sua prioridade
+            if sources is not None:
+                total += sources.bonus(article)
+            article['relevance_score'] = total
+            article['matched_topics'] = [topics[index] for index in matched]
+            return total
+        
+        return score
     
     def filter_and_rank_articles(self, articles: List[Dict], 
                                 topic_priorities: Dict[str, int],
-                                avoid_topics: List[str] = None) -> List[Dict]:
+                                avoid_topics: List[str] = None,
+                                skip_url_hashes: set = None,
+                                sources: SourcePreferences = None) -> List[Dict]:
         """
-        Filtra e classifica artigos baseado nas prioridades dos tópicos
+        Filtra e classifica artigos baseado nas prioridades dos tópicos (e
+        das fontes, se ``sources`` for informado).
+        Artigos cujo hash de URL está em ``skip_url_hashes`` (já entregues)
+        são descartados antes da pontuação
         """
         if not articles:
             return []
-            
-        avoid_topics = avoid_topics or []
-        filtered_articles = []
-        
-        for article in articles:
-            # Verifica se o artigo contém tópicos a serem evitados
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            content = article.get('content', '').lower()
-            
-            # Pula artigos que contenham tópicos a serem evitados
-            if any(avoid_topic.lower() in title or 
-                   avoid_topic.lower() in description or 
-                   avoid_topic.lower() in content 
-                   for avoid_topic in avoid_topics):
-                continue
-            
-            # Calcula pontuação baseada na prioridade dos tópicos
-            score = 0
-            matched_topics = []
-            
-            for topic, priority in topic_priorities.items():
-                if (topic.lower() in title or 
-                    topic.lower() in description or 
-                    topic.lower() in content):
-                    # Prioridade 1 = mais importante (pontuação maior)
-                    score += (6 - priority) * 10
-                    matched_topics.append(topic)
-            
-            if score > 0:  # Só inclui artigos que correspondem aos tópicos de interesse
-                article['relevance_score'] = score
-                article['matched_topics'] = matched_topics
-                filtered_articles.append(article)
+        
+        score = self._scorer(topic_priorities, avoid_topics, skip_url_hashes, sources)
+        filtered_articles = [article for article in articles if score(article) is not None]
         
         # Ordena por pontuação de relevância (maior primeiro)
         filtered_articles.sort(key=lambda x: x['relevance_score'], reverse=True)
         
         return filtered_articles
     
-    def generate_summary(self, article: Dict) -> str:
-        """
-        Gera um resumo do artigo
+    def select_top_articles(self, articles: Iterable[Dict],
+                            topic_priorities: Dict[str, int],
+                            avoid_topics: List[str] = None,
+                            skip_url_hashes: set = None,
+                            k: int = 15,
+                            sources: SourcePreferences = None,
+                            topic_scores=None) -> Tuple[List[Dict], int]:
         """
-        title = article.get('title', 'Sem título')
-        description = article.get('description', '')
-        url = article.get('url', '')
-        source = article.get('source', {}).get('name', 'Fonte desconhecida')
-        published_at = article.get('publishedAt', '')
+        Seleciona os ``k`` artigos mais relevantes mantendo só um heap de
+        tamanho ``k`` durante a pontuação. Empates são desfeitos pelo artigo
+        mais recente, depois pela prioridade da fonte e por último pela ordem
+        de chegada.
         
-        # Formata a data
-        if published_at:
-            try:
-                date_obj = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                formatted_date = date_obj.strftime('%d/%m/%Y às %H:%M')
-            except:
-                formatted_date = published_at
-        else:
-            formatted_date = 'Data não disponível'
-        
-        summary = f"📰 *{title}*\n\n"
+        Retorna os artigos selecionados (do melhor para o pior) e quantos
+        artigos relevantes foram vistos. ``topic_scores`` recebe pontuações
+        já calculadas em lote (como em ``_scorer``)
+        """
+        if k <= 0:
+            return [], 0
         
-        if description:
-            summary += f"📝 {description}\n\n"
+        score = self._scorer(topic_priorities, avoid_topics, skip_url_hashes, sources, topic_scores)
+        heap = []
+        matched = 0
         
-        summary += f"🔗 {url}\n"
-        summary += f"📅 {formatted_date}\n"
-        summary += f"📺 Fonte: {source}"
+        for sequence, article in enumerate(articles):
+            article_score = score(article)
+            if article_score is None:
+                continue
+            matched += 1
+            
+            # O menor item do heap é o pior selecionado: menor pontuação, mais
+            # antigo, fonte menos prioritária e, por último, o que chegou depois
+            source_rank = sources.bonus(article) if sources is not None else 0
+            entry = (article_score, published_at(article), source_rank, -sequence, article)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
         
-        return summary
-
+        return [entry[-1] for entry in sorted(heap, reverse=True)], matched
+    
+    def render_fragments(self, article: Dict) -> Dict[str, str]:
+        """
+        Retorna os trechos formatados do artigo para cada canal (WhatsApp,
+        texto simples e HTML), reaproveitando o cache por URL
+        """
+        return self.fragment_cache.get_or_render(article)
+    
+    def generate_summary(self, article: Dict) -> str:
+        """
+        Gera um resumo do artigo
+        """
+        return self.render_fragments(article)['whatsapp']
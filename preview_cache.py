@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.user_config import UserDigestConfig
+
+class PreviewCache:
+    """
+    Cache por usuário da prévia de /test-news-search.
+    
+    A prévia curada é guardada junto com a impressão digital da configuração
+    que a gerou (tópicos, fontes, tópicos evitados, janela de datas e última
+    entrega ao usuário) e é servida enquanto nada disso mudar e
+    ``ttl_seconds`` não vencer.
+    Além dela ficam os artigos de cada tópico buscado, indexados pelo que
+    muda a consulta à NewsAPI (tópico, fontes preferidas e janela): quando a
+    configuração muda, só os tópicos novos (ou com outras fontes) são
+    buscados de novo e apenas a curadoria é refeita.
+    
+    No máximo ``max_users`` usuários são mantidos (descarta o menos usado
+    recentemente).
+    """
+    def __init__(self, ttl_seconds: int = None, max_users: int = None):
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv('PREVIEW_CACHE_TTL_SECONDS', '900'))
+        if max_users is None:
+            max_users = int(os.getenv('PREVIEW_CACHE_MAX_USERS', '500'))
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries = OrderedDict()  # user_id -> {'fingerprint', 'result', 'expires_at', 'topics'}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def fingerprint(config: UserDigestConfig, from_date: str, last_delivery=None,
+                    language: str = 'pt', k: int = 10) -> str:
+        """
+        Impressão digital de tudo que influencia a prévia; ``last_delivery``
+        (entrega mais recente ao usuário) muda a cada resumo enviado, por
+        qualquer processo, e assim a prévia não mostra artigos já entregues
+        """
+        payload = {
+            'topics': sorted(config.topic_priorities.items()),
+            'avoid_topics': sorted(config.avoid_topics),
+            'preferred_sources': sorted(config.preferred_sources),
+            'source_priorities': sorted(config.source_priorities.items()),
+            'avoid_sources': sorted(config.avoid_sources),
+            'from_date': from_date,
+            'last_delivery': last_delivery.isoformat() if last_delivery else None,
+            'language': language,
+            'k': k
+        }
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def topic_key(topic: str, sources: Iterable[str], from_date: str, language: str = 'pt') -> Tuple:
+        """
+        Chave dos artigos de um tópico: só o que altera a consulta à NewsAPI
+        """
+        return (' '.join(topic.lower().split()),
+                tuple(sorted(source.strip().lower() for source in sources or ())),
+                from_date, language)
+    
+    def _entry(self, user_id: int, create: bool = False) -> Optional[Dict]:
+        # Chamado com o lock adquirido
+        entry = self._entries.get(user_id)
+        if entry is None and create:
+            entry = {'fingerprint': None, 'result': None, 'expires_at': 0, 'topics': {}}
+            self._entries[user_id] = entry
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        if entry is not None:
+            self._entries.move_to_end(user_id)
+        return entry
+    
+    def get_result(self, user_id: int, fingerprint: str) -> Optional[Dict]:
+        """
+        Prévia em cache se foi gerada com a mesma impressão digital e ainda
+        não venceu
+        """
+        with self._lock:
+            entry = self._entry(user_id)
+            if (entry is None or entry['fingerprint'] != fingerprint
+                    or entry['expires_at'] <= time.monotonic()):
+                return None
+            return entry['result']
+    
+    def put_result(self, user_id: int, fingerprint: str, result: Dict):
+        with self._lock:
+            entry = self._entry(user_id, create=True)
+            entry['fingerprint'] = fingerprint
+            entry['result'] = result
+            entry['expires_at'] = time.monotonic() + self.ttl_seconds
+    
+    def topic_articles(self, user_id: int, keys: List[Tuple]) -> Dict[Tuple, List[Dict]]:
+        """
+        Cópias dos artigos em cache das chaves pedidas (as ausentes ou
+        vencidas ficam de fora)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(user_id)
+            if entry is None:
+                return {}
+            found = {}
+            for key in keys:
+                cached = entry['topics'].get(key)
+                if cached is not None and cached[0] > now:
+                    found[key] = [dict(article) for article in cached[1]]
+            return found
+    
+    def put_topic_articles(self, user_id: int, articles_by_key: Dict[Tuple, List[Dict]]):
+        """
+        Guarda os artigos buscados de cada tópico, descartando os de chaves
+        vencidas (ex.: de uma janela de datas anterior)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(user_id, create=True)
+            topics = {key: cached for key, cached in entry['topics'].items() if cached[0] > now}
+            for key, articles in articles_by_key.items():
+                topics[key] = (now + self.ttl_seconds, [dict(article) for article in articles])
+            entry['topics'] = topics
+    
+    def invalidate(self, user_id: int):
+        """
+        Descarta a prévia curada do usuário (os artigos por tópico continuam
+        valendo, pois não dependem da configuração como um todo)
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                entry['fingerprint'] = None
+                entry['result'] = None
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Cache global usado pelas rotas
+preview_cache = PreviewCache()
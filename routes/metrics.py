@@ -0,0 +1,25 @@
+from flask import Blueprint, Response, jsonify, request, session
+from src.metrics import registry
+import hmac
+import os
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def _valid_token() -> bool:
+    token = os.environ.get('METRICS_TOKEN')
+    if not token:
+        return False
+    provided = request.headers.get('Authorization', '')
+    return hmac.compare_digest(provided.encode('utf-8'), f'Bearer {token}'.encode('utf-8'))
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Exporta as métricas do processo no formato texto do Prometheus. Exige
+    login ou, para o coletor, o cabeçalho ``Authorization: Bearer <token>``
+    com o METRICS_TOKEN
+    """
+    if 'user_id' not in session and not _valid_token():
+        return jsonify({'error': 'Login ou token de métricas necessário'}), 401
+    
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,7 +1,14 @@
-from flask import Blueprint, jsonify, request, session
-from src.models.user import User, Topic, Source, Recipient, db
-from src.news_service import NewsSearcher, NewsCurator
-from src.messaging_service import MessageDispatcher, WhatsAppSender, EmailSender
+from flask import Blueprint, current_app, jsonify, request, session
+from src.models.user import User, db
+from src.news_service import NewsSearcher, NewsCurator, SourcePreferences
+from src.near_duplicates import collapse_near_duplicates
+from src.messaging_service import WhatsAppSender, EmailSender
+from src.article_store import ArticleStore
+from src.user_config import load_user_config
+from src.background_jobs import background_jobs
+from src.preview_cache import preview_cache
+from src.scheduler import scheduler
+from datetime import datetime, timedelta
 from functools import wraps
 import os
 
@@ -15,48 +22,115 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Limite de ``?wait=``: quanto a requisição pode esperar o job terminar
+# (bem abaixo do timeout padrão de 30s do gunicorn, para não prender o worker)
+ON_DEMAND_MAX_WAIT_SECONDS = float(os.getenv('ON_DEMAND_MAX_WAIT_SECONDS', '10'))
+
+def enqueue_job(kind: str, function, message: str, error_message: str):
+    """
+    Enfileira o trabalho da requisição como job em segundo plano e responde
+    202 com o ID para acompanhamento (GET /api/jobs/<id>). Com ``?wait=N``
+    a requisição espera o job por até N segundos (limitado a
+    ON_DEMAND_MAX_WAIT_SECONDS) e, se ele terminar, responde com o
+    resultado. Um job do mesmo tipo ainda em andamento é reaproveitado
+    """
+    user_id = session['user_id']
+    job = background_jobs.find_active(user_id, kind)
+    if job is None:
+        job = background_jobs.submit(current_app._get_current_object(), kind, user_id, function)
+    else:
+        message = 'Já existe uma execução em andamento'
+    
+    wait = min(max(request.args.get('wait', 0, type=float), 0), ON_DEMAND_MAX_WAIT_SECONDS)
+    if wait:
+        job = background_jobs.wait(job.id, wait) or job
+        if job.status == 'done':
+            return jsonify(job.to_dict()['result'])
+        if job.status == 'failed':
+            return jsonify({'error': f'{error_message}: {job.error}'}), 500
+    
+    return jsonify({
+        'message': message,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f"/api/jobs/{job.id}"
+    }), 202
+
 @news_bp.route('/test-news-search', methods=['POST'])
 @login_required
 def test_news_search():
     """
-    Testa a busca de notícias com as configurações do usuário
+    Testa a busca de notícias com as configurações do usuário (em segundo plano)
     """
-    user = User.query.get(session['user_id'])
+    # Carrega tópicos, fontes e destinatários de uma vez
+    config = load_user_config(session['user_id'])
     
-    if not user.api_key_news:
+    if not config.api_key_news:
         return jsonify({'error': 'API key de notícias não configurada'}), 400
     
-    try:
-        # Obtém configurações do usuário
-        topics = [t.topic_name for t in user.topics if not t.avoid]
-        avoid_topics = [t.topic_name for t in user.topics if t.avoid]
-        preferred_sources = [s.source_name for s in user.sources if not s.avoid]
-        avoid_sources = [s.source_name for s in user.sources if s.avoid]
+    if not config.topics:
+        return jsonify({'error': 'Nenhum tópico de interesse configurado'}), 400
+    
+    # Prévia já calculada com a mesma configuração é devolvida na hora
+    user_id = config.user_id
+    from_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    fingerprint = preview_cache.fingerprint(config, from_date, ArticleStore().last_delivery(user_id))
+    cached = preview_cache.get_result(user_id, fingerprint)
+    if cached is not None:
+        return jsonify(dict(cached, cached=True))
+    
+    def run(job):
+        topics = list(config.topics)
+        preferred = list(config.preferred_sources)
+        keys = [preview_cache.topic_key(topic, preferred, from_date) for topic in topics]
+        
+        # Reaproveita os artigos dos tópicos já buscados na última prévia e
+        # busca apenas os tópicos novos (ou com outras fontes)
+        cached_topics = preview_cache.topic_articles(user_id, keys)
+        missing = [(topic, key) for topic, key in zip(topics, keys) if key not in cached_topics]
+        job.update('fetch', topics_total=len(topics), topics_fetched=len(topics) - len(missing))
+        searcher = NewsSearcher(config.api_key_news, user_id=config.user_id)
+        if missing:
+            fetched = searcher.fetch_topics(
+                [topic for topic, _ in missing],
+                sources=preferred or None,
+                on_topic_fetched=lambda topic: job.increment('topics_fetched')
+            )
+            fetched_topics = {key: result for (_, key), result in zip(missing, fetched)}
+            cached_topics.update(fetched_topics)
+            # Lista vazia pode ser erro da NewsAPI; não fica presa no cache
+            preview_cache.put_topic_articles(user_id, {key: result for key, result in fetched_topics.items() if result})
         
-        if not topics:
-            return jsonify({'error': 'Nenhum tópico de interesse configurado'}), 400
+        articles = list(searcher.merge_topic_results(topics, [cached_topics[key] for key in keys],
+                                                     list(config.avoid_sources)))
+        job.update('curation', articles_found=len(articles))
         
-        # Busca notícias
-        searcher = NewsSearcher(user.api_key_news)
-        articles = searcher.search_news(
-            topics=topics,
-            sources=preferred_sources if preferred_sources else None,
-            avoid_sources=avoid_sources
-        )
+        # Registra os artigos e descobre quais já foram entregues ao usuário
+        store = ArticleStore()
+        store.upsert_articles(articles)
+        delivered = store.delivered_hashes(config.user_id, articles)
+        
+        # Agrupa a mesma matéria publicada por vários veículos em um representante
+        sources = SourcePreferences.from_config(config)
+        candidates = collapse_near_duplicates(articles, sources)
         
         # Faz curadoria
         curator = NewsCurator()
-        topic_priorities = {t.topic_name: t.priority for t in user.topics if not t.avoid}
         
-        filtered_articles = curator.filter_and_rank_articles(
-            articles=articles,
-            topic_priorities=topic_priorities,
-            avoid_topics=avoid_topics
+        # Limita a 10 artigos
+        top_articles, total_filtered = curator.select_top_articles(
+            articles=candidates,
+            topic_priorities=config.topic_priorities,
+            avoid_topics=list(config.avoid_topics),
+            skip_url_hashes=delivered,
+            k=10,
+            sources=sources
         )
+        job.update('summaries', articles_scored=total_filtered, articles_selected=len(top_articles))
         
         # Gera resumos
         summaries = []
-        for article in filtered_articles[:10]:  # Limita a 10 artigos
+        for article in top_articles:
             summary = curator.generate_summary(article)
             summaries.append({
                 'summary': summary,
@@ -64,14 +138,15 @@ def test_news_search():
                 'matched_topics': article.get('matched_topics', [])
             })
         
-        return jsonify({
+        result = {
             'total_found': len(articles),
-            'total_filtered': len(filtered_articles),
+            'total_filtered': total_filtered,
             'summaries': summaries
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Erro ao buscar notícias: {str(e)}'}), 500
+        }
+        preview_cache.put_result(user_id, fingerprint, result)
+        return result
+    
+    return enqueue_job('test_news_search', run, 'Busca de notícias iniciada', 'Erro ao buscar notícias')
 
 @news_bp.route('/send-test-message', methods=['POST'])
 @login_required
@@ -106,7 +181,7 @@ def send_test_message():
             return jsonify({'message': 'Mensagem de teste enviada com sucesso!'})
         else:
             return jsonify({'error': 'Falha ao enviar mensagem de teste'}), 500
-            
+    
     except Exception as e:
         return jsonify({'error': f'Erro ao enviar mensagem: {str(e)}'}), 500
 
@@ -114,69 +189,41 @@ def send_test_message():
 @login_required
 def run_daily_digest():
     """
-    Executa o processo completo de busca, curadoria e envio de notícias
+    Executa o processo completo de busca, curadoria e envio de notícias (em segundo plano)
     """
-    user = User.query.get(session['user_id'])
+    # Carrega tópicos, fontes e destinatários de uma vez
+    config = load_user_config(session['user_id'])
     
-    if not user.api_key_news:
+    if not config.api_key_news:
         return jsonify({'error': 'API key de notícias não configurada'}), 400
     
-    if not user.recipients:
+    if not config.recipients:
         return jsonify({'error': 'Nenhum destinatário configurado'}), 400
     
-    try:
-        # Obtém configurações do usuário
-        topics = [t.topic_name for t in user.topics if not t.avoid]
-        avoid_topics = [t.topic_name for t in user.topics if t.avoid]
-        preferred_sources = [s.source_name for s in user.sources if not s.avoid]
-        avoid_sources = [s.source_name for s in user.sources if s.avoid]
-        
-        if not topics:
-            return jsonify({'error': 'Nenhum tópico de interesse configurado'}), 400
-        
-        # Busca notícias
-        searcher = NewsSearcher(user.api_key_news)
-        articles = searcher.search_news(
-            topics=topics,
-            sources=preferred_sources if preferred_sources else None,
-            avoid_sources=avoid_sources
-        )
-        
-        # Faz curadoria
-        curator = NewsCurator()
-        topic_priorities = {t.topic_name: t.priority for t in user.topics if not t.avoid}
-        
-        filtered_articles = curator.filter_and_rank_articles(
-            articles=articles,
-            topic_priorities=topic_priorities,
-            avoid_topics=avoid_topics
-        )
-        
-        if not filtered_articles:
-            return jsonify({'message': 'Nenhuma notícia relevante encontrada hoje'})
-        
-        # Gera resumos (limita a 15 artigos para não sobrecarregar)
-        summaries = []
-        for article in filtered_articles[:15]:
-            summary = curator.generate_summary(article)
-            summaries.append(summary)
-        
-        # Envia mensagens
-        recipients = [r.to_dict() for r in user.recipients]
-        dispatcher = MessageDispatcher()
-        result = dispatcher.send_news_digest(recipients, summaries)
-        
-        return jsonify({
-            'message': 'Resumo diário processado com sucesso!',
-            'total_articles_found': len(articles),
-            'total_articles_filtered': len(filtered_articles),
-            'total_articles_sent': len(summaries),
-            'messages_sent': result['success'],
-            'messages_failed': result['failed']
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Erro ao processar resumo diário: {str(e)}'}), 500
+    if not config.topics:
+        return jsonify({'error': 'Nenhum tópico de interesse configurado'}), 400
+    
+    def run(job):
+        # Mesmo pipeline da execução agendada (15 artigos por resumo)
+        result = scheduler.process_user_digest(config, job=job)
+        if not result['success']:
+            raise RuntimeError(result['error'])
+        result.setdefault('message', 'Resumo diário processado com sucesso!')
+        return result
+    
+    return enqueue_job('run_daily_digest', run, 'Resumo diário iniciado', 'Erro ao processar resumo diário')
+
+@news_bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_job(job_id):
+    """
+    Retorna a etapa, o progresso e (quando terminado) o resultado de um job
+    """
+    job = background_jobs.get(job_id)
+    if job is None or job.user_id != session['user_id']:
+        return jsonify({'error': 'Job não encontrado'}), 404
+    
+    return jsonify(job.to_dict())
 
 @news_bp.route('/config-status', methods=['GET'])
 @login_required
@@ -184,19 +231,20 @@ def get_config_status():
     """
     Retorna o status da configuração do usuário
     """
-    user = User.query.get(session['user_id'])
+    # Uma única linha: os contadores são mantidos junto com a configuração
+    user = db.session.get(User, session['user_id'])
     
     status = {
         'has_news_api_key': bool(user.api_key_news),
-        'has_topics': len(user.topics) > 0,
-        'has_recipients': len(user.recipients) > 0,
-        'topics_count': len([t for t in user.topics if not t.avoid]),
-        'avoid_topics_count': len([t for t in user.topics if t.avoid]),
-        'sources_count': len([s for s in user.sources if not s.avoid]),
-        'avoid_sources_count': len([s for s in user.sources if s.avoid]),
-        'whatsapp_recipients': len([r for r in user.recipients if r.type == 'whatsapp']),
-        'email_recipients': len([r for r in user.recipients if r.type == 'email']),
-        'ready_to_run': bool(user.api_key_news and user.topics and user.recipients)
+        'has_topics': user.topics_count + user.avoid_topics_count > 0,
+        'has_recipients': user.whatsapp_count + user.email_count > 0,
+        'topics_count': user.topics_count,
+        'avoid_topics_count': user.avoid_topics_count,
+        'sources_count': user.sources_count,
+        'avoid_sources_count': user.avoid_sources_count,
+        'whatsapp_recipients': user.whatsapp_count,
+        'email_recipients': user.email_count,
+        'ready_to_run': user.is_ready
     }
     
     return jsonify(status)
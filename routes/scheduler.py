@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, session
 from src.scheduler import scheduler
 from functools import wraps
+from datetime import datetime
 
 scheduler_bp = Blueprint('scheduler', __name__)
 
@@ -76,13 +77,16 @@ def run_scheduler_now():
         # Executa em uma thread separada para não bloquear a resposta
         import threading
         
+        # Execução manual com chave própria na fila de resumos
+        run_key = f"manual-{datetime.now():%Y%m%d%H%M%S}"
+        
         def run_digest():
-            scheduler.run_daily_digest_for_all_users()
+            scheduler.run_daily_digest_for_all_users(run_key)
         
         thread = threading.Thread(target=run_digest)
         thread.start()
         
-        return jsonify({'message': 'Execução do resumo diário iniciada para todos os usuários'})
+        return jsonify({'message': 'Execução do resumo diário iniciada para todos os usuários', 'run_key': run_key})
         
     except Exception as e:
         return jsonify({'error': f'Erro ao executar resumo: {str(e)}'}), 500
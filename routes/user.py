@@ -1,9 +1,24 @@
 from flask import Blueprint, jsonify, request, session
-from src.models.user import User, Topic, Source, Recipient, db
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from src.models.user import User, Topic, Source, Recipient, db, refresh_user_counters
+from src.db_utils import CHUNK_SIZE, chunked
+from src.preview_cache import preview_cache
+from src.messaging_service import clean_whatsapp_number
 from functools import wraps
+from typing import Dict, Iterator, List, Tuple
+import csv
+import io
+import json
+import os
 
 user_bp = Blueprint('user', __name__)
 
+# Itens aceitos por requisição nos endpoints em lote (listas maiores de
+# destinatários vão pela importação em fluxo)
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '1000'))
+MAX_REPORTED_ERRORS = 50
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -12,6 +27,20 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+DUPLICATE_ERRORS = {
+    'topics': 'Tópico já cadastrado',
+    'sources': 'Fonte já cadastrada',
+    'recipients': 'Destinatário já cadastrado'
+}
+
+def duplicate_error(resource: str):
+    """
+    Resposta para violação dos índices únicos por usuário (nome do tópico,
+    nome da fonte, endereço do destinatário)
+    """
+    db.session.rollback()
+    return jsonify({'error': DUPLICATE_ERRORS[resource]}), 409
+
 # Autenticação
 @user_bp.route('/register', methods=['POST'])
 def register():
@@ -93,7 +122,11 @@ def create_topic():
         avoid=data.get('avoid', False)
     )
     db.session.add(topic)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('topics')
+    preview_cache.invalidate(session['user_id'])
     return jsonify(topic.to_dict()), 201
 
 @user_bp.route('/topics/<int:topic_id>', methods=['PUT'])
@@ -106,7 +139,11 @@ def update_topic(topic_id):
     topic.priority = data.get('priority', topic.priority)
     topic.avoid = data.get('avoid', topic.avoid)
     
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('topics')
+    preview_cache.invalidate(session['user_id'])
     return jsonify(topic.to_dict())
 
 @user_bp.route('/topics/<int:topic_id>', methods=['DELETE'])
@@ -115,6 +152,7 @@ def delete_topic(topic_id):
     topic = Topic.query.filter_by(id=topic_id, user_id=session['user_id']).first_or_404()
     db.session.delete(topic)
     db.session.commit()
+    preview_cache.invalidate(session['user_id'])
     return '', 204
 
 # Gerenciamento de fontes
@@ -135,7 +173,11 @@ def create_source():
         avoid=data.get('avoid', False)
     )
     db.session.add(source)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('sources')
+    preview_cache.invalidate(session['user_id'])
     return jsonify(source.to_dict()), 201
 
 @user_bp.route('/sources/<int:source_id>', methods=['PUT'])
@@ -148,7 +190,11 @@ def update_source(source_id):
     source.priority = data.get('priority', source.priority)
     source.avoid = data.get('avoid', source.avoid)
     
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('sources')
+    preview_cache.invalidate(session['user_id'])
     return jsonify(source.to_dict())
 
 @user_bp.route('/sources/<int:source_id>', methods=['DELETE'])
@@ -157,6 +203,7 @@ def delete_source(source_id):
     source = Source.query.filter_by(id=source_id, user_id=session['user_id']).first_or_404()
     db.session.delete(source)
     db.session.commit()
+    preview_cache.invalidate(session['user_id'])
     return '', 204
 
 # Gerenciamento de destinatários
@@ -169,26 +216,37 @@ def get_recipients():
 @user_bp.route('/recipients', methods=['POST'])
 @login_required
 def create_recipient():
-    data = request.json
-    recipient = Recipient(
-        user_id=session['user_id'],
-        type=data['type'],
-        address=data['address']
-    )
+    try:
+        row = validate_batch_item('recipients', request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    recipient = Recipient(user_id=session['user_id'], **row)
     db.session.add(recipient)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('recipients')
     return jsonify(recipient.to_dict()), 201
 
 @user_bp.route('/recipients/<int:recipient_id>', methods=['PUT'])
 @login_required
 def update_recipient(recipient_id):
     recipient = Recipient.query.filter_by(id=recipient_id, user_id=session['user_id']).first_or_404()
-    data = request.json
+    try:
+        # Campos ausentes vêm do destinatário atual, para validar e
+        # normalizar o endereço com o tipo que vai ficar gravado
+        row = validate_batch_item('recipients', request.get_json(silent=True), partial=True)
+        row = _validate_recipient({'type': recipient.type, 'address': recipient.address, **row})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    recipient.type = data.get('type', recipient.type)
-    recipient.address = data.get('address', recipient.address)
+    recipient.type = row['type']
+    recipient.address = row['address']
     
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error('recipients')
     return jsonify(recipient.to_dict())
 
 @user_bp.route('/recipients/<int:recipient_id>', methods=['DELETE'])
@@ -198,3 +256,325 @@ def delete_recipient(recipient_id):
     db.session.delete(recipient)
     db.session.commit()
     return '', 204
+
+# Operações em lote
+REQUIRED = object()
+
+def _text(limit: int):
+    def validate(value):
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError('deve ser um texto não vazio')
+        value = value.strip()
+        if len(value) > limit:
+            raise ValueError(f'deve ter no máximo {limit} caracteres')
+        return value
+    return validate
+
+def _priority(value):
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 5:
+        raise ValueError('deve ser um inteiro de 1 a 5')
+    return value
+
+def _flag(value):
+    if not isinstance(value, bool):
+        raise ValueError('deve ser true ou false')
+    return value
+
+def _recipient_type(value):
+    if value not in ('whatsapp', 'email'):
+        raise ValueError("deve ser 'whatsapp' ou 'email'")
+    return value
+
+# Modelo e campos aceitos (validador, valor padrão) de cada recurso
+BATCH_RESOURCES = {
+    'topics': (Topic, {'topic_name': (_text(100), REQUIRED), 'priority': (_priority, 3), 'avoid': (_flag, False)}),
+    'sources': (Source, {'source_name': (_text(200), REQUIRED), 'priority': (_priority, 3), 'avoid': (_flag, False)}),
+    'recipients': (Recipient, {'type': (_recipient_type, REQUIRED), 'address': (_text(200), REQUIRED)})
+}
+
+# Campo único por usuário de cada recurso
+UNIQUE_FIELDS = {'topics': 'topic_name', 'sources': 'source_name', 'recipients': 'address'}
+
+def _normalize_address(recipient_type: str, address: str) -> str:
+    """
+    Forma gravada do endereço, usada também para detectar duplicados:
+    email em minúsculas, WhatsApp só com dígitos (como no envio)
+    """
+    if recipient_type == 'email':
+        return address.lower()
+    if recipient_type == 'whatsapp':
+        return clean_whatsapp_number(address)
+    return address
+
+def _validate_recipient(row: Dict) -> Dict:
+    address = row.get('address')
+    if address is None:
+        return row
+    if row.get('type') == 'email' and '@' not in address:
+        raise ValueError('address: email inválido')
+    if row.get('type') == 'whatsapp' and not any(char.isdigit() for char in address):
+        raise ValueError('address: número de WhatsApp inválido')
+    row['address'] = _normalize_address(row.get('type'), address)
+    return row
+
+def validate_batch_item(resource: str, item, partial: bool = False) -> Dict:
+    """
+    Valida um item do lote e retorna a linha pronta para o banco; com
+    ``partial`` (atualização) os campos ausentes ficam de fora
+    """
+    if not isinstance(item, dict):
+        raise ValueError('cada item deve ser um objeto')
+    fields = BATCH_RESOURCES[resource][1]
+    unknown = set(item) - set(fields) - {'id'}
+    if unknown:
+        raise ValueError(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+    
+    row = {}
+    for name, (validate, default) in fields.items():
+        if name in item:
+            try:
+                row[name] = validate(item[name])
+            except ValueError as e:
+                raise ValueError(f'{name}: {e}')
+        elif not partial:
+            if default is REQUIRED:
+                raise ValueError(f'{name}: obrigatório')
+            row[name] = default
+    
+    if resource == 'recipients':
+        row = _validate_recipient(row)
+    return row
+
+def _batch_items(key: str = 'items'):
+    """
+    Lista enviada no corpo (a própria lista ou ``{"items": [...]}``)
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list) or not data:
+        return None, (jsonify({'error': f'Envie uma lista não vazia em "{key}"'}), 400)
+    if len(data) > BATCH_MAX_ITEMS:
+        return None, (jsonify({'error': f'No máximo {BATCH_MAX_ITEMS} itens por lote'}), 400)
+    return data, None
+
+def _validation_error(errors: List[Dict]):
+    return jsonify({'error': 'Lote inválido; nada foi alterado', 'details': errors[:MAX_REPORTED_ERRORS]}), 400
+
+def _owned_ids(model, user_id: int, ids: List[int]) -> set:
+    owned = set()
+    for chunk in chunked(ids):
+        query = db.session.query(model.id).filter(model.user_id == user_id, model.id.in_(chunk))
+        owned.update(row_id for (row_id,) in query)
+    return owned
+
+def _rows_by_id(model, user_id: int, ids: List[int]) -> List:
+    rows = {}
+    for chunk in chunked(ids):
+        rows.update((row.id, row) for row in model.query.filter(model.user_id == user_id, model.id.in_(chunk)))
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
+def _after_batch(resource: str, user_id: int):
+    if resource in ('topics', 'sources'):
+        preview_cache.invalidate(user_id)
+
+@user_bp.route('/<any(topics, sources, recipients):resource>:batch', methods=['POST'])
+@login_required
+def create_batch(resource):
+    """
+    Cria vários itens de uma vez: valida a lista inteira e insere tudo em
+    uma única transação (nada é criado se algum item for inválido)
+    """
+    items, error = _batch_items()
+    if error:
+        return error
+    
+    user_id = session['user_id']
+    rows, errors = [], []
+    unique_field = UNIQUE_FIELDS[resource]
+    seen = set()
+    for index, item in enumerate(items):
+        try:
+            row = validate_batch_item(resource, item)
+            if row[unique_field] in seen:
+                raise ValueError(f'{unique_field}: repetido no lote')
+            seen.add(row[unique_field])
+            rows.append(dict(row, user_id=user_id))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+    if errors:
+        return _validation_error(errors)
+    
+    model = BATCH_RESOURCES[resource][0]
+    try:
+        created = db.session.scalars(insert(model).returning(model), rows).all()
+        result = [row.to_dict() for row in created]
+        # As operações em massa não passam pelo flush do ORM
+        refresh_user_counters(db.session.connection(), [user_id])
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error(resource)
+    _after_batch(resource, user_id)
+    return jsonify(result), 201
+
+@user_bp.route('/<any(topics, sources, recipients):resource>:batch', methods=['PUT'])
+@login_required
+def update_batch(resource):
+    """
+    Atualiza vários itens (cada um com ``id`` e os campos a alterar) em uma
+    única transação
+    """
+    items, error = _batch_items()
+    if error:
+        return error
+    
+    user_id = session['user_id']
+    rows, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            row_id = item.get('id') if isinstance(item, dict) else None
+            if isinstance(row_id, bool) or not isinstance(row_id, int):
+                raise ValueError('id: obrigatório')
+            rows.append(dict(validate_batch_item(resource, item, partial=True), id=row_id))
+        except ValueError as e:
+            errors.append({'index': index, 'error': str(e)})
+    if errors:
+        return _validation_error(errors)
+    
+    model = BATCH_RESOURCES[resource][0]
+    ids = [row['id'] for row in rows]
+    owned = _owned_ids(model, user_id, ids)
+    missing = [{'index': index, 'error': f"id {row_id} não encontrado"}
+               for index, row_id in enumerate(ids) if row_id not in owned]
+    if missing:
+        return _validation_error(missing)
+    
+    if resource == 'recipients':
+        # Endereços alterados sem o tipo são validados com o tipo já gravado
+        types = {}
+        for chunk in chunked(ids):
+            types.update(db.session.query(Recipient.id, Recipient.type)
+                         .filter(Recipient.user_id == user_id, Recipient.id.in_(chunk)))
+        for index, row in enumerate(rows):
+            if 'address' in row and 'type' not in row:
+                try:
+                    row['address'] = _validate_recipient(dict(row, type=types[row['id']]))['address']
+                except ValueError as e:
+                    errors.append({'index': index, 'error': str(e)})
+        if errors:
+            return _validation_error(errors)
+    
+    # UPDATE em massa pela chave primária, agrupado pelos campos alterados
+    by_fields = {}
+    for row in rows:
+        if len(row) > 1:
+            by_fields.setdefault(tuple(sorted(row)), []).append(row)
+    try:
+        for group in by_fields.values():
+            db.session.execute(update(model), group)
+        refresh_user_counters(db.session.connection(), [user_id])
+        db.session.commit()
+    except IntegrityError:
+        return duplicate_error(resource)
+    _after_batch(resource, user_id)
+    return jsonify([row.to_dict() for row in _rows_by_id(model, user_id, ids)])
+
+@user_bp.route('/<any(topics, sources, recipients):resource>:batch', methods=['DELETE'])
+@login_required
+def delete_batch(resource):
+    """
+    Remove vários itens (``{"ids": [...]}``) em uma única transação
+    """
+    ids, error = _batch_items('ids')
+    if error:
+        return error
+    if any(isinstance(row_id, bool) or not isinstance(row_id, int) for row_id in ids):
+        return jsonify({'error': 'Os ids devem ser inteiros'}), 400
+    
+    user_id = session['user_id']
+    model = BATCH_RESOURCES[resource][0]
+    owned = _owned_ids(model, user_id, ids)
+    missing = [{'index': index, 'error': f"id {row_id} não encontrado"}
+               for index, row_id in enumerate(ids) if row_id not in owned]
+    if missing:
+        return _validation_error(missing)
+    
+    for chunk in chunked(list(owned)):
+        db.session.execute(delete(model).where(model.user_id == user_id, model.id.in_(chunk)))
+    refresh_user_counters(db.session.connection(), [user_id])
+    db.session.commit()
+    _after_batch(resource, user_id)
+    return '', 204
+
+def iter_import_rows(stream, content_type: str) -> Iterator[Tuple[int, object]]:
+    """
+    Lê a lista de destinatários linha a linha, sem carregá-la inteira na
+    memória: CSV com cabeçalho (``type,address``) ou JSON Lines (um objeto
+    por linha). Gera (número da linha, item ou ValueError)
+    """
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding='utf-8-sig', newline='')
+    if 'csv' in content_type:
+        reader = csv.DictReader(text)
+        for item in reader:
+            yield reader.line_num, {name: value for name, value in item.items() if name is not None}
+    else:
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                yield number, ValueError('JSON inválido')
+
+@user_bp.route('/recipients:import', methods=['POST'])
+@login_required
+def import_recipients():
+    """
+    Importa uma lista grande de destinatários enviada como CSV
+    (``Content-Type: text/csv``) ou JSON Lines, inserindo em blocos à medida
+    que o corpo é lido. Destinatários já cadastrados (ou repetidos no
+    arquivo) são ignorados; se alguma linha for inválida nada é importado
+    """
+    user_id = session['user_id']
+    seen = {_normalize_address(recipient_type, address)
+            for recipient_type, address in db.session.query(Recipient.type, Recipient.address).filter_by(user_id=user_id)}
+    
+    imported = duplicates = 0
+    pending, errors = [], []
+    
+    def flush():
+        if pending:
+            db.session.execute(insert(Recipient), pending)
+            pending.clear()
+    
+    for line, item in iter_import_rows(request.stream, request.content_type or ''):
+        try:
+            if isinstance(item, ValueError):
+                raise item
+            row = validate_batch_item('recipients', item)
+        except ValueError as e:
+            errors.append({'line': line, 'error': str(e)})
+            continue
+        if errors:
+            # Só continua lendo para relatar os demais erros
+            continue
+        
+        if row['address'] in seen:
+            duplicates += 1
+            continue
+        seen.add(row['address'])
+        pending.append(dict(row, user_id=user_id))
+        imported += 1
+        if len(pending) >= CHUNK_SIZE:
+            flush()
+    
+    if errors:
+        db.session.rollback()
+        return jsonify({'error': 'Importação inválida; nada foi importado',
+                        'details': errors[:MAX_REPORTED_ERRORS],
+                        'total_errors': len(errors)}), 400
+    
+    flush()
+    refresh_user_counters(db.session.connection(), [user_id])
+    db.session.commit()
+    return jsonify({'imported': imported, 'duplicates': duplicates}), 201
@@ -1,6 +1,7 @@
 import schedule
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
 import sys
@@ -8,136 +9,374 @@ import sys
 # Adiciona o diretório pai ao path para importar módulos
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from src.models.user import User, db
-from src.news_service import NewsSearcher, NewsCurator
-from src.messaging_service import MessageDispatcher
+from src.models.user import db
+from src.news_service import (NewsSearcher, NewsCurator, SourcePreferences, topic_fetch_cache,
+                              article_fragment_cache)
+from src.messaging_service import MessageDispatcher, DigestRenderer
+from src.article_store import ArticleStore
+from src.near_duplicates import collapse_near_duplicates
+from src.job_queue import DigestJobQueue, default_worker_id
+from src.user_config import count_incomplete_users, load_user_configs
+from src.digest_engine import TopicFanoutEngine
+from src.metrics import DIGESTS, STAGE_DURATION
 from flask import Flask
 
+def curate_user_digest(config, articles, delivered, topic_scores=None):
+    """
+    Etapas sem E/S do resumo de um usuário: agrupa quase duplicatas,
+    seleciona os 15 artigos e renderiza o resumo uma única vez por canal.
+    Retorna (artigos selecionados, total que passou pelos filtros, resumo
+    renderizado ou None quando nada foi selecionado)
+    """
+    # Agrupa a mesma matéria publicada por vários veículos em um representante
+    with STAGE_DURATION.time(stage='near_duplicates'):
+        sources = SourcePreferences.from_config(config)
+        candidates = collapse_near_duplicates(articles, sources)
+    
+    # Faz curadoria
+    curator = NewsCurator()
+    
+    # Seleciona os 15 artigos do resumo
+    with STAGE_DURATION.time(stage='curation'):
+        top_articles, total_filtered = curator.select_top_articles(
+            articles=candidates,
+            topic_priorities=config.topic_priorities,
+            avoid_topics=list(config.avoid_topics),
+            skip_url_hashes=delivered,
+            k=15,
+            sources=sources,
+            topic_scores=topic_scores
+        )
+    
+    if not top_articles:
+        return top_articles, total_filtered, None
+    
+    # Renderiza o resumo uma única vez por canal
+    with STAGE_DURATION.time(stage='rendering'):
+        fragments = [curator.render_fragments(article) for article in top_articles]
+        digest = DigestRenderer().render(fragments)
+    return top_articles, total_filtered, digest
+
+class _NoProgress:
+    """
+    Destino do progresso quando o resumo não é acompanhado por um job
+    """
+    def update(self, stage=None, **progress):
+        pass
+    
+    def increment(self, counter, amount=1):
+        pass
+
+_NO_PROGRESS = _NoProgress()
+
 class NewsAgentScheduler:
-    def __init__(self, app=None):
+    def __init__(self, app=None, max_workers=None):
         self.app = app
         self.is_running = False
         self.scheduler_thread = None
-        
+        self.max_workers = max_workers or int(os.getenv('DIGEST_WORKERS', '4'))
+        self.job_queue = DigestJobQueue()
+        self.queue_worker_running = False
+        self.queue_worker_thread = None
+        self._drain_lock = threading.Lock()
+    
     def init_app(self, app):
         self.app = app
         
-    def run_daily_digest_for_all_users(self):
+        # Em implantações com vários processos, cada um pode consumir a fila
+        if os.getenv('DIGEST_QUEUE_WORKER') == '1':
+            self.start_queue_worker()
+    
+    def run_daily_digest_for_all_users(self, run_key=None):
         """
-        Executa o resumo diário para todos os usuários configurados
+        Executa o resumo diário para todos os usuários configurados.
+        
+        Os usuários são enfileirados como jobs da execução ``run_key`` (uma
+        única vez, mesmo que vários processos chamem este método) e os jobs
+        são processados por todos os workers que consomem a fila
         """
         if not self.app:
             print("Erro: App Flask não configurado")
             return
-            
+        
         with self.app.app_context():
             try:
-                print(f"[{datetime.now()}] Iniciando execução do resumo diário para todos os usuários")
+                started_at = time.monotonic()
+                run_key = run_key or f"{datetime.now():%Y-%m-%d}@daily"
+                print(f"[{datetime.now()}] Iniciando execução do resumo diário para todos os usuários ({run_key})")
                 
-                # Busca todos os usuários que têm configuração completa
-                users = User.query.filter(
-                    User.api_key_news.isnot(None),
-                    User.api_key_news != ''
-                ).all()
+                # Carrega de uma vez só os usuários prontos (API key, tópicos e
+                # destinatários), pelo indicador is_ready
+                ready = {user_id: config for user_id, config in load_user_configs(ready_only=True).items()
+                         if config.is_complete}
+                incomplete = count_incomplete_users()
+                if incomplete:
+                    print(f"{incomplete} usuário(s) sem configuração completa, pulando...")
                 
-                if not users:
+                if not ready:
                     print("Nenhum usuário com configuração completa encontrado")
                     return
                 
-                total_processed = 0
-                total_success = 0
-                total_failed = 0
+                self.job_queue.enqueue_run(run_key, list(ready))
                 
-                for user in users:
-                    try:
-                        # Verifica se o usuário tem tópicos e destinatários
-                        topics = [t.topic_name for t in user.topics if not t.avoid]
-                        if not topics or not user.recipients:
-                            print(f"Usuário {user.username} não tem configuração completa, pulando...")
-                            continue
-                        
-                        print(f"Processando usuário: {user.username}")
-                        result = self.process_user_digest(user)
-                        
-                        if result['success']:
-                            total_success += 1
-                            print(f"✓ Sucesso para {user.username}: {result['messages_sent']} mensagens enviadas")
-                        else:
-                            total_failed += 1
-                            print(f"✗ Falha para {user.username}: {result['error']}")
-                            
-                        total_processed += 1
-                        
-                    except Exception as e:
-                        total_failed += 1
-                        print(f"✗ Erro ao processar usuário {user.username}: {str(e)}")
+                cache_before = topic_fetch_cache.stats()
+                article_fragment_cache.clear()
+                
+                # Modo padrão: busca cada tópico distinto (por conjunto de fontes
+                # preferidas) uma vez para todos os inscritos
+                engine = None
+                if os.getenv('DIGEST_FETCH_MODE', 'fanout') == 'fanout':
+                    engine = TopicFanoutEngine()
+                    engine.prepare(ready.values())
+                    engine_stats = engine.stats()
+                    print(f"  - {engine_stats['distinct_topics']} tópicos distintos ({engine_stats['fetched_topics']} "
+                          f"buscas) para {engine_stats['subscriptions']} inscrições")
+                
+                summary = self.drain_jobs(run_key, ready, engine)
+                summary['total_skipped'] += incomplete
+                summary['run_key'] = run_key
+                summary['total_users'] = len(ready) + incomplete
+                summary['duration_seconds'] = round(time.monotonic() - started_at, 2)
+                summary['jobs'] = self.job_queue.run_summary(run_key)
                 
                 print(f"[{datetime.now()}] Resumo da execução:")
-                print(f"  - Usuários processados: {total_processed}")
-                print(f"  - Sucessos: {total_success}")
-                print(f"  - Falhas: {total_failed}")
+                print(f"  - Usuários processados: {summary['total_processed']}")
+                print(f"  - Sucessos: {summary['total_success']}")
+                print(f"  - Falhas: {summary['total_failed']}")
+                print(f"  - Ignorados: {summary['total_skipped']}")
+                print(f"  - Novas tentativas: {summary['total_retried']}")
+                print(f"  - Duração: {summary['duration_seconds']}s")
+                print(f"  - Jobs da execução (todos os workers): {summary['jobs']}")
+                
+                cache_after = topic_fetch_cache.stats()
+                print(f"  - Cache de busca: {cache_after['hits'] - cache_before['hits']} acertos, "
+                      f"{cache_after['misses'] - cache_before['misses']} requisições à NewsAPI "
+                      f"({cache_after['incremental'] - cache_before['incremental']} incrementais)")
                 
+                return summary
+            
             except Exception as e:
                 print(f"Erro geral na execução do resumo diário: {str(e)}")
     
-    def process_user_digest(self, user):
+    def drain_jobs(self, run_key=None, configs=None, engine=None):
+        """
+        Processa os jobs disponíveis na fila com um pool de workers até
+        esvaziá-la. ``configs`` (user_id -> UserDigestConfig) evita recarregar
+        a configuração dos usuários já carregados em lote e ``engine``
+        (TopicFanoutEngine) fornece os artigos já buscados por tópico.
+        Retorna os contadores dos jobs processados neste processo
+        """
+        if os.getenv('DIGEST_PIPELINE', 'threads') == 'async':
+            # Import tardio: o pipeline assíncrono depende do httpx (opcional)
+            from src.async_pipeline import AsyncDigestPipeline, async_pipeline_available
+            if async_pipeline_available():
+                with self._drain_lock:
+                    return AsyncDigestPipeline(self).run(run_key, configs, engine)
+            print("httpx não instalado: usando o pipeline com threads")
+        
+        summary = {
+            'total_processed': 0,
+            'total_success': 0,
+            'total_failed': 0,
+            'total_skipped': 0,
+            'total_retried': 0
+        }
+        
+        with self._drain_lock:
+            # Cada worker usa seus próprios contextos (e sessões) do SQLAlchemy
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                futures = [executor.submit(self._drain_worker, run_key, configs or {}, engine)
+                           for _ in range(max(1, self.max_workers))]
+                for future in as_completed(futures):
+                    counts = future.result()
+                    summary['total_success'] += counts['success']
+                    summary['total_failed'] += counts['failed']
+                    summary['total_skipped'] += counts['skipped']
+                    summary['total_retried'] += counts['retried']
+        
+        summary['total_processed'] = summary['total_success'] + summary['total_failed']
+        return summary
+    
+    def _drain_worker(self, run_key=None, configs=None, engine=None):
+        """
+        Reivindica e processa jobs até a fila ficar vazia
         """
-        Processa o resumo diário para um usuário específico
+        counts = {'success': 0, 'failed': 0, 'skipped': 0, 'retried': 0}
+        worker_id = default_worker_id()
+        
+        while True:
+            with self.app.app_context():
+                job = self.job_queue.claim(worker_id, run_key)
+                if job is None:
+                    break
+                job_id, user_id = job.id, job.user_id
+            
+            status = self._run_job(job_id, user_id, worker_id, (configs or {}).get(user_id), engine)
+            counts[status] += 1
+        
+        return counts
+    
+    def _run_job(self, job_id, user_id, worker_id, config=None, engine=None):
         """
+        Processa um job mantendo o lease renovado enquanto ele executa
+        """
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat_loop,
+                                     args=(job_id, worker_id, stop_heartbeat), daemon=True)
+        heartbeat.start()
         try:
-            # Obtém configurações do usuário
-            topics = [t.topic_name for t in user.topics if not t.avoid]
-            avoid_topics = [t.topic_name for t in user.topics if t.avoid]
-            preferred_sources = [s.source_name for s in user.sources if not s.avoid]
-            avoid_sources = [s.source_name for s in user.sources if s.avoid]
+            status, result = self._run_user_digest(user_id, config, engine)
+        finally:
+            stop_heartbeat.set()
+        DIGESTS.inc(status=status)
+        
+        with self.app.app_context():
+            if status == 'error':
+                # Exceção inesperada: o job volta para a fila enquanto houver tentativas
+                if self.job_queue.fail(job_id, worker_id, result['error']):
+                    return 'retried'
+                return 'failed'
+            self.job_queue.complete(job_id, worker_id, result,
+                                    status='failed' if status == 'failed' else 'done')
+        return status
+    
+    def _heartbeat_loop(self, job_id, worker_id, stop_event):
+        interval = max(1, self.job_queue.lease_seconds / 3)
+        with self.app.app_context():
+            while not stop_event.wait(interval):
+                if not self.job_queue.heartbeat(job_id, worker_id):
+                    break
+    
+    def _run_user_digest(self, user_id, config=None, engine=None):
+        """
+        Processa o resumo de um usuário dentro de um contexto (e sessão) próprio.
+        Retorna o status ('success', 'failed', 'skipped' ou 'error') e o resultado
+        """
+        with self.app.app_context():
+            username = user_id
+            try:
+                if config is None:
+                    config = load_user_configs([user_id]).get(user_id)
+                if config is None:
+                    return 'skipped', {'success': False, 'error': 'Usuário não encontrado'}
+                username = config.username
+                
+                # Verifica se o usuário tem tópicos e destinatários
+                if not config.is_complete:
+                    print(f"Usuário {username} não tem configuração completa, pulando...")
+                    return 'skipped', {'success': False, 'error': 'Configuração incompleta'}
+                
+                print(f"Processando usuário: {username}")
+                # Usuários fora do índice (ex.: jobs retomados) buscam por conta própria
+                articles = None
+                topic_scores = None
+                if engine is not None and engine.covers(config.user_id):
+                    articles = engine.articles_for(config)
+                    topic_scores = engine.topic_scores_for(config)
+                with STAGE_DURATION.time(stage='user_digest'):
+                    result = self.process_user_digest(config, articles, topic_scores)
+                
+                if result['success']:
+                    print(f"✓ Sucesso para {username}: {result['messages_sent']} mensagens enviadas")
+                    return 'success', result
+                
+                print(f"✗ Falha para {username}: {result['error']}")
+                return 'failed', result
             
-            if not topics:
+            except Exception as e:
+                print(f"✗ Erro ao processar usuário {username}: {str(e)}")
+                return 'error', {'success': False, 'error': str(e)}
+            finally:
+                db.session.remove()
+    
+    def start_queue_worker(self, poll_seconds=None):
+        """
+        Inicia uma thread que consome a fila periodicamente, retomando jobs
+        pendentes ou com lease vencido (ex.: após a queda de outro processo)
+        """
+        if self.queue_worker_running:
+            return
+        
+        poll_seconds = poll_seconds or int(os.getenv('DIGEST_QUEUE_POLL_SECONDS', '30'))
+        self.queue_worker_running = True
+        
+        def run_queue_worker():
+            while self.queue_worker_running:
+                if self.app and not self._drain_lock.locked():
+                    try:
+                        self.drain_jobs()
+                    except Exception as e:
+                        print(f"Erro ao consumir a fila de resumos: {str(e)}")
+                time.sleep(poll_seconds)
+        
+        self.queue_worker_thread = threading.Thread(target=run_queue_worker, daemon=True)
+        self.queue_worker_thread.start()
+    
+    def stop_queue_worker(self):
+        self.queue_worker_running = False
+    
+    def process_user_digest(self, config, articles=None, topic_scores=None, job=None):
+        """
+        Processa o resumo diário para um usuário específico, a partir do
+        retrato da sua configuração (UserDigestConfig). ``articles`` recebe
+        os artigos já distribuídos pelo TopicFanoutEngine; sem eles a busca
+        é feita para o usuário. ``topic_scores`` traz as pontuações já
+        calculadas em lote pelo motor. ``job`` (BackgroundJob) recebe o
+        progresso de cada etapa
+        """
+        job = job or _NO_PROGRESS
+        try:
+            if not config.topics:
                 return {'success': False, 'error': 'Nenhum tópico de interesse configurado'}
             
-            if not user.recipients:
+            if not config.recipients:
                 return {'success': False, 'error': 'Nenhum destinatário configurado'}
             
             # Busca notícias
-            searcher = NewsSearcher(user.api_key_news)
-            articles = searcher.search_news(
-                topics=topics,
-                sources=preferred_sources if preferred_sources else None,
-                avoid_sources=avoid_sources
-            )
+            if articles is None:
+                job.update('fetch', topics_total=len(config.topics), topics_fetched=0)
+                with STAGE_DURATION.time(stage='fetch'):
+                    searcher = NewsSearcher(config.api_key_news, user_id=config.user_id)
+                    articles = searcher.search_news(
+                        topics=list(config.topics),
+                        sources=list(config.preferred_sources) if config.preferred_sources else None,
+                        avoid_sources=list(config.avoid_sources),
+                        on_topic_fetched=lambda topic: job.increment('topics_fetched'),
+                        max_articles=int(os.getenv('DIGEST_MAX_CANDIDATES', '0')) or None
+                    )
             
-            # Faz curadoria
-            curator = NewsCurator()
-            topic_priorities = {t.topic_name: t.priority for t in user.topics if not t.avoid}
+            # Registra os artigos e descobre quais já foram entregues ao usuário
+            job.update('curation', articles_found=len(articles))
+            with STAGE_DURATION.time(stage='article_store'):
+                store = ArticleStore()
+                store.upsert_articles(articles)
+                delivered = store.delivered_hashes(config.user_id, articles)
             
-            filtered_articles = curator.filter_and_rank_articles(
-                articles=articles,
-                topic_priorities=topic_priorities,
-                avoid_topics=avoid_topics
-            )
-            
-            if not filtered_articles:
+            # Agrupa, seleciona e renderiza o resumo
+            top_articles, total_filtered, digest = curate_user_digest(config, articles, delivered, topic_scores)
+            job.update(articles_scored=total_filtered, articles_selected=len(top_articles))
+            if not top_articles:
                 return {'success': True, 'messages_sent': 0, 'message': 'Nenhuma notícia relevante encontrada'}
             
-            # Gera resumos (limita a 15 artigos)
-            summaries = []
-            for article in filtered_articles[:15]:
-                summary = curator.generate_summary(article)
-                summaries.append(summary)
-            
             # Envia mensagens
-            recipients = [r.to_dict() for r in user.recipients]
-            dispatcher = MessageDispatcher()
-            result = dispatcher.send_news_digest(recipients, summaries)
+            job.update('delivery', recipients_total=len(config.recipients))
+            with STAGE_DURATION.time(stage='delivery'):
+                dispatcher = MessageDispatcher()
+                result = dispatcher.send_rendered_digest(list(config.recipients), digest)
+            
+            if result['success']:
+                store.mark_delivered(config.user_id, top_articles)
+            job.update(messages_sent=result['success'], messages_failed=result['failed'])
             
             return {
                 'success': True,
                 'total_articles_found': len(articles),
-                'total_articles_filtered': len(filtered_articles),
-                'total_articles_sent': len(summaries),
+                'total_articles_filtered': total_filtered,
+                'total_articles_sent': digest['total_news'],
                 'messages_sent': result['success'],
                 'messages_failed': result['failed']
             }
-            
+        
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
@@ -166,6 +405,9 @@ class NewsAgentScheduler:
         self.scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
         self.scheduler_thread.start()
         
+        # Retoma jobs interrompidos e ajuda a processar execuções de outros processos
+        self.start_queue_worker()
+        
         print("Agendador iniciado com sucesso")
     
     def stop_scheduler(self):
@@ -174,6 +416,7 @@ class NewsAgentScheduler:
         """
         self.is_running = False
         schedule.clear()
+        self.stop_queue_worker()
         print("Agendador parado")
     
     def get_status(self):
@@ -231,4 +231,4 @@ Error generating stack: `+n.message+`
 `)},zv=function(){var l=parseInt(document.body.getAttribute(Cl)||"0",10);return isFinite(l)?l:0},A2=function(){x.useEffect(function(){return document.body.setAttribute(Cl,(zv()+1).toString()),function(){var l=zv()-1;l<=0?document.body.removeAttribute(Cl):document.body.setAttribute(Cl,l.toString())}},[])},T2=function(l){var r=l.noRelative,o=l.noImportant,c=l.gapMode,f=c===void 0?"margin":c;A2();var m=x.useMemo(function(){return S2(f)},[f]);return x.createElement(w2,{styles:E2(m,!r,f,o?"":"!important")})},Ou=!1;if(typeof window<"u")try{var ys=Object.defineProperty({},"passive",{get:function(){return Ou=!0,!0}});window.addEventListener("test",ys,ys),window.removeEventListener("test",ys,ys)}catch{Ou=!1}var Nl=Ou?{passive:!1}:!1,N2=function(l){return l.tagName==="TEXTAREA"},rg=function(l,r){if(!(l instanceof Element))return!1;var o=window.getComputedStyle(l);return o[r]!=="hidden"&&!(o.overflowY===o.overflowX&&!N2(l)&&o[r]==="visible")},j2=function(l){return rg(l,"overflowY")},_2=function(l){return rg(l,"overflowX")},Uv=function(l,r){var o=r.ownerDocument,c=r;do{typeof ShadowRoot<"u"&&c instanceof ShadowRoot&&(c=c.host);var f=sg(l,c);if(f){var m=cg(l,c),h=m[1],p=m[2];if(h>p)return!0}c=c.parentNode}while(c&&c!==o.body);return!1},C2=function(l){var r=l.scrollTop,o=l.scrollHeight,c=l.clientHeight;return[r,o,c]},R2=function(l){var r=l.scrollLeft,o=l.scrollWidth,c=l.clientWidth;return[r,o,c]},sg=function(l,r){return l==="v"?j2(r):_2(r)},cg=function(l,r){return l==="v"?C2(r):R2(r)},M2=function(l,r){return l==="h"&&r==="rtl"?-1:1},O2=function(l,r,o,c,f){var m=M2(l,window.getComputedStyle(r).direction),h=m*c,p=o.target,g=r.contains(p),v=!1,b=h>0,S=0,T=0;do{var N=cg(l,p),O=N[0],w=N[1],C=N[2],H=w-C-m*O;(O||H)&&sg(l,p)&&(S+=H,T+=O),p instanceof ShadowRoot?p=p.host:p=p.parentNode}while(!g&&p!==document.body||g&&(r.contains(p)||r===p));return(b&&Math.abs(S)<1||!b&&Math.abs(T)<1)&&(v=!0),v},bs=function(l){return"changedTouches"in l?[l.changedTouches[0].clientX,l.changedTouches[0].clientY]:[0,0]},Bv=function(l){return[l.deltaX,l.deltaY]},kv=function(l){return l&&"current"in l?l.current:l},D2=function(l,r){return l[0]===r[0]&&l[1]===r[1]},z2=function(l){return`
   .block-interactivity-`.concat(l,` {pointer-events: none;}
   .allow-interactivity-`).concat(l,` {pointer-events: all;}
-`)},U2=0,jl=[];function B2(l){var r=x.useRef([]),o=x.useRef([0,0]),c=x.useRef(),f=x.useState(U2++)[0],m=x.useState(ig)[0],h=x.useRef(l);x.useEffect(function(){h.current=l},[l]),x.useEffect(function(){if(l.inert){document.body.classList.add("block-interactivity-".concat(f));var w=a2([l.lockRef.current],(l.shards||[]).map(kv),!0).filter(Boolean);return w.forEach(function(C){return C.classList.add("allow-interactivity-".concat(f))}),function(){document.body.classList.remove("block-interactivity-".concat(f)),w.forEach(function(C){return C.classList.remove("allow-interactivity-".concat(f))})}}},[l.inert,l.lockRef.current,l.shards]);var p=x.useCallback(function(w,C){if("touches"in w&&w.touches.length===2||w.type==="wheel"&&w.ctrlKey)return!h.current.allowPinchZoom;var H=bs(w),j=o.current,R="deltaX"in w?w.deltaX:j[0]-H[0],k="deltaY"in w?w.deltaY:j[1]-H[1],V,P=w.target,$=Math.abs(R)>Math.abs(k)?"h":"v";if("touches"in w&&$==="h"&&P.type==="range")return!1;var Z=Uv($,P);if(!Z)return!0;if(Z?V=$:(V=$==="v"?"h":"v",Z=Uv($,P)),!Z)return!1;if(!c.current&&"changedTouches"in w&&(R||k)&&(c.current=V),!V)return!0;var ce=c.current||V;return O2(ce,C,w,ce==="h"?R:k)},[]),g=x.useCallback(function(w){var C=w;if(!(!jl.length||jl[jl.length-1]!==m)){var H="deltaY"in C?Bv(C):bs(C),j=r.current.filter(function(V){return V.name===C.type&&(V.target===C.target||C.target===V.shadowParent)&&D2(V.delta,H)})[0];if(j&&j.should){C.cancelable&&C.preventDefault();return}if(!j){var R=(h.current.shards||[]).map(kv).filter(Boolean).filter(function(V){return V.contains(C.target)}),k=R.length>0?p(C,R[0]):!h.current.noIsolation;k&&C.cancelable&&C.preventDefault()}}},[]),v=x.useCallback(function(w,C,H,j){var R={name:w,delta:C,target:H,should:j,shadowParent:k2(H)};r.current.push(R),setTimeout(function(){r.current=r.current.filter(function(k){return k!==R})},1)},[]),b=x.useCallback(function(w){o.current=bs(w),c.current=void 0},[]),S=x.useCallback(function(w){v(w.type,Bv(w),w.target,p(w,l.lockRef.current))},[]),T=x.useCallback(function(w){v(w.type,bs(w),w.target,p(w,l.lockRef.current))},[]);x.useEffect(function(){return jl.push(m),l.setCallbacks({onScrollCapture:S,onWheelCapture:S,onTouchMoveCapture:T}),document.addEventListener("wheel",g,Nl),document.addEventListener("touchmove",g,Nl),document.addEventListener("touchstart",b,Nl),function(){jl=jl.filter(function(w){return w!==m}),document.removeEventListener("wheel",g,Nl),document.removeEventListener("touchmove",g,Nl),document.removeEventListener("touchstart",b,Nl)}},[]);var N=l.removeScrollBar,O=l.inert;return x.createElement(x.Fragment,null,O?x.createElement(m,{styles:z2(f)}):null,N?x.createElement(T2,{gapMode:l.gapMode}):null)}function k2(l){for(var r=null;l!==null;)l instanceof ShadowRoot&&(r=l.host,l=l.host),l=l.parentNode;return r}const H2=d2(lg,B2);var og=x.forwardRef(function(l,r){return x.createElement(ks,cn({},l,{ref:r,sideCar:H2}))});og.classNames=ks.classNames;var L2=[" ","Enter","ArrowUp","ArrowDown"],q2=[" ","Enter"],ka="Select",[Hs,Ls,V2]=np(ka),[Bl,Zw]=Dl(ka,[V2,Yp]),qs=Yp(),[G2,ua]=Bl(ka),[Y2,X2]=Bl(ka),ug=l=>{const{__scopeSelect:r,children:o,open:c,defaultOpen:f,onOpenChange:m,value:h,defaultValue:p,onValueChange:g,dir:v,name:b,autoComplete:S,disabled:T,required:N,form:O}=l,w=qs(r),[C,H]=x.useState(null),[j,R]=x.useState(null),[k,V]=x.useState(!1),P=Vu(v),[$,Z]=Xi({prop:c,defaultProp:f??!1,onChange:m,caller:ka}),[ce,he]=Xi({prop:h,defaultProp:p,onChange:g,caller:ka}),ve=x.useRef(null),fe=C?O||!!C.closest("form"):!0,[pe,ye]=x.useState(new Set),re=Array.from(pe).map(D=>D.props.value).join(";");return u.jsx(ZS,{...w,children:u.jsxs(G2,{required:N,scope:r,trigger:C,onTriggerChange:H,valueNode:j,onValueNodeChange:R,valueNodeHasChildren:k,onValueNodeHasChildrenChange:V,contentId:$i(),value:ce,onValueChange:he,open:$,onOpenChange:Z,dir:P,triggerPointerDownPosRef:ve,disabled:T,children:[u.jsx(Hs.Provider,{scope:r,children:u.jsx(Y2,{scope:l.__scopeSelect,onNativeOptionAdd:x.useCallback(D=>{ye(K=>new Set(K).add(D))},[]),onNativeOptionRemove:x.useCallback(D=>{ye(K=>{const q=new Set(K);return q.delete(D),q})},[]),children:o})}),fe?u.jsxs(Og,{"aria-hidden":!0,required:N,tabIndex:-1,name:b,autoComplete:S,value:ce,onChange:D=>he(D.target.value),disabled:T,form:O,children:[ce===void 0?u.jsx("option",{value:""}):null,Array.from(pe)]},re):null]})})};ug.displayName=ka;var fg="SelectTrigger",dg=x.forwardRef((l,r)=>{const{__scopeSelect:o,disabled:c=!1,...f}=l,m=qs(o),h=ua(fg,o),p=h.disabled||c,g=$e(r,h.onTriggerChange),v=Ls(o),b=x.useRef("touch"),[S,T,N]=zg(w=>{const C=v().filter(R=>!R.disabled),H=C.find(R=>R.value===h.value),j=Ug(C,w,H);j!==void 0&&h.onValueChange(j.value)}),O=w=>{p||(h.onOpenChange(!0),N()),w&&(h.triggerPointerDownPosRef.current={x:Math.round(w.pageX),y:Math.round(w.pageY)})};return u.jsx(KS,{asChild:!0,...m,children:u.jsx(Re.button,{type:"button",role:"combobox","aria-controls":h.contentId,"aria-expanded":h.open,"aria-required":h.required,"aria-autocomplete":"none",dir:h.dir,"data-state":h.open?"open":"closed",disabled:p,"data-disabled":p?"":void 0,"data-placeholder":Dg(h.value)?"":void 0,...f,ref:g,onClick:Oe(f.onClick,w=>{w.currentTarget.focus(),b.current!=="mouse"&&O(w)}),onPointerDown:Oe(f.onPointerDown,w=>{b.current=w.pointerType;const C=w.target;C.hasPointerCapture(w.pointerId)&&C.releasePointerCapture(w.pointerId),w.button===0&&w.ctrlKey===!1&&w.pointerType==="mouse"&&(O(w),w.preventDefault())}),onKeyDown:Oe(f.onKeyDown,w=>{const C=S.current!=="";!(w.ctrlKey||w.altKey||w.metaKey)&&w.key.length===1&&T(w.key),!(C&&w.key===" ")&&L2.includes(w.key)&&(O(),w.preventDefault())})})})});dg.displayName=fg;var mg="SelectValue",hg=x.forwardRef((l,r)=>{const{__scopeSelect:o,className:c,style:f,children:m,placeholder:h="",...p}=l,g=ua(mg,o),{onValueNodeHasChildrenChange:v}=g,b=m!==void 0,S=$e(r,g.onValueNodeChange);return yt(()=>{v(b)},[v,b]),u.jsx(Re.span,{...p,ref:S,style:{pointerEvents:"none"},children:Dg(g.value)?u.jsx(u.Fragment,{children:h}):m})});hg.displayName=mg;var Q2="SelectIcon",vg=x.forwardRef((l,r)=>{const{__scopeSelect:o,children:c,...f}=l;return u.jsx(Re.span,{"aria-hidden":!0,...f,ref:r,children:c||"▼"})});vg.displayName=Q2;var Z2="SelectPortal",pg=l=>u.jsx(Fp,{asChild:!0,...l});pg.displayName=Z2;var Ha="SelectContent",gg=x.forwardRef((l,r)=>{const o=ua(Ha,l.__scopeSelect),[c,f]=x.useState();if(yt(()=>{f(new DocumentFragment)},[]),!o.open){const m=c;return m?Ji.createPortal(u.jsx(yg,{scope:l.__scopeSelect,children:u.jsx(Hs.Slot,{scope:l.__scopeSelect,children:u.jsx("div",{children:l.children})})}),m):null}return u.jsx(bg,{...l,ref:r})});gg.displayName=Ha;var Wt=10,[yg,fa]=Bl(Ha),K2="SelectContentImpl",J2=Yi("SelectContent.RemoveScroll"),bg=x.forwardRef((l,r)=>{const{__scopeSelect:o,position:c="item-aligned",onCloseAutoFocus:f,onEscapeKeyDown:m,onPointerDownOutside:h,side:p,sideOffset:g,align:v,alignOffset:b,arrowPadding:S,collisionBoundary:T,collisionPadding:N,sticky:O,hideWhenDetached:w,avoidCollisions:C,...H}=l,j=ua(Ha,o),[R,k]=x.useState(null),[V,P]=x.useState(null),$=$e(r,F=>k(F)),[Z,ce]=x.useState(null),[he,ve]=x.useState(null),fe=Ls(o),[pe,ye]=x.useState(!1),re=x.useRef(!1);x.useEffect(()=>{if(R)return n2(R)},[R]),D1();const D=x.useCallback(F=>{const[se,...Me]=fe().map(Ee=>Ee.ref.current),[Ne]=Me.slice(-1),we=document.activeElement;for(const Ee of F)if(Ee===we||(Ee==null||Ee.scrollIntoView({block:"nearest"}),Ee===se&&V&&(V.scrollTop=0),Ee===Ne&&V&&(V.scrollTop=V.scrollHeight),Ee==null||Ee.focus(),document.activeElement!==we))return},[fe,V]),K=x.useCallback(()=>D([Z,R]),[D,Z,R]);x.useEffect(()=>{pe&&K()},[pe,K]);const{onOpenChange:q,triggerPointerDownPosRef:ae}=j;x.useEffect(()=>{if(R){let F={x:0,y:0};const se=Ne=>{var we,Ee;F={x:Math.abs(Math.round(Ne.pageX)-(((we=ae.current)==null?void 0:we.x)??0)),y:Math.abs(Math.round(Ne.pageY)-(((Ee=ae.current)==null?void 0:Ee.y)??0))}},Me=Ne=>{F.x<=10&&F.y<=10?Ne.preventDefault():R.contains(Ne.target)||q(!1),document.removeEventListener("pointermove",se),ae.current=null};return ae.current!==null&&(document.addEventListener("pointermove",se),document.addEventListener("pointerup",Me,{capture:!0,once:!0})),()=>{document.removeEventListener("pointermove",se),document.removeEventListener("pointerup",Me,{capture:!0})}}},[R,q,ae]),x.useEffect(()=>{const F=()=>q(!1);return window.addEventListener("blur",F),window.addEventListener("resize",F),()=>{window.removeEventListener("blur",F),window.removeEventListener("resize",F)}},[q]);const[A,Y]=zg(F=>{const se=fe().filter(we=>!we.disabled),Me=se.find(we=>we.ref.current===document.activeElement),Ne=Ug(se,F,Me);Ne&&setTimeout(()=>Ne.ref.current.focus())}),W=x.useCallback((F,se,Me)=>{const Ne=!re.current&&!Me;(j.value!==void 0&&j.value===se||Ne)&&(ce(F),Ne&&(re.current=!0))},[j.value]),J=x.useCallback(()=>R==null?void 0:R.focus(),[R]),I=x.useCallback((F,se,Me)=>{const Ne=!re.current&&!Me;(j.value!==void 0&&j.value===se||Ne)&&ve(F)},[j.value]),me=c==="popper"?Du:xg,ie=me===Du?{side:p,sideOffset:g,align:v,alignOffset:b,arrowPadding:S,collisionBoundary:T,collisionPadding:N,sticky:O,hideWhenDetached:w,avoidCollisions:C}:{};return u.jsx(yg,{scope:o,content:R,viewport:V,onViewportChange:P,itemRefCallback:W,selectedItem:Z,onItemLeave:J,itemTextRefCallback:I,focusSelectedItem:K,selectedItemText:he,position:c,isPositioned:pe,searchRef:A,children:u.jsx(og,{as:J2,allowPinchZoom:!0,children:u.jsx(_p,{asChild:!0,trapped:j.open,onMountAutoFocus:F=>{F.preventDefault()},onUnmountAutoFocus:Oe(f,F=>{var se;(se=j.trigger)==null||se.focus({preventScroll:!0}),F.preventDefault()}),children:u.jsx(Np,{asChild:!0,disableOutsidePointerEvents:!0,onEscapeKeyDown:m,onPointerDownOutside:h,onFocusOutside:F=>F.preventDefault(),onDismiss:()=>j.onOpenChange(!1),children:u.jsx(me,{role:"listbox",id:j.contentId,"data-state":j.open?"open":"closed",dir:j.dir,onContextMenu:F=>F.preventDefault(),...H,...ie,onPlaced:()=>ye(!0),ref:$,style:{display:"flex",flexDirection:"column",outline:"none",...H.style},onKeyDown:Oe(H.onKeyDown,F=>{const se=F.ctrlKey||F.altKey||F.metaKey;if(F.key==="Tab"&&F.preventDefault(),!se&&F.key.length===1&&Y(F.key),["ArrowUp","ArrowDown","Home","End"].includes(F.key)){let Ne=fe().filter(we=>!we.disabled).map(we=>we.ref.current);if(["ArrowUp","End"].includes(F.key)&&(Ne=Ne.slice().reverse()),["ArrowUp","ArrowDown"].includes(F.key)){const we=F.target,Ee=Ne.indexOf(we);Ne=Ne.slice(Ee+1)}setTimeout(()=>D(Ne)),F.preventDefault()}})})})})})})});bg.displayName=K2;var $2="SelectItemAlignedPosition",xg=x.forwardRef((l,r)=>{const{__scopeSelect:o,onPlaced:c,...f}=l,m=ua(Ha,o),h=fa(Ha,o),[p,g]=x.useState(null),[v,b]=x.useState(null),S=$e(r,$=>b($)),T=Ls(o),N=x.useRef(!1),O=x.useRef(!0),{viewport:w,selectedItem:C,selectedItemText:H,focusSelectedItem:j}=h,R=x.useCallback(()=>{if(m.trigger&&m.valueNode&&p&&v&&w&&C&&H){const $=m.trigger.getBoundingClientRect(),Z=v.getBoundingClientRect(),ce=m.valueNode.getBoundingClientRect(),he=H.getBoundingClientRect();if(m.dir!=="rtl"){const we=he.left-Z.left,Ee=ce.left-we,ot=$.left-Ee,xt=$.width+ot,da=Math.max(xt,Z.width),ma=window.innerWidth-Wt,mt=gv(Ee,[Wt,Math.max(Wt,ma-da)]);p.style.minWidth=xt+"px",p.style.left=mt+"px"}else{const we=Z.right-he.right,Ee=window.innerWidth-ce.right-we,ot=window.innerWidth-$.right-Ee,xt=$.width+ot,da=Math.max(xt,Z.width),ma=window.innerWidth-Wt,mt=gv(Ee,[Wt,Math.max(Wt,ma-da)]);p.style.minWidth=xt+"px",p.style.right=mt+"px"}const ve=T(),fe=window.innerHeight-Wt*2,pe=w.scrollHeight,ye=window.getComputedStyle(v),re=parseInt(ye.borderTopWidth,10),D=parseInt(ye.paddingTop,10),K=parseInt(ye.borderBottomWidth,10),q=parseInt(ye.paddingBottom,10),ae=re+D+pe+q+K,A=Math.min(C.offsetHeight*5,ae),Y=window.getComputedStyle(w),W=parseInt(Y.paddingTop,10),J=parseInt(Y.paddingBottom,10),I=$.top+$.height/2-Wt,me=fe-I,ie=C.offsetHeight/2,F=C.offsetTop+ie,se=re+D+F,Me=ae-se;if(se<=I){const we=ve.length>0&&C===ve[ve.length-1].ref.current;p.style.bottom="0px";const Ee=v.clientHeight-w.offsetTop-w.offsetHeight,ot=Math.max(me,ie+(we?J:0)+Ee+K),xt=se+ot;p.style.height=xt+"px"}else{const we=ve.length>0&&C===ve[0].ref.current;p.style.top="0px";const ot=Math.max(I,re+w.offsetTop+(we?W:0)+ie)+Me;p.style.height=ot+"px",w.scrollTop=se-I+w.offsetTop}p.style.margin=`${Wt}px 0`,p.style.minHeight=A+"px",p.style.maxHeight=fe+"px",c==null||c(),requestAnimationFrame(()=>N.current=!0)}},[T,m.trigger,m.valueNode,p,v,w,C,H,m.dir,c]);yt(()=>R(),[R]);const[k,V]=x.useState();yt(()=>{v&&V(window.getComputedStyle(v).zIndex)},[v]);const P=x.useCallback($=>{$&&O.current===!0&&(R(),j==null||j(),O.current=!1)},[R,j]);return u.jsx(W2,{scope:o,contentWrapper:p,shouldExpandOnScrollRef:N,onScrollButtonChange:P,children:u.jsx("div",{ref:g,style:{display:"flex",flexDirection:"column",position:"fixed",zIndex:k},children:u.jsx(Re.div,{...f,ref:S,style:{boxSizing:"border-box",maxHeight:"100%",...f.style}})})})});xg.displayName=$2;var P2="SelectPopperPosition",Du=x.forwardRef((l,r)=>{const{__scopeSelect:o,align:c="start",collisionPadding:f=Wt,...m}=l,h=qs(o);return u.jsx(JS,{...h,...m,ref:r,align:c,collisionPadding:f,style:{boxSizing:"border-box",...m.style,"--radix-select-content-transform-origin":"var(--radix-popper-transform-origin)","--radix-select-content-available-width":"var(--radix-popper-available-width)","--radix-select-content-available-height":"var(--radix-popper-available-height)","--radix-select-trigger-width":"var(--radix-popper-anchor-width)","--radix-select-trigger-height":"var(--radix-popper-anchor-height)"}})});Du.displayName=P2;var[W2,tf]=Bl(Ha,{}),zu="SelectViewport",Sg=x.forwardRef((l,r)=>{const{__scopeSelect:o,nonce:c,...f}=l,m=fa(zu,o),h=tf(zu,o),p=$e(r,m.onViewportChange),g=x.useRef(0);return u.jsxs(u.Fragment,{children:[u.jsx("style",{dangerouslySetInnerHTML:{__html:"[data-radix-select-viewport]{scrollbar-width:none;-ms-overflow-style:none;-webkit-overflow-scrolling:touch;}[data-radix-select-viewport]::-webkit-scrollbar{display:none}"},nonce:c}),u.jsx(Hs.Slot,{scope:o,children:u.jsx(Re.div,{"data-radix-select-viewport":"",role:"presentation",...f,ref:p,style:{position:"relative",flex:1,overflow:"hidden auto",...f.style},onScroll:Oe(f.onScroll,v=>{const b=v.currentTarget,{contentWrapper:S,shouldExpandOnScrollRef:T}=h;if(T!=null&&T.current&&S){const N=Math.abs(g.current-b.scrollTop);if(N>0){const O=window.innerHeight-Wt*2,w=parseFloat(S.style.minHeight),C=parseFloat(S.style.height),H=Math.max(w,C);if(H<O){const j=H+N,R=Math.min(O,j),k=j-R;S.style.height=R+"px",S.style.bottom==="0px"&&(b.scrollTop=k>0?k:0,S.style.justifyContent="flex-end")}}}g.current=b.scrollTop})})})]})});Sg.displayName=zu;var wg="SelectGroup",[F2,I2]=Bl(wg),ew=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=$i();return u.jsx(F2,{scope:o,id:f,children:u.jsx(Re.div,{role:"group","aria-labelledby":f,...c,ref:r})})});ew.displayName=wg;var Eg="SelectLabel",tw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=I2(Eg,o);return u.jsx(Re.div,{id:f.id,...c,ref:r})});tw.displayName=Eg;var Ms="SelectItem",[nw,Ag]=Bl(Ms),Tg=x.forwardRef((l,r)=>{const{__scopeSelect:o,value:c,disabled:f=!1,textValue:m,...h}=l,p=ua(Ms,o),g=fa(Ms,o),v=p.value===c,[b,S]=x.useState(m??""),[T,N]=x.useState(!1),O=$e(r,j=>{var R;return(R=g.itemRefCallback)==null?void 0:R.call(g,j,c,f)}),w=$i(),C=x.useRef("touch"),H=()=>{f||(p.onValueChange(c),p.onOpenChange(!1))};if(c==="")throw new Error("A <Select.Item /> must have a value prop that is not an empty string. This is because the Select value can be set to an empty string to clear the selection and show the placeholder.");return u.jsx(nw,{scope:o,value:c,disabled:f,textId:w,isSelected:v,onItemTextChange:x.useCallback(j=>{S(R=>R||((j==null?void 0:j.textContent)??"").trim())},[]),children:u.jsx(Hs.ItemSlot,{scope:o,value:c,disabled:f,textValue:b,children:u.jsx(Re.div,{role:"option","aria-labelledby":w,"data-highlighted":T?"":void 0,"aria-selected":v&&T,"data-state":v?"checked":"unchecked","aria-disabled":f||void 0,"data-disabled":f?"":void 0,tabIndex:f?void 0:-1,...h,ref:O,onFocus:Oe(h.onFocus,()=>N(!0)),onBlur:Oe(h.onBlur,()=>N(!1)),onClick:Oe(h.onClick,()=>{C.current!=="mouse"&&H()}),onPointerUp:Oe(h.onPointerUp,()=>{C.current==="mouse"&&H()}),onPointerDown:Oe(h.onPointerDown,j=>{C.current=j.pointerType}),onPointerMove:Oe(h.onPointerMove,j=>{var R;C.current=j.pointerType,f?(R=g.onItemLeave)==null||R.call(g):C.current==="mouse"&&j.currentTarget.focus({preventScroll:!0})}),onPointerLeave:Oe(h.onPointerLeave,j=>{var R;j.currentTarget===document.activeElement&&((R=g.onItemLeave)==null||R.call(g))}),onKeyDown:Oe(h.onKeyDown,j=>{var k;((k=g.searchRef)==null?void 0:k.current)!==""&&j.key===" "||(q2.includes(j.key)&&H(),j.key===" "&&j.preventDefault())})})})})});Tg.displayName=Ms;var Gi="SelectItemText",Ng=x.forwardRef((l,r)=>{const{__scopeSelect:o,className:c,style:f,...m}=l,h=ua(Gi,o),p=fa(Gi,o),g=Ag(Gi,o),v=X2(Gi,o),[b,S]=x.useState(null),T=$e(r,H=>S(H),g.onItemTextChange,H=>{var j;return(j=p.itemTextRefCallback)==null?void 0:j.call(p,H,g.value,g.disabled)}),N=b==null?void 0:b.textContent,O=x.useMemo(()=>u.jsx("option",{value:g.value,disabled:g.disabled,children:N},g.value),[g.disabled,g.value,N]),{onNativeOptionAdd:w,onNativeOptionRemove:C}=v;return yt(()=>(w(O),()=>C(O)),[w,C,O]),u.jsxs(u.Fragment,{children:[u.jsx(Re.span,{id:g.textId,...m,ref:T}),g.isSelected&&h.valueNode&&!h.valueNodeHasChildren?Ji.createPortal(m.children,h.valueNode):null]})});Ng.displayName=Gi;var jg="SelectItemIndicator",_g=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l;return Ag(jg,o).isSelected?u.jsx(Re.span,{"aria-hidden":!0,...c,ref:r}):null});_g.displayName=jg;var Uu="SelectScrollUpButton",Cg=x.forwardRef((l,r)=>{const o=fa(Uu,l.__scopeSelect),c=tf(Uu,l.__scopeSelect),[f,m]=x.useState(!1),h=$e(r,c.onScrollButtonChange);return yt(()=>{if(o.viewport&&o.isPositioned){let p=function(){const v=g.scrollTop>0;m(v)};const g=o.viewport;return p(),g.addEventListener("scroll",p),()=>g.removeEventListener("scroll",p)}},[o.viewport,o.isPositioned]),f?u.jsx(Mg,{...l,ref:h,onAutoScroll:()=>{const{viewport:p,selectedItem:g}=o;p&&g&&(p.scrollTop=p.scrollTop-g.offsetHeight)}}):null});Cg.displayName=Uu;var Bu="SelectScrollDownButton",Rg=x.forwardRef((l,r)=>{const o=fa(Bu,l.__scopeSelect),c=tf(Bu,l.__scopeSelect),[f,m]=x.useState(!1),h=$e(r,c.onScrollButtonChange);return yt(()=>{if(o.viewport&&o.isPositioned){let p=function(){const v=g.scrollHeight-g.clientHeight,b=Math.ceil(g.scrollTop)<v;m(b)};const g=o.viewport;return p(),g.addEventListener("scroll",p),()=>g.removeEventListener("scroll",p)}},[o.viewport,o.isPositioned]),f?u.jsx(Mg,{...l,ref:h,onAutoScroll:()=>{const{viewport:p,selectedItem:g}=o;p&&g&&(p.scrollTop=p.scrollTop+g.offsetHeight)}}):null});Rg.displayName=Bu;var Mg=x.forwardRef((l,r)=>{const{__scopeSelect:o,onAutoScroll:c,...f}=l,m=fa("SelectScrollButton",o),h=x.useRef(null),p=Ls(o),g=x.useCallback(()=>{h.current!==null&&(window.clearInterval(h.current),h.current=null)},[]);return x.useEffect(()=>()=>g(),[g]),yt(()=>{var b;const v=p().find(S=>S.ref.current===document.activeElement);(b=v==null?void 0:v.ref.current)==null||b.scrollIntoView({block:"nearest"})},[p]),u.jsx(Re.div,{"aria-hidden":!0,...f,ref:r,style:{flexShrink:0,...f.style},onPointerDown:Oe(f.onPointerDown,()=>{h.current===null&&(h.current=window.setInterval(c,50))}),onPointerMove:Oe(f.onPointerMove,()=>{var v;(v=m.onItemLeave)==null||v.call(m),h.current===null&&(h.current=window.setInterval(c,50))}),onPointerLeave:Oe(f.onPointerLeave,()=>{g()})})}),aw="SelectSeparator",lw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l;return u.jsx(Re.div,{"aria-hidden":!0,...c,ref:r})});lw.displayName=aw;var ku="SelectArrow",iw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=qs(o),m=ua(ku,o),h=fa(ku,o);return m.open&&h.position==="popper"?u.jsx($S,{...f,...c,ref:r}):null});iw.displayName=ku;var rw="SelectBubbleInput",Og=x.forwardRef(({__scopeSelect:l,value:r,...o},c)=>{const f=x.useRef(null),m=$e(c,f),h=Ip(r);return x.useEffect(()=>{const p=f.current;if(!p)return;const g=window.HTMLSelectElement.prototype,b=Object.getOwnPropertyDescriptor(g,"value").set;if(h!==r&&b){const S=new Event("change",{bubbles:!0});b.call(p,r),p.dispatchEvent(S)}},[h,r]),u.jsx(Re.select,{...o,style:{...eg,...o.style},ref:m,defaultValue:r})});Og.displayName=rw;function Dg(l){return l===""||l===void 0}function zg(l){const r=ra(l),o=x.useRef(""),c=x.useRef(0),f=x.useCallback(h=>{const p=o.current+h;r(p),function g(v){o.current=v,window.clearTimeout(c.current),v!==""&&(c.current=window.setTimeout(()=>g(""),1e3))}(p)},[r]),m=x.useCallback(()=>{o.current="",window.clearTimeout(c.current)},[]);return x.useEffect(()=>()=>window.clearTimeout(c.current),[]),[o,f,m]}function Ug(l,r,o){const f=r.length>1&&Array.from(r).every(v=>v===r[0])?r[0]:r,m=o?l.indexOf(o):-1;let h=sw(l,Math.max(m,0));f.length===1&&(h=h.filter(v=>v!==o));const g=h.find(v=>v.textValue.toLowerCase().startsWith(f.toLowerCase()));return g!==o?g:void 0}function sw(l,r){return l.map((o,c)=>l[(r+c)%l.length])}var cw=ug,ow=dg,uw=hg,fw=vg,dw=pg,mw=gg,hw=Sg,vw=Tg,pw=Ng,gw=_g,yw=Cg,bw=Rg;function kl({...l}){return u.jsx(cw,{"data-slot":"select",...l})}function Hl({...l}){return u.jsx(uw,{"data-slot":"select-value",...l})}function Ll({className:l,size:r="default",children:o,...c}){return u.jsxs(ow,{"data-slot":"select-trigger","data-size":r,className:Xe("border-input data-[placeholder]:text-muted-foreground [&_svg:not([class*='text-'])]:text-muted-foreground focus-visible:border-ring focus-visible:ring-ring/50 aria-invalid:ring-destructive/20 dark:aria-invalid:ring-destructive/40 aria-invalid:border-destructive dark:bg-input/30 dark:hover:bg-input/50 flex w-fit items-center justify-between gap-2 rounded-md border bg-transparent px-3 py-2 text-sm whitespace-nowrap shadow-xs transition-[color,box-shadow] outline-none focus-visible:ring-[3px] disabled:cursor-not-allowed disabled:opacity-50 data-[size=default]:h-9 data-[size=sm]:h-8 *:data-[slot=select-value]:line-clamp-1 *:data-[slot=select-value]:flex *:data-[slot=select-value]:items-center *:data-[slot=select-value]:gap-2 [&_svg]:pointer-events-none [&_svg]:shrink-0 [&_svg:not([class*='size-'])]:size-4",l),...c,children:[o,u.jsx(fw,{asChild:!0,children:u.jsx(Ep,{className:"size-4 opacity-50"})})]})}function ql({className:l,children:r,position:o="popper",...c}){return u.jsx(dw,{children:u.jsxs(mw,{"data-slot":"select-content",className:Xe("bg-popover text-popover-foreground data-[state=open]:animate-in data-[state=closed]:animate-out data-[state=closed]:fade-out-0 data-[state=open]:fade-in-0 data-[state=closed]:zoom-out-95 data-[state=open]:zoom-in-95 data-[side=bottom]:slide-in-from-top-2 data-[side=left]:slide-in-from-right-2 data-[side=right]:slide-in-from-left-2 data-[side=top]:slide-in-from-bottom-2 relative z-50 max-h-(--radix-select-content-available-height) min-w-[8rem] origin-(--radix-select-content-transform-origin) overflow-x-hidden overflow-y-auto rounded-md border shadow-md",o==="popper"&&"data-[side=bottom]:translate-y-1 data-[side=left]:-translate-x-1 data-[side=right]:translate-x-1 data-[side=top]:-translate-y-1",l),position:o,...c,children:[u.jsx(xw,{}),u.jsx(hw,{className:Xe("p-1",o==="popper"&&"h-[var(--radix-select-trigger-height)] w-full min-w-[var(--radix-select-trigger-width)] scroll-my-1"),children:r}),u.jsx(Sw,{})]})})}function Ye({className:l,children:r,...o}){return u.jsxs(vw,{"data-slot":"select-item",className:Xe("focus:bg-accent focus:text-accent-foreground [&_svg:not([class*='text-'])]:text-muted-foreground relative flex w-full cursor-default items-center gap-2 rounded-sm py-1.5 pr-8 pl-2 text-sm outline-hidden select-none data-[disabled]:pointer-events-none data-[disabled]:opacity-50 [&_svg]:pointer-events-none [&_svg]:shrink-0 [&_svg:not([class*='size-'])]:size-4 *:[span]:last:flex *:[span]:last:items-center *:[span]:last:gap-2",l),...o,children:[u.jsx("span",{className:"absolute right-2 flex size-3.5 items-center justify-center",children:u.jsx(gw,{children:u.jsx(Xx,{className:"size-4"})})}),u.jsx(pw,{children:r})]})}function xw({className:l,...r}){return u.jsx(yw,{"data-slot":"select-scroll-up-button",className:Xe("flex cursor-default items-center justify-center py-1",l),...r,children:u.jsx(Kx,{className:"size-4"})})}function Sw({className:l,...r}){return u.jsx(bw,{"data-slot":"select-scroll-down-button",className:Xe("flex cursor-default items-center justify-center py-1",l),...r,children:u.jsx(Ep,{className:"size-4"})})}var Vs="Switch",[ww,Kw]=Dl(Vs),[Ew,Aw]=ww(Vs),Bg=x.forwardRef((l,r)=>{const{__scopeSwitch:o,name:c,checked:f,defaultChecked:m,required:h,disabled:p,value:g="on",onCheckedChange:v,form:b,...S}=l,[T,N]=x.useState(null),O=$e(r,R=>N(R)),w=x.useRef(!1),C=T?b||!!T.closest("form"):!0,[H,j]=Xi({prop:f,defaultProp:m??!1,onChange:v,caller:Vs});return u.jsxs(Ew,{scope:o,checked:H,disabled:p,children:[u.jsx(Re.button,{type:"button",role:"switch","aria-checked":H,"aria-required":h,"data-state":qg(H),"data-disabled":p?"":void 0,disabled:p,value:g,...S,ref:O,onClick:Oe(l.onClick,R=>{j(k=>!k),C&&(w.current=R.isPropagationStopped(),w.current||R.stopPropagation())})}),C&&u.jsx(Lg,{control:T,bubbles:!w.current,name:c,value:g,checked:H,required:h,disabled:p,form:b,style:{transform:"translateX(-100%)"}})]})});Bg.displayName=Vs;var kg="SwitchThumb",Hg=x.forwardRef((l,r)=>{const{__scopeSwitch:o,...c}=l,f=Aw(kg,o);return u.jsx(Re.span,{"data-state":qg(f.checked),"data-disabled":f.disabled?"":void 0,...c,ref:r})});Hg.displayName=kg;var Tw="SwitchBubbleInput",Lg=x.forwardRef(({__scopeSwitch:l,control:r,checked:o,bubbles:c=!0,...f},m)=>{const h=x.useRef(null),p=$e(h,m),g=Ip(o),v=Vp(r);return x.useEffect(()=>{const b=h.current;if(!b)return;const S=window.HTMLInputElement.prototype,N=Object.getOwnPropertyDescriptor(S,"checked").set;if(g!==o&&N){const O=new Event("click",{bubbles:c});N.call(b,o),b.dispatchEvent(O)}},[g,o,c]),u.jsx("input",{type:"checkbox","aria-hidden":!0,defaultChecked:o,...f,tabIndex:-1,ref:p,style:{...f.style,...v,position:"absolute",pointerEvents:"none",opacity:0,margin:0}})});Lg.displayName=Tw;function qg(l){return l?"checked":"unchecked"}var Nw=Bg,jw=Hg;function Gs({className:l,...r}){return u.jsx(Nw,{"data-slot":"switch",className:Xe("peer data-[state=checked]:bg-primary data-[state=unchecked]:bg-input focus-visible:border-ring focus-visible:ring-ring/50 dark:data-[state=unchecked]:bg-input/80 inline-flex h-[1.15rem] w-8 shrink-0 items-center rounded-full border border-transparent shadow-xs transition-all outline-none focus-visible:ring-[3px] disabled:cursor-not-allowed disabled:opacity-50",l),...r,children:u.jsx(jw,{"data-slot":"switch-thumb",className:Xe("bg-background dark:data-[state=unchecked]:bg-foreground dark:data-[state=checked]:bg-primary-foreground pointer-events-none block size-4 rounded-full ring-0 transition-transform data-[state=checked]:translate-x-[calc(100%-2px)] data-[state=unchecked]:translate-x-0")})})}const xs="http://localhost:5000/api",_w=["comunidade","comunicação","ações sociais","periferias","publicidade inclusiva","diversidade","inclusão social","responsabilidade social","terceiro setor","voluntariado","sustentabilidade","direitos humanos"];function Cw({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState({topic_name:"",priority:3,avoid:!1});x.useEffect(()=>{S()},[]);const S=async()=>{try{const j=await fetch(`${xs}/topics`,{credentials:"include"});if(j.ok){const R=await j.json();o(R)}}catch{h("Erro ao carregar tópicos")}},T=async j=>{if(j.preventDefault(),!!v.topic_name.trim()){f(!0);try{const R=await fetch(`${xs}/topics`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(v)});if(R.ok)b({topic_name:"",priority:3,avoid:!1}),S(),l==null||l();else{const k=await R.json();h(k.error||"Erro ao adicionar tópico")}}catch{h("Erro de conexão")}finally{f(!1)}}},N=async(j,R)=>{try{(await fetch(`${xs}/topics/${j}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(R)})).ok?(g(null),S(),l==null||l()):h("Erro ao atualizar tópico")}catch{h("Erro de conexão")}},O=async j=>{if(confirm("Tem certeza que deseja excluir este tópico?"))try{(await fetch(`${xs}/topics/${j}`,{method:"DELETE",credentials:"include"})).ok?(S(),l==null||l()):h("Erro ao excluir tópico")}catch{h("Erro de conexão")}},w=j=>{b({...v,topic_name:j})},C=j=>({1:"Muito Alta",2:"Alta",3:"Média",4:"Baixa",5:"Muito Baixa"})[j]||"Média",H=j=>({1:"bg-red-100 text-red-800",2:"bg-orange-100 text-orange-800",3:"bg-yellow-100 text-yellow-800",4:"bg-blue-100 text-blue-800",5:"bg-gray-100 text-gray-800"})[j]||"bg-yellow-100 text-yellow-800";return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(Nu,{className:"h-5 w-5 mr-2"}),"Gerenciar Tópicos de Interesse"]}),u.jsx(ia,{children:"Configure os tópicos que o agente deve buscar ou evitar nas notícias"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:T,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"topic-name",children:"Nome do Tópico"}),u.jsx(gt,{id:"topic-name",placeholder:"Ex: comunidade, ações sociais...",value:v.topic_name,onChange:j=>b({...v,topic_name:j.target.value}),required:!0})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"priority",children:"Prioridade"}),u.jsxs(kl,{value:v.priority.toString(),onValueChange:j=>b({...v,priority:parseInt(j)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]})]}),u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{id:"avoid",checked:v.avoid,onCheckedChange:j=>b({...v,avoid:j})}),u.jsx(Je,{htmlFor:"avoid",children:"Evitar"})]})]}),u.jsxs(qe,{type:"submit",disabled:c,children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Tópico"]})]}),u.jsxs("div",{className:"mb-6",children:[u.jsx(Je,{className:"text-sm font-medium mb-2 block",children:"Tópicos Sugeridos:"}),u.jsx("div",{className:"flex flex-wrap gap-2",children:_w.filter(j=>!r.some(R=>R.topic_name.toLowerCase()===j.toLowerCase())).map(j=>u.jsxs(sa,{variant:"outline",className:"cursor-pointer hover:bg-blue-50",onClick:()=>w(j),children:[u.jsx(Qi,{className:"h-3 w-3 mr-1"}),j]},j))})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(Nu,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhum tópico configurado ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione tópicos para começar a receber notícias relevantes"})]}):r.map(j=>u.jsx(Rw,{topic:j,isEditing:p===j.id,onEdit:()=>g(j.id),onCancelEdit:()=>g(null),onUpdate:N,onDelete:O,getPriorityLabel:C,getPriorityColor:H},j.id))})]})]})})}function Rw({topic:l,isEditing:r,onEdit:o,onCancelEdit:c,onUpdate:f,onDelete:m,getPriorityLabel:h,getPriorityColor:p}){const[g,v]=x.useState(l);x.useEffect(()=>{v(l)},[l]);const b=()=>{f(l.id,g)};return r?u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsx("div",{className:"md:col-span-2",children:u.jsx(gt,{value:g.topic_name,onChange:S=>v({...g,topic_name:S.target.value}),placeholder:"Nome do tópico"})}),u.jsxs(kl,{value:g.priority.toString(),onValueChange:S=>v({...g,priority:parseInt(S)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]}),u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{checked:g.avoid,onCheckedChange:S=>v({...g,avoid:S})}),u.jsx(Je,{children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:b,children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})]})})}):u.jsx(st,{className:l.avoid?"border-red-200 bg-red-50":"",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx("span",{className:"font-medium",children:l.topic_name}),u.jsx(sa,{className:p(l.priority),children:h(l.priority)}),l.avoid&&u.jsx(sa,{variant:"destructive",children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:o,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>m(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}const Ss="http://localhost:5000/api",Mw=["folha.uol.com.br","g1.globo.com","estadao.com.br","uol.com.br","bbc.com","cnn.com.br","cartacapital.com.br","brasil247.com","nexojornal.com.br","agenciabrasil.ebc.com.br","huffpostbrasil.com","theintercept.com/brasil"];function Ow({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState({source_name:"",priority:3,avoid:!1});x.useEffect(()=>{S()},[]);const S=async()=>{try{const j=await fetch(`${Ss}/sources`,{credentials:"include"});if(j.ok){const R=await j.json();o(R)}}catch{h("Erro ao carregar fontes")}},T=async j=>{if(j.preventDefault(),!!v.source_name.trim()){f(!0);try{const R=await fetch(`${Ss}/sources`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(v)});if(R.ok)b({source_name:"",priority:3,avoid:!1}),S(),l==null||l();else{const k=await R.json();h(k.error||"Erro ao adicionar fonte")}}catch{h("Erro de conexão")}finally{f(!1)}}},N=async(j,R)=>{try{(await fetch(`${Ss}/sources/${j}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(R)})).ok?(g(null),S(),l==null||l()):h("Erro ao atualizar fonte")}catch{h("Erro de conexão")}},O=async j=>{if(confirm("Tem certeza que deseja excluir esta fonte?"))try{(await fetch(`${Ss}/sources/${j}`,{method:"DELETE",credentials:"include"})).ok?(S(),l==null||l()):h("Erro ao excluir fonte")}catch{h("Erro de conexão")}},w=j=>{b({...v,source_name:j})},C=j=>({1:"Muito Alta",2:"Alta",3:"Média",4:"Baixa",5:"Muito Baixa"})[j]||"Média",H=j=>({1:"bg-red-100 text-red-800",2:"bg-orange-100 text-orange-800",3:"bg-yellow-100 text-yellow-800",4:"bg-blue-100 text-blue-800",5:"bg-gray-100 text-gray-800"})[j]||"bg-yellow-100 text-yellow-800";return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(dv,{className:"h-5 w-5 mr-2"}),"Gerenciar Fontes de Notícias"]}),u.jsx(ia,{children:"Configure as fontes de notícias que devem ser priorizadas ou evitadas"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:T,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"source-name",children:"Nome da Fonte"}),u.jsx(gt,{id:"source-name",placeholder:"Ex: folha.uol.com.br, g1.globo.com...",value:v.source_name,onChange:j=>b({...v,source_name:j.target.value}),required:!0}),u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Use o domínio do site (ex: folha.uol.com.br)"})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"priority",children:"Prioridade"}),u.jsxs(kl,{value:v.priority.toString(),onValueChange:j=>b({...v,priority:parseInt(j)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]})]}),u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{id:"avoid",checked:v.avoid,onCheckedChange:j=>b({...v,avoid:j})}),u.jsx(Je,{htmlFor:"avoid",children:"Evitar"})]})]}),u.jsxs(qe,{type:"submit",disabled:c,children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Fonte"]})]}),u.jsxs("div",{className:"mb-6",children:[u.jsx(Je,{className:"text-sm font-medium mb-2 block",children:"Fontes Sugeridas:"}),u.jsx("div",{className:"flex flex-wrap gap-2",children:Mw.filter(j=>!r.some(R=>R.source_name.toLowerCase()===j.toLowerCase())).map(j=>u.jsxs(sa,{variant:"outline",className:"cursor-pointer hover:bg-blue-50",onClick:()=>w(j),children:[u.jsx(Qi,{className:"h-3 w-3 mr-1"}),j]},j))})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(dv,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhuma fonte configurada ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione fontes para personalizar a busca de notícias"})]}):r.map(j=>u.jsx(Dw,{source:j,isEditing:p===j.id,onEdit:()=>g(j.id),onCancelEdit:()=>g(null),onUpdate:N,onDelete:O,getPriorityLabel:C,getPriorityColor:H},j.id))})]})]})})}function Dw({source:l,isEditing:r,onEdit:o,onCancelEdit:c,onUpdate:f,onDelete:m,getPriorityLabel:h,getPriorityColor:p}){const[g,v]=x.useState(l);x.useEffect(()=>{v(l)},[l]);const b=()=>{f(l.id,g)},S=()=>{const T=l.source_name.startsWith("http")?l.source_name:`https://${l.source_name}`;window.open(T,"_blank")};return r?u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsx("div",{className:"md:col-span-2",children:u.jsx(gt,{value:g.source_name,onChange:T=>v({...g,source_name:T.target.value}),placeholder:"Nome da fonte"})}),u.jsxs(kl,{value:g.priority.toString(),onValueChange:T=>v({...g,priority:parseInt(T)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]}),u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{checked:g.avoid,onCheckedChange:T=>v({...g,avoid:T})}),u.jsx(Je,{children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:b,children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})]})})}):u.jsx(st,{className:l.avoid?"border-red-200 bg-red-50":"",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx("span",{className:"font-medium",children:l.source_name}),u.jsx(sa,{className:p(l.priority),children:h(l.priority)}),l.avoid&&u.jsx(sa,{variant:"destructive",children:"Evitar"}),u.jsx(qe,{size:"sm",variant:"ghost",onClick:S,className:"h-6 w-6 p-0",children:u.jsx(Es,{className:"h-3 w-3"})})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:o,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>m(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}const Vi="http://localhost:5000/api";function zw({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState(null),[S,T]=x.useState({type:"whatsapp",address:""});x.useEffect(()=>{N()},[]);const N=async()=>{try{const k=await fetch(`${Vi}/recipients`,{credentials:"include"});if(k.ok){const V=await k.json();o(V)}}catch{h("Erro ao carregar destinatários")}},O=async k=>{if(k.preventDefault(),!!S.address.trim()){f(!0);try{const V=await fetch(`${Vi}/recipients`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(S)});if(V.ok)T({type:"whatsapp",address:""}),N(),l==null||l();else{const P=await V.json();h(P.error||"Erro ao adicionar destinatário")}}catch{h("Erro de conexão")}finally{f(!1)}}},w=async(k,V)=>{try{(await fetch(`${Vi}/recipients/${k}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(V)})).ok?(g(null),N(),l==null||l()):h("Erro ao atualizar destinatário")}catch{h("Erro de conexão")}},C=async k=>{if(confirm("Tem certeza que deseja excluir este destinatário?"))try{(await fetch(`${Vi}/recipients/${k}`,{method:"DELETE",credentials:"include"})).ok?(N(),l==null||l()):h("Erro ao excluir destinatário")}catch{h("Erro de conexão")}},H=async k=>{b(k.id);try{const V=await fetch(`${Vi}/send-test-message`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify({recipient_address:k.address,recipient_type:k.type})}),P=await V.json();V.ok?alert("Mensagem de teste enviada com sucesso!"):alert(`Erro ao enviar mensagem: ${P.error}`)}catch{alert("Erro de conexão ao enviar mensagem de teste")}finally{b(null)}},j=(k,V)=>{if(V==="whatsapp"){const P=k.replace(/\D/g,"");return P.length===11?`(${P.slice(0,2)}) ${P.slice(2,7)}-${P.slice(7)}`:k}return k},R=(k,V)=>{if(V==="whatsapp"){const P=k.replace(/\D/g,"");return P.length>=10&&P.length<=15}else if(V==="email")return/^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(k);return!0};return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(ju,{className:"h-5 w-5 mr-2"}),"Gerenciar Destinatários"]}),u.jsx(ia,{children:"Configure os contatos que receberão o resumo diário de notícias"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:O,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-4",children:[u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"type",children:"Tipo"}),u.jsxs(kl,{value:S.type,onValueChange:k=>T({...S,type:k,address:""}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"whatsapp",children:"WhatsApp"}),u.jsx(Ye,{value:"email",children:"Email"})]})]})]}),u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"address",children:S.type==="whatsapp"?"Número do WhatsApp":"Endereço de Email"}),u.jsx(gt,{id:"address",type:S.type==="email"?"email":"tel",placeholder:S.type==="whatsapp"?"Ex: (11) 99999-9999":"Ex: usuario@email.com",value:S.address,onChange:k=>T({...S,address:k.target.value}),required:!0}),S.type==="whatsapp"&&u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Inclua o código do país (ex: +55 para Brasil)"})]})]}),u.jsxs(qe,{type:"submit",disabled:c||!R(S.address,S.type),children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Destinatário"]})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(ju,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhum destinatário configurado ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione contatos para receber o resumo diário"})]}):r.map(k=>u.jsx(Uw,{recipient:k,isEditing:p===k.id,isTesting:v===k.id,onEdit:()=>g(k.id),onCancelEdit:()=>g(null),onUpdate:w,onDelete:C,onTest:H,formatAddress:j,validateAddress:R},k.id))})]})]})})}function Uw({recipient:l,isEditing:r,isTesting:o,onEdit:c,onCancelEdit:f,onUpdate:m,onDelete:h,onTest:p,formatAddress:g,validateAddress:v}){const[b,S]=x.useState(l);x.useEffect(()=>{S(l)},[l]);const T=()=>{v(b.address,b.type)&&m(l.id,b)},N=C=>C==="whatsapp"?s1:i1,O=C=>C==="whatsapp"?u.jsx(sa,{className:"bg-green-100 text-green-800",children:"WhatsApp"}):u.jsx(sa,{className:"bg-blue-100 text-blue-800",children:"Email"});if(r)return u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-4",children:[u.jsx("div",{children:u.jsxs(kl,{value:b.type,onValueChange:C=>S({...b,type:C}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"whatsapp",children:"WhatsApp"}),u.jsx(Ye,{value:"email",children:"Email"})]})]})}),u.jsx("div",{children:u.jsx(gt,{type:b.type==="email"?"email":"tel",value:b.address,onChange:C=>S({...b,address:C.target.value}),placeholder:b.type==="whatsapp"?"Número do WhatsApp":"Endereço de Email"})}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:T,disabled:!v(b.address,b.type),children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:f,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})})});const w=N(l.type);return u.jsx(st,{children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx(w,{className:"h-5 w-5 text-gray-500"}),u.jsx("span",{className:"font-medium",children:g(l.address,l.type)}),O(l.type)]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>p(l),disabled:o,children:o?u.jsx("div",{className:"h-4 w-4 animate-spin rounded-full border-2 border-gray-300 border-t-gray-600"}):u.jsx(v1,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>h(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}var Bw="Separator",Hv="horizontal",kw=["horizontal","vertical"],Vg=x.forwardRef((l,r)=>{const{decorative:o,orientation:c=Hv,...f}=l,m=Hw(c)?c:Hv,p=o?{role:"none"}:{"aria-orientation":m==="vertical"?m:void 0,role:"separator"};return u.jsx(Re.div,{"data-orientation":m,...p,...f,ref:r})});Vg.displayName=Bw;function Hw(l){return kw.includes(l)}var Lw=Vg;function xu({className:l,orientation:r="horizontal",decorative:o=!0,...c}){return u.jsx(Lw,{"data-slot":"separator-root",decorative:o,orientation:r,className:Xe("bg-border shrink-0 data-[orientation=horizontal]:h-px data-[orientation=horizontal]:w-full data-[orientation=vertical]:h-full data-[orientation=vertical]:w-px",l),...c})}const qw="http://localhost:5000/api";function Vw({user:l,onUpdate:r}){const[o,c]=x.useState(!1),[f,m]=x.useState(""),[h,p]=x.useState(""),[g,v]=x.useState({username:l.username||"",api_key_news:l.api_key_news||"",password:"",confirmPassword:""}),b=async N=>{if(N.preventDefault(),c(!0),m(""),p(""),g.password&&g.password!==g.confirmPassword){m("As senhas não coincidem"),c(!1);return}try{const O={username:g.username,api_key_news:g.api_key_news};g.password&&(O.password=g.password);const w=await fetch(`${qw}/profile`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(O)});if(w.ok)p("Perfil atualizado com sucesso!"),v({...g,password:"",confirmPassword:""}),r==null||r();else{const C=await w.json();m(C.error||"Erro ao atualizar perfil")}}catch{m("Erro de conexão")}finally{c(!1)}},S=()=>{window.open("https://newsapi.org/register","_blank")},T=()=>{window.open("https://developers.facebook.com/docs/whatsapp/cloud-api/get-started","_blank")};return u.jsxs("div",{className:"space-y-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(g1,{className:"h-5 w-5 mr-2"}),"Configurações do Perfil"]}),u.jsx(ia,{children:"Gerencie suas informações pessoais e chaves de API"})]}),u.jsx(ct,{children:u.jsxs("form",{onSubmit:b,className:"space-y-6",children:[u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Ap,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Informações Básicas"})]}),u.jsx("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-4",children:u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"username",children:"Nome de Usuário"}),u.jsx(gt,{id:"username",value:g.username,onChange:N=>v({...g,username:N.target.value}),required:!0})]})})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(mv,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Alterar Senha"})]}),u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-4",children:[u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"password",children:"Nova Senha"}),u.jsx(gt,{id:"password",type:"password",placeholder:"Deixe em branco para manter a atual",value:g.password,onChange:N=>v({...g,password:N.target.value})})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"confirmPassword",children:"Confirmar Nova Senha"}),u.jsx(gt,{id:"confirmPassword",type:"password",placeholder:"Confirme a nova senha",value:g.confirmPassword,onChange:N=>v({...g,confirmPassword:N.target.value})})]})]})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(mv,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Chaves de API"})]}),u.jsx("div",{className:"space-y-4",children:u.jsxs("div",{children:[u.jsxs("div",{className:"flex items-center justify-between mb-2",children:[u.jsx(Je,{htmlFor:"api_key_news",children:"Chave da API de Notícias (NewsAPI)"}),u.jsxs(qe,{type:"button",variant:"outline",size:"sm",onClick:S,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Obter Chave"]})]}),u.jsx(gt,{id:"api_key_news",type:"password",placeholder:"Sua chave da NewsAPI",value:g.api_key_news,onChange:N=>v({...g,api_key_news:N.target.value})}),u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Necessária para buscar notícias. Obtenha gratuitamente em newsapi.org"})]})})]}),f&&u.jsxs(Ft,{variant:"destructive",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:f})]}),h&&u.jsxs(Ft,{className:"border-green-200 bg-green-50",children:[u.jsx(Tu,{className:"h-4 w-4 text-green-600"}),u.jsx(It,{className:"text-green-800",children:h})]}),u.jsxs(qe,{type:"submit",disabled:o,className:"w-full md:w-auto",children:[o?u.jsx("div",{className:"h-4 w-4 animate-spin rounded-full border-2 border-gray-300 border-t-gray-600 mr-2"}):u.jsx(Ds,{className:"h-4 w-4 mr-2"}),"Salvar Alterações"]})]})})]}),u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Configuração de APIs Externas"}),u.jsx(ia,{children:"Informações sobre como configurar as APIs necessárias"})]}),u.jsxs(ct,{className:"space-y-4",children:[u.jsxs("div",{className:"space-y-2",children:[u.jsx("h4",{className:"font-medium",children:"NewsAPI (Obrigatória)"}),u.jsx("p",{className:"text-sm text-gray-600",children:"A NewsAPI é necessária para buscar notícias. Você pode obter uma chave gratuita que permite até 1.000 requisições por mês."}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:S,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Registrar na NewsAPI"]})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-2",children:[u.jsx("h4",{className:"font-medium",children:"WhatsApp Business API (Para envio via WhatsApp)"}),u.jsx("p",{className:"text-sm text-gray-600",children:"Para enviar mensagens via WhatsApp, você precisa configurar a WhatsApp Business Platform. Isso requer aprovação da Meta e configuração de webhooks."}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:T,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Documentação WhatsApp"]})]}),u.jsxs(Ft,{children:[u.jsx(la,{className:"h-4 w-4"}),u.jsxs(It,{children:[u.jsx("strong",{children:"Nota:"})," Para uso em produção, você precisará configurar as variáveis de ambiente no servidor com suas chaves de API. Durante o desenvolvimento, você pode usar apenas a funcionalidade de email."]})]})]})]})]})}const ws="http://localhost:5000/api";function Gw({user:l,onLogout:r}){const[o,c]=x.useState(null),[f,m]=x.useState(!1),[h,p]=x.useState(null),[g,v]=x.useState("overview");x.useEffect(()=>{b()},[]);const b=async()=>{try{const O=await fetch(`${ws}/config-status`,{credentials:"include"});if(O.ok){const w=await O.json();c(w)}}catch(O){console.error("Erro ao buscar status:",O)}},S=async()=>{m(!0);try{const w=await(await fetch(`${ws}/run-daily-digest`,{method:"POST",credentials:"include"})).json();p(w),b()}catch{p({error:"Erro ao executar resumo diário"})}finally{m(!1)}},T=async()=>{m(!0);try{const w=await(await fetch(`${ws}/test-news-search`,{method:"POST",credentials:"include"})).json();p(w)}catch{p({error:"Erro ao testar busca de notícias"})}finally{m(!1)}},N=async()=>{try{await fetch(`${ws}/logout`,{method:"POST",credentials:"include"})}catch(O){console.error("Erro ao fazer logout:",O)}r()};return o?u.jsxs("div",{className:"min-h-screen bg-gray-50",children:[u.jsx("header",{className:"bg-white shadow-sm border-b",children:u.jsx("div",{className:"max-w-7xl mx-auto px-4 sm:px-6 lg:px-8",children:u.jsxs("div",{className:"flex justify-between items-center h-16",children:[u.jsxs("div",{className:"flex items-center",children:[u.jsx(u1,{className:"h-8 w-8 text-blue-600 mr-3"}),u.jsx("h1",{className:"text-xl font-semibold text-gray-900",children:"Agente de Notícias"})]}),u.jsxs("div",{className:"flex items-center space-x-4",children:[u.jsxs("span",{className:"text-sm text-gray-600",children:["Olá, ",l.username]}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:N,children:[u.jsx(a1,{className:"h-4 w-4 mr-2"}),"Sair"]})]})]})})}),u.jsx("div",{className:"max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8",children:u.jsxs(xp,{value:g,onValueChange:v,children:[u.jsxs(Sp,{className:"grid w-full grid-cols-5",children:[u.jsx(za,{value:"overview",children:"Visão Geral"}),u.jsx(za,{value:"topics",children:"Tópicos"}),u.jsx(za,{value:"sources",children:"Fontes"}),u.jsx(za,{value:"recipients",children:"Destinatários"}),u.jsx(za,{value:"settings",children:"Configurações"})]}),u.jsxs(Ua,{value:"overview",className:"space-y-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Status da Configuração"}),o.ready_to_run?u.jsx(Tu,{className:"h-4 w-4 text-green-600"}):u.jsx(la,{className:"h-4 w-4 text-yellow-600"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.ready_to_run?"Pronto":"Incompleto"}),u.jsx("p",{className:"text-xs text-muted-foreground",children:o.ready_to_run?"Agente configurado e pronto para uso":"Configure tópicos, fontes e destinatários"})]})]}),u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Tópicos Configurados"}),u.jsx(Nu,{className:"h-4 w-4 text-muted-foreground"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.topics_count}),u.jsxs("p",{className:"text-xs text-muted-foreground",children:[o.avoid_topics_count," tópicos evitados"]})]})]}),u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Destinatários"}),u.jsx(ju,{className:"h-4 w-4 text-muted-foreground"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.whatsapp_recipients+o.email_recipients}),u.jsxs("p",{className:"text-xs text-muted-foreground",children:[o.whatsapp_recipients," WhatsApp, ",o.email_recipients," Email"]})]})]})]}),u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Testar Busca de Notícias"}),u.jsx(ia,{children:"Teste a busca de notícias com suas configurações atuais"})]}),u.jsx(ct,{children:u.jsxs(qe,{onClick:T,disabled:f||!o.has_news_api_key,className:"w-full",children:[u.jsx(vv,{className:"h-4 w-4 mr-2"}),f?"Testando...":"Testar Busca"]})})]}),u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Executar Resumo Diário"}),u.jsx(ia,{children:"Execute o processo completo de busca e envio de notícias"})]}),u.jsx(ct,{children:u.jsxs(qe,{onClick:S,disabled:f||!o.ready_to_run,className:"w-full",variant:o.ready_to_run?"default":"secondary",children:[u.jsx(vv,{className:"h-4 w-4 mr-2"}),f?"Executando...":"Executar Agora"]})})]})]}),h&&u.jsxs(st,{children:[u.jsx(Zt,{children:u.jsx(Kt,{children:"Último Resultado"})}),u.jsx(ct,{children:h.error?u.jsxs(Ft,{variant:"destructive",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:h.error})]}):u.jsxs("div",{className:"space-y-2",children:[h.message&&u.jsxs(Ft,{children:[u.jsx(Tu,{className:"h-4 w-4"}),u.jsx(It,{children:h.message})]}),u.jsxs("div",{className:"grid grid-cols-2 md:grid-cols-4 gap-4 text-sm",children:[h.total_found!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Encontradas:"})," ",h.total_found]}),h.total_filtered!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Filtradas:"})," ",h.total_filtered]}),h.total_articles_sent!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Enviadas:"})," ",h.total_articles_sent]}),h.messages_sent!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Mensagens:"})," ",h.messages_sent]})]})]})})]}),!o.ready_to_run&&u.jsxs(Ft,{children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:u.jsxs("div",{className:"space-y-1",children:[u.jsx("p",{className:"font-medium",children:"Configuração incompleta:"}),u.jsxs("ul",{className:"list-disc list-inside space-y-1 text-sm",children:[!o.has_news_api_key&&u.jsx("li",{children:"Configure sua chave da API de notícias"}),!o.has_topics&&u.jsx("li",{children:"Adicione pelo menos um tópico de interesse"}),!o.has_recipients&&u.jsx("li",{children:"Adicione pelo menos um destinatário"})]})]})})]})]}),u.jsx(Ua,{value:"topics",children:u.jsx(Cw,{onUpdate:b})}),u.jsx(Ua,{value:"sources",children:u.jsx(Ow,{onUpdate:b})}),u.jsx(Ua,{value:"recipients",children:u.jsx(zw,{onUpdate:b})}),u.jsx(Ua,{value:"settings",children:u.jsx(Vw,{user:l,onUpdate:b})})]})})]}):u.jsx("div",{className:"flex items-center justify-center min-h-screen",children:"Carregando..."})}const Yw="http://localhost:5000/api";function Xw(){const[l,r]=x.useState(null),[o,c]=x.useState(!0);x.useEffect(()=>{f()},[]);const f=async()=>{try{const p=await fetch(`${Yw}/profile`,{credentials:"include"});if(p.ok){const g=await p.json();r(g)}}catch{console.log("Usuário não autenticado")}finally{c(!1)}},m=p=>{r(p)},h=()=>{r(null)};return o?u.jsx("div",{className:"min-h-screen flex items-center justify-center",children:u.jsxs("div",{className:"text-center",children:[u.jsx("div",{className:"h-8 w-8 animate-spin rounded-full border-4 border-gray-300 border-t-blue-600 mx-auto mb-4"}),u.jsx("p",{className:"text-gray-600",children:"Carregando..."})]})}):u.jsx("div",{className:"App",children:l?u.jsx(Gw,{user:l,onLogout:h}):u.jsx(E1,{onLogin:m})})}pb.createRoot(document.getElementById("root")).render(u.jsx(x.StrictMode,{children:u.jsx(Xw,{})}));
+`)},U2=0,jl=[];function B2(l){var r=x.useRef([]),o=x.useRef([0,0]),c=x.useRef(),f=x.useState(U2++)[0],m=x.useState(ig)[0],h=x.useRef(l);x.useEffect(function(){h.current=l},[l]),x.useEffect(function(){if(l.inert){document.body.classList.add("block-interactivity-".concat(f));var w=a2([l.lockRef.current],(l.shards||[]).map(kv),!0).filter(Boolean);return w.forEach(function(C){return C.classList.add("allow-interactivity-".concat(f))}),function(){document.body.classList.remove("block-interactivity-".concat(f)),w.forEach(function(C){return C.classList.remove("allow-interactivity-".concat(f))})}}},[l.inert,l.lockRef.current,l.shards]);var p=x.useCallback(function(w,C){if("touches"in w&&w.touches.length===2||w.type==="wheel"&&w.ctrlKey)return!h.current.allowPinchZoom;var H=bs(w),j=o.current,R="deltaX"in w?w.deltaX:j[0]-H[0],k="deltaY"in w?w.deltaY:j[1]-H[1],V,P=w.target,$=Math.abs(R)>Math.abs(k)?"h":"v";if("touches"in w&&$==="h"&&P.type==="range")return!1;var Z=Uv($,P);if(!Z)return!0;if(Z?V=$:(V=$==="v"?"h":"v",Z=Uv($,P)),!Z)return!1;if(!c.current&&"changedTouches"in w&&(R||k)&&(c.current=V),!V)return!0;var ce=c.current||V;return O2(ce,C,w,ce==="h"?R:k)},[]),g=x.useCallback(function(w){var C=w;if(!(!jl.length||jl[jl.length-1]!==m)){var H="deltaY"in C?Bv(C):bs(C),j=r.current.filter(function(V){return V.name===C.type&&(V.target===C.target||C.target===V.shadowParent)&&D2(V.delta,H)})[0];if(j&&j.should){C.cancelable&&C.preventDefault();return}if(!j){var R=(h.current.shards||[]).map(kv).filter(Boolean).filter(function(V){return V.contains(C.target)}),k=R.length>0?p(C,R[0]):!h.current.noIsolation;k&&C.cancelable&&C.preventDefault()}}},[]),v=x.useCallback(function(w,C,H,j){var R={name:w,delta:C,target:H,should:j,shadowParent:k2(H)};r.current.push(R),setTimeout(function(){r.current=r.current.filter(function(k){return k!==R})},1)},[]),b=x.useCallback(function(w){o.current=bs(w),c.current=void 0},[]),S=x.useCallback(function(w){v(w.type,Bv(w),w.target,p(w,l.lockRef.current))},[]),T=x.useCallback(function(w){v(w.type,bs(w),w.target,p(w,l.lockRef.current))},[]);x.useEffect(function(){return jl.push(m),l.setCallbacks({onScrollCapture:S,onWheelCapture:S,onTouchMoveCapture:T}),document.addEventListener("wheel",g,Nl),document.addEventListener("touchmove",g,Nl),document.addEventListener("touchstart",b,Nl),function(){jl=jl.filter(function(w){return w!==m}),document.removeEventListener("wheel",g,Nl),document.removeEventListener("touchmove",g,Nl),document.removeEventListener("touchstart",b,Nl)}},[]);var N=l.removeScrollBar,O=l.inert;return x.createElement(x.Fragment,null,O?x.createElement(m,{styles:z2(f)}):null,N?x.createElement(T2,{gapMode:l.gapMode}):null)}function k2(l){for(var r=null;l!==null;)l instanceof ShadowRoot&&(r=l.host,l=l.host),l=l.parentNode;return r}const H2=d2(lg,B2);var og=x.forwardRef(function(l,r){return x.createElement(ks,cn({},l,{ref:r,sideCar:H2}))});og.classNames=ks.classNames;var L2=[" ","Enter","ArrowUp","ArrowDown"],q2=[" ","Enter"],ka="Select",[Hs,Ls,V2]=np(ka),[Bl,Zw]=Dl(ka,[V2,Yp]),qs=Yp(),[G2,ua]=Bl(ka),[Y2,X2]=Bl(ka),ug=l=>{const{__scopeSelect:r,children:o,open:c,defaultOpen:f,onOpenChange:m,value:h,defaultValue:p,onValueChange:g,dir:v,name:b,autoComplete:S,disabled:T,required:N,form:O}=l,w=qs(r),[C,H]=x.useState(null),[j,R]=x.useState(null),[k,V]=x.useState(!1),P=Vu(v),[$,Z]=Xi({prop:c,defaultProp:f??!1,onChange:m,caller:ka}),[ce,he]=Xi({prop:h,defaultProp:p,onChange:g,caller:ka}),ve=x.useRef(null),fe=C?O||!!C.closest("form"):!0,[pe,ye]=x.useState(new Set),re=Array.from(pe).map(D=>D.props.value).join(";");return u.jsx(ZS,{...w,children:u.jsxs(G2,{required:N,scope:r,trigger:C,onTriggerChange:H,valueNode:j,onValueNodeChange:R,valueNodeHasChildren:k,onValueNodeHasChildrenChange:V,contentId:$i(),value:ce,onValueChange:he,open:$,onOpenChange:Z,dir:P,triggerPointerDownPosRef:ve,disabled:T,children:[u.jsx(Hs.Provider,{scope:r,children:u.jsx(Y2,{scope:l.__scopeSelect,onNativeOptionAdd:x.useCallback(D=>{ye(K=>new Set(K).add(D))},[]),onNativeOptionRemove:x.useCallback(D=>{ye(K=>{const q=new Set(K);return q.delete(D),q})},[]),children:o})}),fe?u.jsxs(Og,{"aria-hidden":!0,required:N,tabIndex:-1,name:b,autoComplete:S,value:ce,onChange:D=>he(D.target.value),disabled:T,form:O,children:[ce===void 0?u.jsx("option",{value:""}):null,Array.from(pe)]},re):null]})})};ug.displayName=ka;var fg="SelectTrigger",dg=x.forwardRef((l,r)=>{const{__scopeSelect:o,disabled:c=!1,...f}=l,m=qs(o),h=ua(fg,o),p=h.disabled||c,g=$e(r,h.onTriggerChange),v=Ls(o),b=x.useRef("touch"),[S,T,N]=zg(w=>{const C=v().filter(R=>!R.disabled),H=C.find(R=>R.value===h.value),j=Ug(C,w,H);j!==void 0&&h.onValueChange(j.value)}),O=w=>{p||(h.onOpenChange(!0),N()),w&&(h.triggerPointerDownPosRef.current={x:Math.round(w.pageX),y:Math.round(w.pageY)})};return u.jsx(KS,{asChild:!0,...m,children:u.jsx(Re.button,{type:"button",role:"combobox","aria-controls":h.contentId,"aria-expanded":h.open,"aria-required":h.required,"aria-autocomplete":"none",dir:h.dir,"data-state":h.open?"open":"closed",disabled:p,"data-disabled":p?"":void 0,"data-placeholder":Dg(h.value)?"":void 0,...f,ref:g,onClick:Oe(f.onClick,w=>{w.currentTarget.focus(),b.current!=="mouse"&&O(w)}),onPointerDown:Oe(f.onPointerDown,w=>{b.current=w.pointerType;const C=w.target;C.hasPointerCapture(w.pointerId)&&C.releasePointerCapture(w.pointerId),w.button===0&&w.ctrlKey===!1&&w.pointerType==="mouse"&&(O(w),w.preventDefault())}),onKeyDown:Oe(f.onKeyDown,w=>{const C=S.current!=="";!(w.ctrlKey||w.altKey||w.metaKey)&&w.key.length===1&&T(w.key),!(C&&w.key===" ")&&L2.includes(w.key)&&(O(),w.preventDefault())})})})});dg.displayName=fg;var mg="SelectValue",hg=x.forwardRef((l,r)=>{const{__scopeSelect:o,className:c,style:f,children:m,placeholder:h="",...p}=l,g=ua(mg,o),{onValueNodeHasChildrenChange:v}=g,b=m!==void 0,S=$e(r,g.onValueNodeChange);return yt(()=>{v(b)},[v,b]),u.jsx(Re.span,{...p,ref:S,style:{pointerEvents:"none"},children:Dg(g.value)?u.jsx(u.Fragment,{children:h}):m})});hg.displayName=mg;var Q2="SelectIcon",vg=x.forwardRef((l,r)=>{const{__scopeSelect:o,children:c,...f}=l;return u.jsx(Re.span,{"aria-hidden":!0,...f,ref:r,children:c||"▼"})});vg.displayName=Q2;var Z2="SelectPortal",pg=l=>u.jsx(Fp,{asChild:!0,...l});pg.displayName=Z2;var Ha="SelectContent",gg=x.forwardRef((l,r)=>{const o=ua(Ha,l.__scopeSelect),[c,f]=x.useState();if(yt(()=>{f(new DocumentFragment)},[]),!o.open){const m=c;return m?Ji.createPortal(u.jsx(yg,{scope:l.__scopeSelect,children:u.jsx(Hs.Slot,{scope:l.__scopeSelect,children:u.jsx("div",{children:l.children})})}),m):null}return u.jsx(bg,{...l,ref:r})});gg.displayName=Ha;var Wt=10,[yg,fa]=Bl(Ha),K2="SelectContentImpl",J2=Yi("SelectContent.RemoveScroll"),bg=x.forwardRef((l,r)=>{const{__scopeSelect:o,position:c="item-aligned",onCloseAutoFocus:f,onEscapeKeyDown:m,onPointerDownOutside:h,side:p,sideOffset:g,align:v,alignOffset:b,arrowPadding:S,collisionBoundary:T,collisionPadding:N,sticky:O,hideWhenDetached:w,avoidCollisions:C,...H}=l,j=ua(Ha,o),[R,k]=x.useState(null),[V,P]=x.useState(null),$=$e(r,F=>k(F)),[Z,ce]=x.useState(null),[he,ve]=x.useState(null),fe=Ls(o),[pe,ye]=x.useState(!1),re=x.useRef(!1);x.useEffect(()=>{if(R)return n2(R)},[R]),D1();const D=x.useCallback(F=>{const[se,...Me]=fe().map(Ee=>Ee.ref.current),[Ne]=Me.slice(-1),we=document.activeElement;for(const Ee of F)if(Ee===we||(Ee==null||Ee.scrollIntoView({block:"nearest"}),Ee===se&&V&&(V.scrollTop=0),Ee===Ne&&V&&(V.scrollTop=V.scrollHeight),Ee==null||Ee.focus(),document.activeElement!==we))return},[fe,V]),K=x.useCallback(()=>D([Z,R]),[D,Z,R]);x.useEffect(()=>{pe&&K()},[pe,K]);const{onOpenChange:q,triggerPointerDownPosRef:ae}=j;x.useEffect(()=>{if(R){let F={x:0,y:0};const se=Ne=>{var we,Ee;F={x:Math.abs(Math.round(Ne.pageX)-(((we=ae.current)==null?void 0:we.x)??0)),y:Math.abs(Math.round(Ne.pageY)-(((Ee=ae.current)==null?void 0:Ee.y)??0))}},Me=Ne=>{F.x<=10&&F.y<=10?Ne.preventDefault():R.contains(Ne.target)||q(!1),document.removeEventListener("pointermove",se),ae.current=null};return ae.current!==null&&(document.addEventListener("pointermove",se),document.addEventListener("pointerup",Me,{capture:!0,once:!0})),()=>{document.removeEventListener("pointermove",se),document.removeEventListener("pointerup",Me,{capture:!0})}}},[R,q,ae]),x.useEffect(()=>{const F=()=>q(!1);return window.addEventListener("blur",F),window.addEventListener("resize",F),()=>{window.removeEventListener("blur",F),window.removeEventListener("resize",F)}},[q]);const[A,Y]=zg(F=>{const se=fe().filter(we=>!we.disabled),Me=se.find(we=>we.ref.current===document.activeElement),Ne=Ug(se,F,Me);Ne&&setTimeout(()=>Ne.ref.current.focus())}),W=x.useCallback((F,se,Me)=>{const Ne=!re.current&&!Me;(j.value!==void 0&&j.value===se||Ne)&&(ce(F),Ne&&(re.current=!0))},[j.value]),J=x.useCallback(()=>R==null?void 0:R.focus(),[R]),I=x.useCallback((F,se,Me)=>{const Ne=!re.current&&!Me;(j.value!==void 0&&j.value===se||Ne)&&ve(F)},[j.value]),me=c==="popper"?Du:xg,ie=me===Du?{side:p,sideOffset:g,align:v,alignOffset:b,arrowPadding:S,collisionBoundary:T,collisionPadding:N,sticky:O,hideWhenDetached:w,avoidCollisions:C}:{};return u.jsx(yg,{scope:o,content:R,viewport:V,onViewportChange:P,itemRefCallback:W,selectedItem:Z,onItemLeave:J,itemTextRefCallback:I,focusSelectedItem:K,selectedItemText:he,position:c,isPositioned:pe,searchRef:A,children:u.jsx(og,{as:J2,allowPinchZoom:!0,children:u.jsx(_p,{asChild:!0,trapped:j.open,onMountAutoFocus:F=>{F.preventDefault()},onUnmountAutoFocus:Oe(f,F=>{var se;(se=j.trigger)==null||se.focus({preventScroll:!0}),F.preventDefault()}),children:u.jsx(Np,{asChild:!0,disableOutsidePointerEvents:!0,onEscapeKeyDown:m,onPointerDownOutside:h,onFocusOutside:F=>F.preventDefault(),onDismiss:()=>j.onOpenChange(!1),children:u.jsx(me,{role:"listbox",id:j.contentId,"data-state":j.open?"open":"closed",dir:j.dir,onContextMenu:F=>F.preventDefault(),...H,...ie,onPlaced:()=>ye(!0),ref:$,style:{display:"flex",flexDirection:"column",outline:"none",...H.style},onKeyDown:Oe(H.onKeyDown,F=>{const se=F.ctrlKey||F.altKey||F.metaKey;if(F.key==="Tab"&&F.preventDefault(),!se&&F.key.length===1&&Y(F.key),["ArrowUp","ArrowDown","Home","End"].includes(F.key)){let Ne=fe().filter(we=>!we.disabled).map(we=>we.ref.current);if(["ArrowUp","End"].includes(F.key)&&(Ne=Ne.slice().reverse()),["ArrowUp","ArrowDown"].includes(F.key)){const we=F.target,Ee=Ne.indexOf(we);Ne=Ne.slice(Ee+1)}setTimeout(()=>D(Ne)),F.preventDefault()}})})})})})})});bg.displayName=K2;var $2="SelectItemAlignedPosition",xg=x.forwardRef((l,r)=>{const{__scopeSelect:o,onPlaced:c,...f}=l,m=ua(Ha,o),h=fa(Ha,o),[p,g]=x.useState(null),[v,b]=x.useState(null),S=$e(r,$=>b($)),T=Ls(o),N=x.useRef(!1),O=x.useRef(!0),{viewport:w,selectedItem:C,selectedItemText:H,focusSelectedItem:j}=h,R=x.useCallback(()=>{if(m.trigger&&m.valueNode&&p&&v&&w&&C&&H){const $=m.trigger.getBoundingClientRect(),Z=v.getBoundingClientRect(),ce=m.valueNode.getBoundingClientRect(),he=H.getBoundingClientRect();if(m.dir!=="rtl"){const we=he.left-Z.left,Ee=ce.left-we,ot=$.left-Ee,xt=$.width+ot,da=Math.max(xt,Z.width),ma=window.innerWidth-Wt,mt=gv(Ee,[Wt,Math.max(Wt,ma-da)]);p.style.minWidth=xt+"px",p.style.left=mt+"px"}else{const we=Z.right-he.right,Ee=window.innerWidth-ce.right-we,ot=window.innerWidth-$.right-Ee,xt=$.width+ot,da=Math.max(xt,Z.width),ma=window.innerWidth-Wt,mt=gv(Ee,[Wt,Math.max(Wt,ma-da)]);p.style.minWidth=xt+"px",p.style.right=mt+"px"}const ve=T(),fe=window.innerHeight-Wt*2,pe=w.scrollHeight,ye=window.getComputedStyle(v),re=parseInt(ye.borderTopWidth,10),D=parseInt(ye.paddingTop,10),K=parseInt(ye.borderBottomWidth,10),q=parseInt(ye.paddingBottom,10),ae=re+D+pe+q+K,A=Math.min(C.offsetHeight*5,ae),Y=window.getComputedStyle(w),W=parseInt(Y.paddingTop,10),J=parseInt(Y.paddingBottom,10),I=$.top+$.height/2-Wt,me=fe-I,ie=C.offsetHeight/2,F=C.offsetTop+ie,se=re+D+F,Me=ae-se;if(se<=I){const we=ve.length>0&&C===ve[ve.length-1].ref.current;p.style.bottom="0px";const Ee=v.clientHeight-w.offsetTop-w.offsetHeight,ot=Math.max(me,ie+(we?J:0)+Ee+K),xt=se+ot;p.style.height=xt+"px"}else{const we=ve.length>0&&C===ve[0].ref.current;p.style.top="0px";const ot=Math.max(I,re+w.offsetTop+(we?W:0)+ie)+Me;p.style.height=ot+"px",w.scrollTop=se-I+w.offsetTop}p.style.margin=`${Wt}px 0`,p.style.minHeight=A+"px",p.style.maxHeight=fe+"px",c==null||c(),requestAnimationFrame(()=>N.current=!0)}},[T,m.trigger,m.valueNode,p,v,w,C,H,m.dir,c]);yt(()=>R(),[R]);const[k,V]=x.useState();yt(()=>{v&&V(window.getComputedStyle(v).zIndex)},[v]);const P=x.useCallback($=>{$&&O.current===!0&&(R(),j==null||j(),O.current=!1)},[R,j]);return u.jsx(W2,{scope:o,contentWrapper:p,shouldExpandOnScrollRef:N,onScrollButtonChange:P,children:u.jsx("div",{ref:g,style:{display:"flex",flexDirection:"column",position:"fixed",zIndex:k},children:u.jsx(Re.div,{...f,ref:S,style:{boxSizing:"border-box",maxHeight:"100%",...f.style}})})})});xg.displayName=$2;var P2="SelectPopperPosition",Du=x.forwardRef((l,r)=>{const{__scopeSelect:o,align:c="start",collisionPadding:f=Wt,...m}=l,h=qs(o);return u.jsx(JS,{...h,...m,ref:r,align:c,collisionPadding:f,style:{boxSizing:"border-box",...m.style,"--radix-select-content-transform-origin":"var(--radix-popper-transform-origin)","--radix-select-content-available-width":"var(--radix-popper-available-width)","--radix-select-content-available-height":"var(--radix-popper-available-height)","--radix-select-trigger-width":"var(--radix-popper-anchor-width)","--radix-select-trigger-height":"var(--radix-popper-anchor-height)"}})});Du.displayName=P2;var[W2,tf]=Bl(Ha,{}),zu="SelectViewport",Sg=x.forwardRef((l,r)=>{const{__scopeSelect:o,nonce:c,...f}=l,m=fa(zu,o),h=tf(zu,o),p=$e(r,m.onViewportChange),g=x.useRef(0);return u.jsxs(u.Fragment,{children:[u.jsx("style",{dangerouslySetInnerHTML:{__html:"[data-radix-select-viewport]{scrollbar-width:none;-ms-overflow-style:none;-webkit-overflow-scrolling:touch;}[data-radix-select-viewport]::-webkit-scrollbar{display:none}"},nonce:c}),u.jsx(Hs.Slot,{scope:o,children:u.jsx(Re.div,{"data-radix-select-viewport":"",role:"presentation",...f,ref:p,style:{position:"relative",flex:1,overflow:"hidden auto",...f.style},onScroll:Oe(f.onScroll,v=>{const b=v.currentTarget,{contentWrapper:S,shouldExpandOnScrollRef:T}=h;if(T!=null&&T.current&&S){const N=Math.abs(g.current-b.scrollTop);if(N>0){const O=window.innerHeight-Wt*2,w=parseFloat(S.style.minHeight),C=parseFloat(S.style.height),H=Math.max(w,C);if(H<O){const j=H+N,R=Math.min(O,j),k=j-R;S.style.height=R+"px",S.style.bottom==="0px"&&(b.scrollTop=k>0?k:0,S.style.justifyContent="flex-end")}}}g.current=b.scrollTop})})})]})});Sg.displayName=zu;var wg="SelectGroup",[F2,I2]=Bl(wg),ew=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=$i();return u.jsx(F2,{scope:o,id:f,children:u.jsx(Re.div,{role:"group","aria-labelledby":f,...c,ref:r})})});ew.displayName=wg;var Eg="SelectLabel",tw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=I2(Eg,o);return u.jsx(Re.div,{id:f.id,...c,ref:r})});tw.displayName=Eg;var Ms="SelectItem",[nw,Ag]=Bl(Ms),Tg=x.forwardRef((l,r)=>{const{__scopeSelect:o,value:c,disabled:f=!1,textValue:m,...h}=l,p=ua(Ms,o),g=fa(Ms,o),v=p.value===c,[b,S]=x.useState(m??""),[T,N]=x.useState(!1),O=$e(r,j=>{var R;return(R=g.itemRefCallback)==null?void 0:R.call(g,j,c,f)}),w=$i(),C=x.useRef("touch"),H=()=>{f||(p.onValueChange(c),p.onOpenChange(!1))};if(c==="")throw new Error("A <Select.Item /> must have a value prop that is not an empty string. This is because the Select value can be set to an empty string to clear the selection and show the placeholder.");return u.jsx(nw,{scope:o,value:c,disabled:f,textId:w,isSelected:v,onItemTextChange:x.useCallback(j=>{S(R=>R||((j==null?void 0:j.textContent)??"").trim())},[]),children:u.jsx(Hs.ItemSlot,{scope:o,value:c,disabled:f,textValue:b,children:u.jsx(Re.div,{role:"option","aria-labelledby":w,"data-highlighted":T?"":void 0,"aria-selected":v&&T,"data-state":v?"checked":"unchecked","aria-disabled":f||void 0,"data-disabled":f?"":void 0,tabIndex:f?void 0:-1,...h,ref:O,onFocus:Oe(h.onFocus,()=>N(!0)),onBlur:Oe(h.onBlur,()=>N(!1)),onClick:Oe(h.onClick,()=>{C.current!=="mouse"&&H()}),onPointerUp:Oe(h.onPointerUp,()=>{C.current==="mouse"&&H()}),onPointerDown:Oe(h.onPointerDown,j=>{C.current=j.pointerType}),onPointerMove:Oe(h.onPointerMove,j=>{var R;C.current=j.pointerType,f?(R=g.onItemLeave)==null||R.call(g):C.current==="mouse"&&j.currentTarget.focus({preventScroll:!0})}),onPointerLeave:Oe(h.onPointerLeave,j=>{var R;j.currentTarget===document.activeElement&&((R=g.onItemLeave)==null||R.call(g))}),onKeyDown:Oe(h.onKeyDown,j=>{var k;((k=g.searchRef)==null?void 0:k.current)!==""&&j.key===" "||(q2.includes(j.key)&&H(),j.key===" "&&j.preventDefault())})})})})});Tg.displayName=Ms;var Gi="SelectItemText",Ng=x.forwardRef((l,r)=>{const{__scopeSelect:o,className:c,style:f,...m}=l,h=ua(Gi,o),p=fa(Gi,o),g=Ag(Gi,o),v=X2(Gi,o),[b,S]=x.useState(null),T=$e(r,H=>S(H),g.onItemTextChange,H=>{var j;return(j=p.itemTextRefCallback)==null?void 0:j.call(p,H,g.value,g.disabled)}),N=b==null?void 0:b.textContent,O=x.useMemo(()=>u.jsx("option",{value:g.value,disabled:g.disabled,children:N},g.value),[g.disabled,g.value,N]),{onNativeOptionAdd:w,onNativeOptionRemove:C}=v;return yt(()=>(w(O),()=>C(O)),[w,C,O]),u.jsxs(u.Fragment,{children:[u.jsx(Re.span,{id:g.textId,...m,ref:T}),g.isSelected&&h.valueNode&&!h.valueNodeHasChildren?Ji.createPortal(m.children,h.valueNode):null]})});Ng.displayName=Gi;var jg="SelectItemIndicator",_g=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l;return Ag(jg,o).isSelected?u.jsx(Re.span,{"aria-hidden":!0,...c,ref:r}):null});_g.displayName=jg;var Uu="SelectScrollUpButton",Cg=x.forwardRef((l,r)=>{const o=fa(Uu,l.__scopeSelect),c=tf(Uu,l.__scopeSelect),[f,m]=x.useState(!1),h=$e(r,c.onScrollButtonChange);return yt(()=>{if(o.viewport&&o.isPositioned){let p=function(){const v=g.scrollTop>0;m(v)};const g=o.viewport;return p(),g.addEventListener("scroll",p),()=>g.removeEventListener("scroll",p)}},[o.viewport,o.isPositioned]),f?u.jsx(Mg,{...l,ref:h,onAutoScroll:()=>{const{viewport:p,selectedItem:g}=o;p&&g&&(p.scrollTop=p.scrollTop-g.offsetHeight)}}):null});Cg.displayName=Uu;var Bu="SelectScrollDownButton",Rg=x.forwardRef((l,r)=>{const o=fa(Bu,l.__scopeSelect),c=tf(Bu,l.__scopeSelect),[f,m]=x.useState(!1),h=$e(r,c.onScrollButtonChange);return yt(()=>{if(o.viewport&&o.isPositioned){let p=function(){const v=g.scrollHeight-g.clientHeight,b=Math.ceil(g.scrollTop)<v;m(b)};const g=o.viewport;return p(),g.addEventListener("scroll",p),()=>g.removeEventListener("scroll",p)}},[o.viewport,o.isPositioned]),f?u.jsx(Mg,{...l,ref:h,onAutoScroll:()=>{const{viewport:p,selectedItem:g}=o;p&&g&&(p.scrollTop=p.scrollTop+g.offsetHeight)}}):null});Rg.displayName=Bu;var Mg=x.forwardRef((l,r)=>{const{__scopeSelect:o,onAutoScroll:c,...f}=l,m=fa("SelectScrollButton",o),h=x.useRef(null),p=Ls(o),g=x.useCallback(()=>{h.current!==null&&(window.clearInterval(h.current),h.current=null)},[]);return x.useEffect(()=>()=>g(),[g]),yt(()=>{var b;const v=p().find(S=>S.ref.current===document.activeElement);(b=v==null?void 0:v.ref.current)==null||b.scrollIntoView({block:"nearest"})},[p]),u.jsx(Re.div,{"aria-hidden":!0,...f,ref:r,style:{flexShrink:0,...f.style},onPointerDown:Oe(f.onPointerDown,()=>{h.current===null&&(h.current=window.setInterval(c,50))}),onPointerMove:Oe(f.onPointerMove,()=>{var v;(v=m.onItemLeave)==null||v.call(m),h.current===null&&(h.current=window.setInterval(c,50))}),onPointerLeave:Oe(f.onPointerLeave,()=>{g()})})}),aw="SelectSeparator",lw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l;return u.jsx(Re.div,{"aria-hidden":!0,...c,ref:r})});lw.displayName=aw;var ku="SelectArrow",iw=x.forwardRef((l,r)=>{const{__scopeSelect:o,...c}=l,f=qs(o),m=ua(ku,o),h=fa(ku,o);return m.open&&h.position==="popper"?u.jsx($S,{...f,...c,ref:r}):null});iw.displayName=ku;var rw="SelectBubbleInput",Og=x.forwardRef(({__scopeSelect:l,value:r,...o},c)=>{const f=x.useRef(null),m=$e(c,f),h=Ip(r);return x.useEffect(()=>{const p=f.current;if(!p)return;const g=window.HTMLSelectElement.prototype,b=Object.getOwnPropertyDescriptor(g,"value").set;if(h!==r&&b){const S=new Event("change",{bubbles:!0});b.call(p,r),p.dispatchEvent(S)}},[h,r]),u.jsx(Re.select,{...o,style:{...eg,...o.style},ref:m,defaultValue:r})});Og.displayName=rw;function Dg(l){return l===""||l===void 0}function zg(l){const r=ra(l),o=x.useRef(""),c=x.useRef(0),f=x.useCallback(h=>{const p=o.current+h;r(p),function g(v){o.current=v,window.clearTimeout(c.current),v!==""&&(c.current=window.setTimeout(()=>g(""),1e3))}(p)},[r]),m=x.useCallback(()=>{o.current="",window.clearTimeout(c.current)},[]);return x.useEffect(()=>()=>window.clearTimeout(c.current),[]),[o,f,m]}function Ug(l,r,o){const f=r.length>1&&Array.from(r).every(v=>v===r[0])?r[0]:r,m=o?l.indexOf(o):-1;let h=sw(l,Math.max(m,0));f.length===1&&(h=h.filter(v=>v!==o));const g=h.find(v=>v.textValue.toLowerCase().startsWith(f.toLowerCase()));return g!==o?g:void 0}function sw(l,r){return l.map((o,c)=>l[(r+c)%l.length])}var cw=ug,ow=dg,uw=hg,fw=vg,dw=pg,mw=gg,hw=Sg,vw=Tg,pw=Ng,gw=_g,yw=Cg,bw=Rg;function kl({...l}){return u.jsx(cw,{"data-slot":"select",...l})}function Hl({...l}){return u.jsx(uw,{"data-slot":"select-value",...l})}function Ll({className:l,size:r="default",children:o,...c}){return u.jsxs(ow,{"data-slot":"select-trigger","data-size":r,className:Xe("border-input data-[placeholder]:text-muted-foreground [&_svg:not([class*='text-'])]:text-muted-foreground focus-visible:border-ring focus-visible:ring-ring/50 aria-invalid:ring-destructive/20 dark:aria-invalid:ring-destructive/40 aria-invalid:border-destructive dark:bg-input/30 dark:hover:bg-input/50 flex w-fit items-center justify-between gap-2 rounded-md border bg-transparent px-3 py-2 text-sm whitespace-nowrap shadow-xs transition-[color,box-shadow] outline-none focus-visible:ring-[3px] disabled:cursor-not-allowed disabled:opacity-50 data-[size=default]:h-9 data-[size=sm]:h-8 *:data-[slot=select-value]:line-clamp-1 *:data-[slot=select-value]:flex *:data-[slot=select-value]:items-center *:data-[slot=select-value]:gap-2 [&_svg]:pointer-events-none [&_svg]:shrink-0 [&_svg:not([class*='size-'])]:size-4",l),...c,children:[o,u.jsx(fw,{asChild:!0,children:u.jsx(Ep,{className:"size-4 opacity-50"})})]})}function ql({className:l,children:r,position:o="popper",...c}){return u.jsx(dw,{children:u.jsxs(mw,{"data-slot":"select-content",className:Xe("bg-popover text-popover-foreground data-[state=open]:animate-in data-[state=closed]:animate-out data-[state=closed]:fade-out-0 data-[state=open]:fade-in-0 data-[state=closed]:zoom-out-95 data-[state=open]:zoom-in-95 data-[side=bottom]:slide-in-from-top-2 data-[side=left]:slide-in-from-right-2 data-[side=right]:slide-in-from-left-2 data-[side=top]:slide-in-from-bottom-2 relative z-50 max-h-(--radix-select-content-available-height) min-w-[8rem] origin-(--radix-select-content-transform-origin) overflow-x-hidden overflow-y-auto rounded-md border shadow-md",o==="popper"&&"data-[side=bottom]:translate-y-1 data-[side=left]:-translate-x-1 data-[side=right]:translate-x-1 data-[side=top]:-translate-y-1",l),position:o,...c,children:[u.jsx(xw,{}),u.jsx(hw,{className:Xe("p-1",o==="popper"&&"h-[var(--radix-select-trigger-height)] w-full min-w-[var(--radix-select-trigger-width)] scroll-my-1"),children:r}),u.jsx(Sw,{})]})})}function Ye({className:l,children:r,...o}){return u.jsxs(vw,{"data-slot":"select-item",className:Xe("focus:bg-accent focus:text-accent-foreground [&_svg:not([class*='text-'])]:text-muted-foreground relative flex w-full cursor-default items-center gap-2 rounded-sm py-1.5 pr-8 pl-2 text-sm outline-hidden select-none data-[disabled]:pointer-events-none data-[disabled]:opacity-50 [&_svg]:pointer-events-none [&_svg]:shrink-0 [&_svg:not([class*='size-'])]:size-4 *:[span]:last:flex *:[span]:last:items-center *:[span]:last:gap-2",l),...o,children:[u.jsx("span",{className:"absolute right-2 flex size-3.5 items-center justify-center",children:u.jsx(gw,{children:u.jsx(Xx,{className:"size-4"})})}),u.jsx(pw,{children:r})]})}function xw({className:l,...r}){return u.jsx(yw,{"data-slot":"select-scroll-up-button",className:Xe("flex cursor-default items-center justify-center py-1",l),...r,children:u.jsx(Kx,{className:"size-4"})})}function Sw({className:l,...r}){return u.jsx(bw,{"data-slot":"select-scroll-down-button",className:Xe("flex cursor-default items-center justify-center py-1",l),...r,children:u.jsx(Ep,{className:"size-4"})})}var Vs="Switch",[ww,Kw]=Dl(Vs),[Ew,Aw]=ww(Vs),Bg=x.forwardRef((l,r)=>{const{__scopeSwitch:o,name:c,checked:f,defaultChecked:m,required:h,disabled:p,value:g="on",onCheckedChange:v,form:b,...S}=l,[T,N]=x.useState(null),O=$e(r,R=>N(R)),w=x.useRef(!1),C=T?b||!!T.closest("form"):!0,[H,j]=Xi({prop:f,defaultProp:m??!1,onChange:v,caller:Vs});return u.jsxs(Ew,{scope:o,checked:H,disabled:p,children:[u.jsx(Re.button,{type:"button",role:"switch","aria-checked":H,"aria-required":h,"data-state":qg(H),"data-disabled":p?"":void 0,disabled:p,value:g,...S,ref:O,onClick:Oe(l.onClick,R=>{j(k=>!k),C&&(w.current=R.isPropagationStopped(),w.current||R.stopPropagation())})}),C&&u.jsx(Lg,{control:T,bubbles:!w.current,name:c,value:g,checked:H,required:h,disabled:p,form:b,style:{transform:"translateX(-100%)"}})]})});Bg.displayName=Vs;var kg="SwitchThumb",Hg=x.forwardRef((l,r)=>{const{__scopeSwitch:o,...c}=l,f=Aw(kg,o);return u.jsx(Re.span,{"data-state":qg(f.checked),"data-disabled":f.disabled?"":void 0,...c,ref:r})});Hg.displayName=kg;var Tw="SwitchBubbleInput",Lg=x.forwardRef(({__scopeSwitch:l,control:r,checked:o,bubbles:c=!0,...f},m)=>{const h=x.useRef(null),p=$e(h,m),g=Ip(o),v=Vp(r);return x.useEffect(()=>{const b=h.current;if(!b)return;const S=window.HTMLInputElement.prototype,N=Object.getOwnPropertyDescriptor(S,"checked").set;if(g!==o&&N){const O=new Event("click",{bubbles:c});N.call(b,o),b.dispatchEvent(O)}},[g,o,c]),u.jsx("input",{type:"checkbox","aria-hidden":!0,defaultChecked:o,...f,tabIndex:-1,ref:p,style:{...f.style,...v,position:"absolute",pointerEvents:"none",opacity:0,margin:0}})});Lg.displayName=Tw;function qg(l){return l?"checked":"unchecked"}var Nw=Bg,jw=Hg;function Gs({className:l,...r}){return u.jsx(Nw,{"data-slot":"switch",className:Xe("peer data-[state=checked]:bg-primary data-[state=unchecked]:bg-input focus-visible:border-ring focus-visible:ring-ring/50 dark:data-[state=unchecked]:bg-input/80 inline-flex h-[1.15rem] w-8 shrink-0 items-center rounded-full border border-transparent shadow-xs transition-all outline-none focus-visible:ring-[3px] disabled:cursor-not-allowed disabled:opacity-50",l),...r,children:u.jsx(jw,{"data-slot":"switch-thumb",className:Xe("bg-background dark:data-[state=unchecked]:bg-foreground dark:data-[state=checked]:bg-primary-foreground pointer-events-none block size-4 rounded-full ring-0 transition-transform data-[state=checked]:translate-x-[calc(100%-2px)] data-[state=unchecked]:translate-x-0")})})}const xs="http://localhost:5000/api",_w=["comunidade","comunicação","ações sociais","periferias","publicidade inclusiva","diversidade","inclusão social","responsabilidade social","terceiro setor","voluntariado","sustentabilidade","direitos humanos"];function Cw({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState({topic_name:"",priority:3,avoid:!1});x.useEffect(()=>{S()},[]);const S=async()=>{try{const j=await fetch(`${xs}/topics`,{credentials:"include"});if(j.ok){const R=await j.json();o(R)}}catch{h("Erro ao carregar tópicos")}},T=async j=>{if(j.preventDefault(),!!v.topic_name.trim()){f(!0);try{const R=await fetch(`${xs}/topics`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(v)});if(R.ok)b({topic_name:"",priority:3,avoid:!1}),S(),l==null||l();else{const k=await R.json();h(k.error||"Erro ao adicionar tópico")}}catch{h("Erro de conexão")}finally{f(!1)}}},N=async(j,R)=>{try{(await fetch(`${xs}/topics/${j}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(R)})).ok?(g(null),S(),l==null||l()):h("Erro ao atualizar tópico")}catch{h("Erro de conexão")}},O=async j=>{if(confirm("Tem certeza que deseja excluir este tópico?"))try{(await fetch(`${xs}/topics/${j}`,{method:"DELETE",credentials:"include"})).ok?(S(),l==null||l()):h("Erro ao excluir tópico")}catch{h("Erro de conexão")}},w=j=>{b({...v,topic_name:j})},C=j=>({1:"Muito Alta",2:"Alta",3:"Média",4:"Baixa",5:"Muito Baixa"})[j]||"Média",H=j=>({1:"bg-red-100 text-red-800",2:"bg-orange-100 text-orange-800",3:"bg-yellow-100 text-yellow-800",4:"bg-blue-100 text-blue-800",5:"bg-gray-100 text-gray-800"})[j]||"bg-yellow-100 text-yellow-800";return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(Nu,{className:"h-5 w-5 mr-2"}),"Gerenciar Tópicos de Interesse"]}),u.jsx(ia,{children:"Configure os tópicos que o agente deve buscar ou evitar nas notícias"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:T,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"topic-name",children:"Nome do Tópico"}),u.jsx(gt,{id:"topic-name",placeholder:"Ex: comunidade, ações sociais...",value:v.topic_name,onChange:j=>b({...v,topic_name:j.target.value}),required:!0})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"priority",children:"Prioridade"}),u.jsxs(kl,{value:v.priority.toString(),onValueChange:j=>b({...v,priority:parseInt(j)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]})]}),u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{id:"avoid",checked:v.avoid,onCheckedChange:j=>b({...v,avoid:j})}),u.jsx(Je,{htmlFor:"avoid",children:"Evitar"})]})]}),u.jsxs(qe,{type:"submit",disabled:c,children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Tópico"]})]}),u.jsxs("div",{className:"mb-6",children:[u.jsx(Je,{className:"text-sm font-medium mb-2 block",children:"Tópicos Sugeridos:"}),u.jsx("div",{className:"flex flex-wrap gap-2",children:_w.filter(j=>!r.some(R=>R.topic_name.toLowerCase()===j.toLowerCase())).map(j=>u.jsxs(sa,{variant:"outline",className:"cursor-pointer hover:bg-blue-50",onClick:()=>w(j),children:[u.jsx(Qi,{className:"h-3 w-3 mr-1"}),j]},j))})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(Nu,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhum tópico configurado ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione tópicos para começar a receber notícias relevantes"})]}):r.map(j=>u.jsx(Rw,{topic:j,isEditing:p===j.id,onEdit:()=>g(j.id),onCancelEdit:()=>g(null),onUpdate:N,onDelete:O,getPriorityLabel:C,getPriorityColor:H},j.id))})]})]})})}function Rw({topic:l,isEditing:r,onEdit:o,onCancelEdit:c,onUpdate:f,onDelete:m,getPriorityLabel:h,getPriorityColor:p}){const[g,v]=x.useState(l);x.useEffect(()=>{v(l)},[l]);const b=()=>{f(l.id,g)};return r?u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsx("div",{className:"md:col-span-2",children:u.jsx(gt,{value:g.topic_name,onChange:S=>v({...g,topic_name:S.target.value}),placeholder:"Nome do tópico"})}),u.jsxs(kl,{value:g.priority.toString(),onValueChange:S=>v({...g,priority:parseInt(S)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]}),u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{checked:g.avoid,onCheckedChange:S=>v({...g,avoid:S})}),u.jsx(Je,{children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:b,children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})]})})}):u.jsx(st,{className:l.avoid?"border-red-200 bg-red-50":"",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx("span",{className:"font-medium",children:l.topic_name}),u.jsx(sa,{className:p(l.priority),children:h(l.priority)}),l.avoid&&u.jsx(sa,{variant:"destructive",children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:o,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>m(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}const Ss="http://localhost:5000/api",Mw=["folha.uol.com.br","g1.globo.com","estadao.com.br","uol.com.br","bbc.com","cnn.com.br","cartacapital.com.br","brasil247.com","nexojornal.com.br","agenciabrasil.ebc.com.br","huffpostbrasil.com","theintercept.com/brasil"];function Ow({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState({source_name:"",priority:3,avoid:!1});x.useEffect(()=>{S()},[]);const S=async()=>{try{const j=await fetch(`${Ss}/sources`,{credentials:"include"});if(j.ok){const R=await j.json();o(R)}}catch{h("Erro ao carregar fontes")}},T=async j=>{if(j.preventDefault(),!!v.source_name.trim()){f(!0);try{const R=await fetch(`${Ss}/sources`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(v)});if(R.ok)b({source_name:"",priority:3,avoid:!1}),S(),l==null||l();else{const k=await R.json();h(k.error||"Erro ao adicionar fonte")}}catch{h("Erro de conexão")}finally{f(!1)}}},N=async(j,R)=>{try{(await fetch(`${Ss}/sources/${j}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(R)})).ok?(g(null),S(),l==null||l()):h("Erro ao atualizar fonte")}catch{h("Erro de conexão")}},O=async j=>{if(confirm("Tem certeza que deseja excluir esta fonte?"))try{(await fetch(`${Ss}/sources/${j}`,{method:"DELETE",credentials:"include"})).ok?(S(),l==null||l()):h("Erro ao excluir fonte")}catch{h("Erro de conexão")}},w=j=>{b({...v,source_name:j})},C=j=>({1:"Muito Alta",2:"Alta",3:"Média",4:"Baixa",5:"Muito Baixa"})[j]||"Média",H=j=>({1:"bg-red-100 text-red-800",2:"bg-orange-100 text-orange-800",3:"bg-yellow-100 text-yellow-800",4:"bg-blue-100 text-blue-800",5:"bg-gray-100 text-gray-800"})[j]||"bg-yellow-100 text-yellow-800";return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(dv,{className:"h-5 w-5 mr-2"}),"Gerenciar Fontes de Notícias"]}),u.jsx(ia,{children:"Configure as fontes de notícias que devem ser priorizadas ou evitadas"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:T,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"source-name",children:"Nome da Fonte"}),u.jsx(gt,{id:"source-name",placeholder:"Ex: folha.uol.com.br, g1.globo.com...",value:v.source_name,onChange:j=>b({...v,source_name:j.target.value}),required:!0}),u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Use o domínio do site (ex: folha.uol.com.br)"})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"priority",children:"Prioridade"}),u.jsxs(kl,{value:v.priority.toString(),onValueChange:j=>b({...v,priority:parseInt(j)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]})]}),u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{id:"avoid",checked:v.avoid,onCheckedChange:j=>b({...v,avoid:j})}),u.jsx(Je,{htmlFor:"avoid",children:"Evitar"})]})]}),u.jsxs(qe,{type:"submit",disabled:c,children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Fonte"]})]}),u.jsxs("div",{className:"mb-6",children:[u.jsx(Je,{className:"text-sm font-medium mb-2 block",children:"Fontes Sugeridas:"}),u.jsx("div",{className:"flex flex-wrap gap-2",children:Mw.filter(j=>!r.some(R=>R.source_name.toLowerCase()===j.toLowerCase())).map(j=>u.jsxs(sa,{variant:"outline",className:"cursor-pointer hover:bg-blue-50",onClick:()=>w(j),children:[u.jsx(Qi,{className:"h-3 w-3 mr-1"}),j]},j))})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(dv,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhuma fonte configurada ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione fontes para personalizar a busca de notícias"})]}):r.map(j=>u.jsx(Dw,{source:j,isEditing:p===j.id,onEdit:()=>g(j.id),onCancelEdit:()=>g(null),onUpdate:N,onDelete:O,getPriorityLabel:C,getPriorityColor:H},j.id))})]})]})})}function Dw({source:l,isEditing:r,onEdit:o,onCancelEdit:c,onUpdate:f,onDelete:m,getPriorityLabel:h,getPriorityColor:p}){const[g,v]=x.useState(l);x.useEffect(()=>{v(l)},[l]);const b=()=>{f(l.id,g)},S=()=>{const T=l.source_name.startsWith("http")?l.source_name:`https://${l.source_name}`;window.open(T,"_blank")};return r?u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-4 gap-4",children:[u.jsx("div",{className:"md:col-span-2",children:u.jsx(gt,{value:g.source_name,onChange:T=>v({...g,source_name:T.target.value}),placeholder:"Nome da fonte"})}),u.jsxs(kl,{value:g.priority.toString(),onValueChange:T=>v({...g,priority:parseInt(T)}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"1",children:"Muito Alta"}),u.jsx(Ye,{value:"2",children:"Alta"}),u.jsx(Ye,{value:"3",children:"Média"}),u.jsx(Ye,{value:"4",children:"Baixa"}),u.jsx(Ye,{value:"5",children:"Muito Baixa"})]})]}),u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Gs,{checked:g.avoid,onCheckedChange:T=>v({...g,avoid:T})}),u.jsx(Je,{children:"Evitar"})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:b,children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})]})})}):u.jsx(st,{className:l.avoid?"border-red-200 bg-red-50":"",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx("span",{className:"font-medium",children:l.source_name}),u.jsx(sa,{className:p(l.priority),children:h(l.priority)}),l.avoid&&u.jsx(sa,{variant:"destructive",children:"Evitar"}),u.jsx(qe,{size:"sm",variant:"ghost",onClick:S,className:"h-6 w-6 p-0",children:u.jsx(Es,{className:"h-3 w-3"})})]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:o,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>m(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}const Vi="http://localhost:5000/api";function zw({onUpdate:l}){const[r,o]=x.useState([]),[c,f]=x.useState(!1),[m,h]=x.useState(""),[p,g]=x.useState(null),[v,b]=x.useState(null),[S,T]=x.useState({type:"whatsapp",address:""});x.useEffect(()=>{N()},[]);const N=async()=>{try{const k=await fetch(`${Vi}/recipients`,{credentials:"include"});if(k.ok){const V=await k.json();o(V)}}catch{h("Erro ao carregar destinatários")}},O=async k=>{if(k.preventDefault(),!!S.address.trim()){f(!0);try{const V=await fetch(`${Vi}/recipients`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(S)});if(V.ok)T({type:"whatsapp",address:""}),N(),l==null||l();else{const P=await V.json();h(P.error||"Erro ao adicionar destinatário")}}catch{h("Erro de conexão")}finally{f(!1)}}},w=async(k,V)=>{try{(await fetch(`${Vi}/recipients/${k}`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(V)})).ok?(g(null),N(),l==null||l()):h("Erro ao atualizar destinatário")}catch{h("Erro de conexão")}},C=async k=>{if(confirm("Tem certeza que deseja excluir este destinatário?"))try{(await fetch(`${Vi}/recipients/${k}`,{method:"DELETE",credentials:"include"})).ok?(N(),l==null||l()):h("Erro ao excluir destinatário")}catch{h("Erro de conexão")}},H=async k=>{b(k.id);try{const V=await fetch(`${Vi}/send-test-message`,{method:"POST",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify({recipient_address:k.address,recipient_type:k.type})}),P=await V.json();V.ok?alert("Mensagem de teste enviada com sucesso!"):alert(`Erro ao enviar mensagem: ${P.error}`)}catch{alert("Erro de conexão ao enviar mensagem de teste")}finally{b(null)}},j=(k,V)=>{if(V==="whatsapp"){const P=k.replace(/\D/g,"");return P.length===11?`(${P.slice(0,2)}) ${P.slice(2,7)}-${P.slice(7)}`:k}return k},R=(k,V)=>{if(V==="whatsapp"){const P=k.replace(/\D/g,"");return P.length>=10&&P.length<=15}else if(V==="email")return/^[^\s@]+@[^\s@]+\.[^\s@]+$/.test(k);return!0};return u.jsx("div",{className:"space-y-6",children:u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(ju,{className:"h-5 w-5 mr-2"}),"Gerenciar Destinatários"]}),u.jsx(ia,{children:"Configure os contatos que receberão o resumo diário de notícias"})]}),u.jsxs(ct,{children:[u.jsxs("form",{onSubmit:O,className:"space-y-4 mb-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-4",children:[u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"type",children:"Tipo"}),u.jsxs(kl,{value:S.type,onValueChange:k=>T({...S,type:k,address:""}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"whatsapp",children:"WhatsApp"}),u.jsx(Ye,{value:"email",children:"Email"})]})]})]}),u.jsxs("div",{className:"md:col-span-2",children:[u.jsx(Je,{htmlFor:"address",children:S.type==="whatsapp"?"Número do WhatsApp":"Endereço de Email"}),u.jsx(gt,{id:"address",type:S.type==="email"?"email":"tel",placeholder:S.type==="whatsapp"?"Ex: (11) 99999-9999":"Ex: usuario@email.com",value:S.address,onChange:k=>T({...S,address:k.target.value}),required:!0}),S.type==="whatsapp"&&u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Inclua o código do país (ex: +55 para Brasil)"})]})]}),u.jsxs(qe,{type:"submit",disabled:c||!R(S.address,S.type),children:[u.jsx(Qi,{className:"h-4 w-4 mr-2"}),"Adicionar Destinatário"]})]}),m&&u.jsxs(Ft,{variant:"destructive",className:"mb-4",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:m})]}),u.jsx("div",{className:"space-y-3",children:r.length===0?u.jsxs("div",{className:"text-center py-8 text-gray-500",children:[u.jsx(ju,{className:"h-12 w-12 mx-auto mb-4 text-gray-300"}),u.jsx("p",{children:"Nenhum destinatário configurado ainda"}),u.jsx("p",{className:"text-sm",children:"Adicione contatos para receber o resumo diário"})]}):r.map(k=>u.jsx(Uw,{recipient:k,isEditing:p===k.id,isTesting:v===k.id,onEdit:()=>g(k.id),onCancelEdit:()=>g(null),onUpdate:w,onDelete:C,onTest:H,formatAddress:j,validateAddress:R},k.id))})]})]})})}function Uw({recipient:l,isEditing:r,isTesting:o,onEdit:c,onCancelEdit:f,onUpdate:m,onDelete:h,onTest:p,formatAddress:g,validateAddress:v}){const[b,S]=x.useState(l);x.useEffect(()=>{S(l)},[l]);const T=()=>{v(b.address,b.type)&&m(l.id,b)},N=C=>C==="whatsapp"?s1:i1,O=C=>C==="whatsapp"?u.jsx(sa,{className:"bg-green-100 text-green-800",children:"WhatsApp"}):u.jsx(sa,{className:"bg-blue-100 text-blue-800",children:"Email"});if(r)return u.jsx(st,{className:"border-blue-200",children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-4",children:[u.jsx("div",{children:u.jsxs(kl,{value:b.type,onValueChange:C=>S({...b,type:C}),children:[u.jsx(Ll,{children:u.jsx(Hl,{})}),u.jsxs(ql,{children:[u.jsx(Ye,{value:"whatsapp",children:"WhatsApp"}),u.jsx(Ye,{value:"email",children:"Email"})]})]})}),u.jsx("div",{children:u.jsx(gt,{type:b.type==="email"?"email":"tel",value:b.address,onChange:C=>S({...b,address:C.target.value}),placeholder:b.type==="whatsapp"?"Número do WhatsApp":"Endereço de Email"})}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",onClick:T,disabled:!v(b.address,b.type),children:u.jsx(Ds,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:f,children:u.jsx(Qu,{className:"h-4 w-4"})})]})]})})});const w=N(l.type);return u.jsx(st,{children:u.jsx(ct,{className:"pt-4",children:u.jsxs("div",{className:"flex items-center justify-between",children:[u.jsxs("div",{className:"flex items-center space-x-3",children:[u.jsx(w,{className:"h-5 w-5 text-gray-500"}),u.jsx("span",{className:"font-medium",children:g(l.address,l.type)}),O(l.type)]}),u.jsxs("div",{className:"flex space-x-2",children:[u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>p(l),disabled:o,children:o?u.jsx("div",{className:"h-4 w-4 animate-spin rounded-full border-2 border-gray-300 border-t-gray-600"}):u.jsx(v1,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:c,children:u.jsx(Yu,{className:"h-4 w-4"})}),u.jsx(qe,{size:"sm",variant:"outline",onClick:()=>h(l.id),children:u.jsx(Xu,{className:"h-4 w-4"})})]})]})})})}var Bw="Separator",Hv="horizontal",kw=["horizontal","vertical"],Vg=x.forwardRef((l,r)=>{const{decorative:o,orientation:c=Hv,...f}=l,m=Hw(c)?c:Hv,p=o?{role:"none"}:{"aria-orientation":m==="vertical"?m:void 0,role:"separator"};return u.jsx(Re.div,{"data-orientation":m,...p,...f,ref:r})});Vg.displayName=Bw;function Hw(l){return kw.includes(l)}var Lw=Vg;function xu({className:l,orientation:r="horizontal",decorative:o=!0,...c}){return u.jsx(Lw,{"data-slot":"separator-root",decorative:o,orientation:r,className:Xe("bg-border shrink-0 data-[orientation=horizontal]:h-px data-[orientation=horizontal]:w-full data-[orientation=vertical]:h-full data-[orientation=vertical]:w-px",l),...c})}const qw="http://localhost:5000/api";function Vw({user:l,onUpdate:r}){const[o,c]=x.useState(!1),[f,m]=x.useState(""),[h,p]=x.useState(""),[g,v]=x.useState({username:l.username||"",api_key_news:l.api_key_news||"",password:"",confirmPassword:""}),b=async N=>{if(N.preventDefault(),c(!0),m(""),p(""),g.password&&g.password!==g.confirmPassword){m("As senhas não coincidem"),c(!1);return}try{const O={username:g.username,api_key_news:g.api_key_news};g.password&&(O.password=g.password);const w=await fetch(`${qw}/profile`,{method:"PUT",headers:{"Content-Type":"application/json"},credentials:"include",body:JSON.stringify(O)});if(w.ok)p("Perfil atualizado com sucesso!"),v({...g,password:"",confirmPassword:""}),r==null||r();else{const C=await w.json();m(C.error||"Erro ao atualizar perfil")}}catch{m("Erro de conexão")}finally{c(!1)}},S=()=>{window.open("https://newsapi.org/register","_blank")},T=()=>{window.open("https://developers.facebook.com/docs/whatsapp/cloud-api/get-started","_blank")};return u.jsxs("div",{className:"space-y-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsxs(Kt,{className:"flex items-center",children:[u.jsx(g1,{className:"h-5 w-5 mr-2"}),"Configurações do Perfil"]}),u.jsx(ia,{children:"Gerencie suas informações pessoais e chaves de API"})]}),u.jsx(ct,{children:u.jsxs("form",{onSubmit:b,className:"space-y-6",children:[u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(Ap,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Informações Básicas"})]}),u.jsx("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-4",children:u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"username",children:"Nome de Usuário"}),u.jsx(gt,{id:"username",value:g.username,onChange:N=>v({...g,username:N.target.value}),required:!0})]})})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(mv,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Alterar Senha"})]}),u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-4",children:[u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"password",children:"Nova Senha"}),u.jsx(gt,{id:"password",type:"password",placeholder:"Deixe em branco para manter a atual",value:g.password,onChange:N=>v({...g,password:N.target.value})})]}),u.jsxs("div",{children:[u.jsx(Je,{htmlFor:"confirmPassword",children:"Confirmar Nova Senha"}),u.jsx(gt,{id:"confirmPassword",type:"password",placeholder:"Confirme a nova senha",value:g.confirmPassword,onChange:N=>v({...g,confirmPassword:N.target.value})})]})]})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-4",children:[u.jsxs("div",{className:"flex items-center space-x-2",children:[u.jsx(mv,{className:"h-4 w-4"}),u.jsx("h3",{className:"text-lg font-medium",children:"Chaves de API"})]}),u.jsx("div",{className:"space-y-4",children:u.jsxs("div",{children:[u.jsxs("div",{className:"flex items-center justify-between mb-2",children:[u.jsx(Je,{htmlFor:"api_key_news",children:"Chave da API de Notícias (NewsAPI)"}),u.jsxs(qe,{type:"button",variant:"outline",size:"sm",onClick:S,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Obter Chave"]})]}),u.jsx(gt,{id:"api_key_news",type:"password",placeholder:"Sua chave da NewsAPI",value:g.api_key_news,onChange:N=>v({...g,api_key_news:N.target.value})}),u.jsx("p",{className:"text-xs text-gray-500 mt-1",children:"Necessária para buscar notícias. Obtenha gratuitamente em newsapi.org"})]})})]}),f&&u.jsxs(Ft,{variant:"destructive",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:f})]}),h&&u.jsxs(Ft,{className:"border-green-200 bg-green-50",children:[u.jsx(Tu,{className:"h-4 w-4 text-green-600"}),u.jsx(It,{className:"text-green-800",children:h})]}),u.jsxs(qe,{type:"submit",disabled:o,className:"w-full md:w-auto",children:[o?u.jsx("div",{className:"h-4 w-4 animate-spin rounded-full border-2 border-gray-300 border-t-gray-600 mr-2"}):u.jsx(Ds,{className:"h-4 w-4 mr-2"}),"Salvar Alterações"]})]})})]}),u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Configuração de APIs Externas"}),u.jsx(ia,{children:"Informações sobre como configurar as APIs necessárias"})]}),u.jsxs(ct,{className:"space-y-4",children:[u.jsxs("div",{className:"space-y-2",children:[u.jsx("h4",{className:"font-medium",children:"NewsAPI (Obrigatória)"}),u.jsx("p",{className:"text-sm text-gray-600",children:"A NewsAPI é necessária para buscar notícias. Você pode obter uma chave gratuita que permite até 1.000 requisições por mês."}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:S,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Registrar na NewsAPI"]})]}),u.jsx(xu,{}),u.jsxs("div",{className:"space-y-2",children:[u.jsx("h4",{className:"font-medium",children:"WhatsApp Business API (Para envio via WhatsApp)"}),u.jsx("p",{className:"text-sm text-gray-600",children:"Para enviar mensagens via WhatsApp, você precisa configurar a WhatsApp Business Platform. Isso requer aprovação da Meta e configuração de webhooks."}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:T,children:[u.jsx(Es,{className:"h-4 w-4 mr-2"}),"Documentação WhatsApp"]})]}),u.jsxs(Ft,{children:[u.jsx(la,{className:"h-4 w-4"}),u.jsxs(It,{children:[u.jsx("strong",{children:"Nota:"})," Para uso em produção, você precisará configurar as variáveis de ambiente no servidor com suas chaves de API. Durante o desenvolvimento, você pode usar apenas a funcionalidade de email."]})]})]})]})]})}const ws="http://localhost:5000/api";async function pollJob(r){const w=await r.json();if(r.status!==202)return w;for(;;){await new Promise(t=>setTimeout(t,1e3));const j=await(await fetch(`${ws}/jobs/${w.job_id}`,{credentials:"include"})).json();if(j.status==="done")return j.result;if(j.status==="failed"||!j.status)return{error:j.error||"Erro ao executar"}}}function Gw({user:l,onLogout:r}){const[o,c]=x.useState(null),[f,m]=x.useState(!1),[h,p]=x.useState(null),[g,v]=x.useState("overview");x.useEffect(()=>{b()},[]);const b=async()=>{try{const O=await fetch(`${ws}/config-status`,{credentials:"include"});if(O.ok){const w=await O.json();c(w)}}catch(O){console.error("Erro ao buscar status:",O)}},S=async()=>{m(!0);try{const w=await pollJob(await fetch(`${ws}/run-daily-digest`,{method:"POST",credentials:"include"}));p(w),b()}catch{p({error:"Erro ao executar resumo diário"})}finally{m(!1)}},T=async()=>{m(!0);try{const w=await pollJob(await fetch(`${ws}/test-news-search`,{method:"POST",credentials:"include"}));p(w)}catch{p({error:"Erro ao testar busca de notícias"})}finally{m(!1)}},N=async()=>{try{await fetch(`${ws}/logout`,{method:"POST",credentials:"include"})}catch(O){console.error("Erro ao fazer logout:",O)}r()};return o?u.jsxs("div",{className:"min-h-screen bg-gray-50",children:[u.jsx("header",{className:"bg-white shadow-sm border-b",children:u.jsx("div",{className:"max-w-7xl mx-auto px-4 sm:px-6 lg:px-8",children:u.jsxs("div",{className:"flex justify-between items-center h-16",children:[u.jsxs("div",{className:"flex items-center",children:[u.jsx(u1,{className:"h-8 w-8 text-blue-600 mr-3"}),u.jsx("h1",{className:"text-xl font-semibold text-gray-900",children:"Agente de Notícias"})]}),u.jsxs("div",{className:"flex items-center space-x-4",children:[u.jsxs("span",{className:"text-sm text-gray-600",children:["Olá, ",l.username]}),u.jsxs(qe,{variant:"outline",size:"sm",onClick:N,children:[u.jsx(a1,{className:"h-4 w-4 mr-2"}),"Sair"]})]})]})})}),u.jsx("div",{className:"max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8",children:u.jsxs(xp,{value:g,onValueChange:v,children:[u.jsxs(Sp,{className:"grid w-full grid-cols-5",children:[u.jsx(za,{value:"overview",children:"Visão Geral"}),u.jsx(za,{value:"topics",children:"Tópicos"}),u.jsx(za,{value:"sources",children:"Fontes"}),u.jsx(za,{value:"recipients",children:"Destinatários"}),u.jsx(za,{value:"settings",children:"Configurações"})]}),u.jsxs(Ua,{value:"overview",className:"space-y-6",children:[u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-3 gap-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Status da Configuração"}),o.ready_to_run?u.jsx(Tu,{className:"h-4 w-4 text-green-600"}):u.jsx(la,{className:"h-4 w-4 text-yellow-600"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.ready_to_run?"Pronto":"Incompleto"}),u.jsx("p",{className:"text-xs text-muted-foreground",children:o.ready_to_run?"Agente configurado e pronto para uso":"Configure tópicos, fontes e destinatários"})]})]}),u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Tópicos Configurados"}),u.jsx(Nu,{className:"h-4 w-4 text-muted-foreground"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.topics_count}),u.jsxs("p",{className:"text-xs text-muted-foreground",children:[o.avoid_topics_count," tópicos evitados"]})]})]}),u.jsxs(st,{children:[u.jsxs(Zt,{className:"flex flex-row items-center justify-between space-y-0 pb-2",children:[u.jsx(Kt,{className:"text-sm font-medium",children:"Destinatários"}),u.jsx(ju,{className:"h-4 w-4 text-muted-foreground"})]}),u.jsxs(ct,{children:[u.jsx("div",{className:"text-2xl font-bold",children:o.whatsapp_recipients+o.email_recipients}),u.jsxs("p",{className:"text-xs text-muted-foreground",children:[o.whatsapp_recipients," WhatsApp, ",o.email_recipients," Email"]})]})]})]}),u.jsxs("div",{className:"grid grid-cols-1 md:grid-cols-2 gap-6",children:[u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Testar Busca de Notícias"}),u.jsx(ia,{children:"Teste a busca de notícias com suas configurações atuais"})]}),u.jsx(ct,{children:u.jsxs(qe,{onClick:T,disabled:f||!o.has_news_api_key,className:"w-full",children:[u.jsx(vv,{className:"h-4 w-4 mr-2"}),f?"Testando...":"Testar Busca"]})})]}),u.jsxs(st,{children:[u.jsxs(Zt,{children:[u.jsx(Kt,{children:"Executar Resumo Diário"}),u.jsx(ia,{children:"Execute o processo completo de busca e envio de notícias"})]}),u.jsx(ct,{children:u.jsxs(qe,{onClick:S,disabled:f||!o.ready_to_run,className:"w-full",variant:o.ready_to_run?"default":"secondary",children:[u.jsx(vv,{className:"h-4 w-4 mr-2"}),f?"Executando...":"Executar Agora"]})})]})]}),h&&u.jsxs(st,{children:[u.jsx(Zt,{children:u.jsx(Kt,{children:"Último Resultado"})}),u.jsx(ct,{children:h.error?u.jsxs(Ft,{variant:"destructive",children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:h.error})]}):u.jsxs("div",{className:"space-y-2",children:[h.message&&u.jsxs(Ft,{children:[u.jsx(Tu,{className:"h-4 w-4"}),u.jsx(It,{children:h.message})]}),u.jsxs("div",{className:"grid grid-cols-2 md:grid-cols-4 gap-4 text-sm",children:[h.total_found!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Encontradas:"})," ",h.total_found]}),h.total_filtered!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Filtradas:"})," ",h.total_filtered]}),h.total_articles_sent!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Enviadas:"})," ",h.total_articles_sent]}),h.messages_sent!==void 0&&u.jsxs("div",{children:[u.jsx("span",{className:"font-medium",children:"Mensagens:"})," ",h.messages_sent]})]})]})})]}),!o.ready_to_run&&u.jsxs(Ft,{children:[u.jsx(la,{className:"h-4 w-4"}),u.jsx(It,{children:u.jsxs("div",{className:"space-y-1",children:[u.jsx("p",{className:"font-medium",children:"Configuração incompleta:"}),u.jsxs("ul",{className:"list-disc list-inside space-y-1 text-sm",children:[!o.has_news_api_key&&u.jsx("li",{children:"Configure sua chave da API de notícias"}),!o.has_topics&&u.jsx("li",{children:"Adicione pelo menos um tópico de interesse"}),!o.has_recipients&&u.jsx("li",{children:"Adicione pelo menos um destinatário"})]})]})})]})]}),u.jsx(Ua,{value:"topics",children:u.jsx(Cw,{onUpdate:b})}),u.jsx(Ua,{value:"sources",children:u.jsx(Ow,{onUpdate:b})}),u.jsx(Ua,{value:"recipients",children:u.jsx(zw,{onUpdate:b})}),u.jsx(Ua,{value:"settings",children:u.jsx(Vw,{user:l,onUpdate:b})})]})})]}):u.jsx("div",{className:"flex items-center justify-center min-h-screen",children:"Carregando..."})}const Yw="http://localhost:5000/api";function Xw(){const[l,r]=x.useState(null),[o,c]=x.useState(!0);x.useEffect(()=>{f()},[]);const f=async()=>{try{const p=await fetch(`${Yw}/profile`,{credentials:"include"});if(p.ok){const g=await p.json();r(g)}}catch{console.log("Usuário não autenticado")}finally{c(!1)}},m=p=>{r(p)},h=()=>{r(null)};return o?u.jsx("div",{className:"min-h-screen flex items-center justify-center",children:u.jsxs("div",{className:"text-center",children:[u.jsx("div",{className:"h-8 w-8 animate-spin rounded-full border-4 border-gray-300 border-t-blue-600 mx-auto mb-4"}),u.jsx("p",{className:"text-gray-600",children:"Carregando..."})]})}):u.jsx("div",{className:"App",children:l?u.jsx(Gw,{user:l,onLogout:h}):u.jsx(E1,{onLogin:m})})}pb.createRoot(document.getElementById("root")).render(u.jsx(x.StrictMode,{children:u.jsx(Xw,{})}));
@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import selectinload
+
+from src.metrics import STAGE_DURATION
+from src.models.user import User
+
+@dataclass(frozen=True)
+class UserDigestConfig:
+    """
+    Retrato imutável da configuração de um usuário usado pelo pipeline de
+    resumos, que assim não volta a consultar o ORM
+    """
+    user_id: int
+    username: str
+    api_key_news: Optional[str]
+    topics: Tuple[str, ...]
+    topic_priorities: Dict[str, int]
+    avoid_topics: Tuple[str, ...]
+    preferred_sources: Tuple[str, ...]
+    source_priorities: Dict[str, int]
+    avoid_sources: Tuple[str, ...]
+    recipients: Tuple[Dict, ...]
+    
+    @property
+    def is_complete(self) -> bool:
+        """
+        Indica se o usuário tem tópicos de interesse e destinatários
+        """
+        return bool(self.topics and self.recipients)
+    
+    @classmethod
+    def from_user(cls, user: User) -> 'UserDigestConfig':
+        topics = [t for t in user.topics if not t.avoid]
+        return cls(
+            user_id=user.id,
+            username=user.username,
+            api_key_news=user.api_key_news,
+            topics=tuple(t.topic_name for t in topics),
+            topic_priorities={t.topic_name: t.priority for t in topics},
+            avoid_topics=tuple(t.topic_name for t in user.topics if t.avoid),
+            preferred_sources=tuple(s.source_name for s in user.sources if not s.avoid),
+            source_priorities={s.source_name: s.priority or 3 for s in user.sources if not s.avoid},
+            avoid_sources=tuple(s.source_name for s in user.sources if s.avoid),
+            recipients=tuple(r.to_dict() for r in user.recipients)
+        )
+
+def _has_api_key():
+    return User.api_key_news.isnot(None), User.api_key_news != ''
+
+def load_user_configs(user_ids: Iterable[int] = None, require_api_key: bool = True,
+                      ready_only: bool = False) -> Dict[int, UserDigestConfig]:
+    """
+    Carrega usuários com tópicos, fontes e destinatários em um número fixo de
+    consultas (uma para os usuários e uma por relacionamento via selectinload).
+    Com ``ready_only`` vêm só os usuários com is_ready (pelo índice parcial)
+    """
+    query = User.query.options(
+        selectinload(User.topics),
+        selectinload(User.sources),
+        selectinload(User.recipients)
+    )
+    if user_ids is not None:
+        query = query.filter(User.id.in_(list(user_ids)))
+    if require_api_key:
+        query = query.filter(*_has_api_key())
+    if ready_only:
+        query = query.filter(User.is_ready == True)
+    
+    with STAGE_DURATION.time(stage='config_load'):
+        return {user.id: UserDigestConfig.from_user(user) for user in query.order_by(User.id)}
+
+def load_user_config(user_id: int) -> Optional[UserDigestConfig]:
+    """
+    Carrega a configuração de um único usuário (sem exigir a API key)
+    """
+    return load_user_configs([user_id], require_api_key=False).get(user_id)
+
+def count_incomplete_users() -> int:
+    """
+    Usuários com API key que ainda não têm tópicos de interesse ou
+    destinatários (ficam de fora da execução diária)
+    """
+    return User.query.filter(*_has_api_key(), User.is_ready == False).count()